@@ -0,0 +1,80 @@
+import threading
+import time
+
+# ============================================================================
+# CACHE WARMER - Keep shared market datasets fresh on a fixed cadence
+# ============================================================================
+# Market-overview widgets used to be computed by whichever session rendered
+# first. A single background thread now reloads each dataset before it goes
+# stale and publishes it to the shared caches, so sessions only ever read.
+
+
+class CacheWarmer:
+    """Daemon scheduler running named jobs every `every` seconds.
+
+    A job is any callable that reloads and publishes a dataset; failures are
+    recorded and retried on the next cycle. `wrap` (e.g. a rate limiter's
+    background-priority context) is entered around every run."""
+
+    def __init__(self, tick: float = 5.0, wrap=None):
+        self.tick = tick
+        self.wrap = wrap
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+
+    def add(self, name: str, fn, every: float):
+        with self._lock:
+            self._jobs[name] = {'fn': fn, 'every': every, 'last_run': 0.0, 'duration': None,
+                                'runs': 0, 'errors': 0, 'last_error': None}
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._loop, name='cache-warmer', daemon=True)
+            self._thread.start()
+        return self
+
+    def run_now(self, *names: str):
+        """Make the named jobs (all of them if none are named) due immediately."""
+        with self._lock:
+            for job_name, job in self._jobs.items():
+                if not names or job_name in names:
+                    job['last_run'] = 0.0
+        self._wake.set()
+
+    def _run(self, name: str, job: dict):
+        started = time.time()
+        try:
+            if self.wrap is not None:
+                with self.wrap():
+                    job['fn']()
+            else:
+                job['fn']()
+            job['last_error'] = None
+        except Exception as e:
+            job['errors'] += 1
+            job['last_error'] = f"{type(e).__name__}: {e}"
+        finally:
+            job['runs'] += 1
+            job['last_run'] = started
+            job['duration'] = time.time() - started
+
+    def _loop(self):
+        while True:
+            now = time.time()
+            with self._lock:
+                due = [(n, j) for n, j in self._jobs.items() if now - j['last_run'] >= j['every']]
+            for name, job in due:
+                self._run(name, job)
+            self._wake.wait(self.tick)
+            self._wake.clear()
+
+    def status(self) -> dict:
+        """Per-job run counters and seconds since the last run, for display."""
+        now = time.time()
+        with self._lock:
+            return {name: {'age': now - j['last_run'] if j['last_run'] else None,
+                           'every': j['every'], 'duration': j['duration'], 'runs': j['runs'],
+                           'errors': j['errors'], 'last_error': j['last_error']}
+                    for name, j in self._jobs.items()}
@@ -0,0 +1,182 @@
+import os
+import threading
+import time
+
+import pandas as pd
+
+from Modules.greeks import MARKET_TZ
+from Modules.options_analytics import chain_table
+from Modules.price_store import DATA_DIR
+
+# ============================================================================
+# CHAIN STORE - Timestamped all-expiry options chain snapshots on disk
+# ============================================================================
+# Layout: <root>/<TICKER>/<YYYY-MM-DD>.parquet — one columnar file per ticker
+# per trading session holding that session's latest chain_table() snapshot,
+# every expiry together, with the UTC time each expiry was fetched in
+# `snapshot`. Open interest is published once a day, so a file per session is
+# enough for day-over-day OI change. A snapshot belongs to the session of its
+# latest trade, so weekend and holiday refreshes replace the last session's
+# file instead of adding a copy of it that would read as zero change.
+#
+# A snapshot younger than CHAIN_REFRESH_SECONDS is served from disk. An expiry
+# that fails to refresh keeps its rows from the stored snapshot of the same
+# session.
+
+CHAIN_REFRESH_SECONDS = 300
+
+# Daily files kept per ticker
+CHAIN_RETENTION_DAYS = 120
+
+# Contract identity across snapshots
+CONTRACT_KEY = ['expiry', 'type', 'strike']
+
+
+def session_day(table: pd.DataFrame, now: pd.Timestamp) -> str:
+    """Trading session a snapshot belongs to: the New York date of its latest trade,
+    or without trade times, today's date rolled back off a weekend."""
+    if 'lastTradeDate' in table:
+        last = pd.to_datetime(table['lastTradeDate'], errors='coerce', utc=True).max()
+        if pd.notna(last):
+            return last.tz_convert(MARKET_TZ).strftime('%Y-%m-%d')
+    today = now.tz_convert(MARKET_TZ).tz_localize(None).normalize()
+    return pd.offsets.BDay().rollback(today).strftime('%Y-%m-%d')
+
+
+class ChainStore:
+    """On-disk options chain snapshots partitioned by ticker and day.
+
+    fetcher(ticker) -> {expiry: {'calls': frame, 'puts': frame}} is the network
+    source (every listed expiry); the store decides when it has to be called."""
+
+    def __init__(self, root: str = None, fetcher=None, refresh_seconds: float = CHAIN_REFRESH_SECONDS,
+                 retention_days: int = CHAIN_RETENTION_DAYS):
+        self.root = root or os.path.join(DATA_DIR, 'options')
+        self.fetcher = fetcher
+        self.refresh_seconds = refresh_seconds
+        self.retention_days = retention_days
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Paths and locking
+    # ------------------------------------------------------------------
+    def directory(self, ticker: str) -> str:
+        return os.path.join(self.root, ticker.upper().replace('/', '_').replace('\\', '_'))
+
+    def path(self, ticker: str, day: str) -> str:
+        return os.path.join(self.directory(ticker), f"{day}.parquet")
+
+    def _lock(self, ticker: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(ticker.upper(), threading.Lock())
+
+    # ------------------------------------------------------------------
+    # Disk I/O
+    # ------------------------------------------------------------------
+    def days(self, ticker: str) -> list:
+        """Stored snapshot days, oldest first."""
+        try:
+            names = os.listdir(self.directory(ticker))
+        except OSError:
+            return []
+        return sorted(n[:-len('.parquet')] for n in names if n.endswith('.parquet'))
+
+    def load(self, ticker: str, day: str = None) -> pd.DataFrame:
+        """Snapshot of one day (the latest stored day by default); empty if none."""
+        days = self.days(ticker)
+        day = day or (days[-1] if days else None)
+        if day is None or day not in days:
+            return pd.DataFrame()
+        try:
+            return pd.read_parquet(self.path(ticker, day))
+        except Exception:
+            return pd.DataFrame()
+
+    def save(self, ticker: str, day: str, table: pd.DataFrame):
+        """Atomically replace one day's snapshot (best effort)."""
+        path = self.path(ticker, day)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            table.to_parquet(tmp, index=False, compression='zstd')
+            os.replace(tmp, path)
+        except Exception:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+
+    def prune(self, ticker: str):
+        """Drop daily files past the retention window."""
+        for day in self.days(ticker)[:-self.retention_days or None]:
+            try:
+                os.remove(self.path(ticker, day))
+            except OSError:
+                pass
+
+    def age(self, ticker: str) -> float:
+        """Seconds since the latest snapshot was written (inf if missing)."""
+        days = self.days(ticker)
+        if not days:
+            return float('inf')
+        return time.time() - os.path.getmtime(self.path(ticker, days[-1]))
+
+    def is_fresh(self, ticker: str) -> bool:
+        return self.age(ticker) < self.refresh_seconds
+
+    # ------------------------------------------------------------------
+    # Sync
+    # ------------------------------------------------------------------
+    def sync(self, ticker: str, force: bool = False) -> pd.DataFrame:
+        """Latest all-expiry snapshot, fetching a new one when the stored one is stale."""
+        with self._lock(ticker):
+            stored = self.load(ticker)
+            if not force and not stored.empty and self.is_fresh(ticker):
+                return stored
+
+            now = pd.Timestamp.now(tz='UTC')
+            try:
+                chains = self.fetcher(ticker) if self.fetcher is not None else {}
+            except Exception:
+                chains = {}
+            fresh = chain_table(chains)
+            if fresh.empty:
+                # Network failed — serve what we have
+                return stored
+            fresh['snapshot'] = now
+
+            day = session_day(fresh, now)
+            same_day = self.load(ticker, day)
+            if not same_day.empty:
+                # Expiries that did not come back this round keep the session's earlier rows
+                missing = same_day[~same_day['expiry'].isin(fresh['expiry'].unique())]
+                fresh = pd.concat([fresh, missing], ignore_index=True)
+            fresh = fresh.sort_values(CONTRACT_KEY, kind='stable').reset_index(drop=True)
+            self.save(ticker, day, fresh)
+            self.prune(ticker)
+            return fresh
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+    def oi_change(self, ticker: str, days_back: int = 1) -> pd.DataFrame:
+        """Per-contract open interest in the latest snapshot vs the snapshot `days_back`
+        stored days earlier: CONTRACT_KEY columns, open_interest, prev_open_interest,
+        oi_change and oi_change_pct (NaN where the contract is new)."""
+        columns = CONTRACT_KEY + ['open_interest', 'prev_open_interest', 'oi_change', 'oi_change_pct']
+        days = self.days(ticker)
+        if len(days) <= days_back:
+            return pd.DataFrame(columns=columns)
+        latest, previous = self.load(ticker, days[-1]), self.load(ticker, days[-1 - days_back])
+        if latest.empty or previous.empty:
+            return pd.DataFrame(columns=columns)
+        prev_oi = previous.groupby(CONTRACT_KEY)['openInterest'].sum().rename('prev_open_interest')
+        out = latest.groupby(CONTRACT_KEY)['openInterest'].sum().rename('open_interest').to_frame()
+        out = out.join(prev_oi, how='left')
+        out['oi_change'] = out['open_interest'] - out['prev_open_interest']
+        out['oi_change_pct'] = out['oi_change'] / out['prev_open_interest'].where(out['prev_open_interest'] > 0) * 100
+        return out.reset_index()[columns]
+
+    def previous(self, ticker: str) -> pd.DataFrame:
+        """Snapshot of the last stored day before the latest one (empty if none)."""
+        days = self.days(ticker)
+        return self.load(ticker, days[-2]) if len(days) > 1 else pd.DataFrame()
@@ -0,0 +1,173 @@
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from Modules.ladders import ladder
+
+# ============================================================================
+# FACTOR RISK - Correlation, beta and residual risk against benchmarks
+# ============================================================================
+# Returns for a whole universe sit in one date x ticker panel sampled on the
+# market benchmark's sessions, so a crypto benchmark's weekend moves fold into
+# Monday the same way a stock's do. Every statistic is pairwise-complete: each
+# ticker is measured on the sessions where both it and the benchmark have a
+# return, with masked sums over the panel rather than a regression per ticker.
+#
+#   beta      = cov(r, b) / var(b)
+#   alpha     = mean(r) - beta * mean(b), annualized
+#   resid_vol = sqrt(var(r) - beta^2 var(b)), annualized — the idiosyncratic risk
+
+BENCHMARKS = {'spy': 'SPY', 'btc': 'BTC-USD'}
+
+# Benchmark whose sessions define the return calendar
+MARKET = 'spy'
+
+PERIODS_PER_YEAR = 252
+MIN_OBSERVATIONS = 20
+ROLLING_WINDOW = 63
+
+# Idiosyncratic score bands (score > edge moves up a band), as reality_check labelled them
+ALPHA_EDGES = [40, 70]
+ALPHA_LABELS = ['LOW (MARKET FOLLOWER)', 'MODERATE', 'HIGH']
+
+STAT_COLUMNS = ['n', 'corr', 'beta', 'alpha', 'r2', 'total_vol', 'resid_vol']
+
+
+def _naive_dates(index) -> pd.DatetimeIndex:
+    """Session dates without timezone or time of day, so exchanges line up."""
+    index = pd.DatetimeIndex(index)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    return index.normalize()
+
+
+def aligned_returns(closes: pd.DataFrame, calendar) -> pd.DataFrame:
+    """Simple returns of every column sampled on `calendar` (NaN where either close is missing)."""
+    closes = closes.set_axis(_naive_dates(closes.index))
+    closes = closes[~closes.index.duplicated(keep='last')]
+    return closes.reindex(_naive_dates(calendar)).pct_change(fill_method=None).iloc[1:]
+
+
+def _pairwise(returns: pd.DataFrame, benchmark: pd.Series) -> tuple:
+    """(mask, y, x) arrays with y = ticker returns and x = the benchmark broadcast per column."""
+    y = returns.to_numpy(dtype=float)
+    x = np.broadcast_to(benchmark.reindex(returns.index).to_numpy(dtype=float)[:, None], y.shape)
+    mask = ~np.isnan(y) & ~np.isnan(x)
+    return mask, np.where(mask, y, 0.0), np.where(mask, x, 0.0)
+
+
+def _stats(n, mean_x, mean_y, cov, var_x, var_y, min_obs: int) -> dict:
+    with np.errstate(divide='ignore', invalid='ignore'):
+        enough = (n >= min_obs) & (var_x > 0)
+        beta = np.where(enough, cov / var_x, np.nan)
+        corr = np.where(enough & (var_y > 0), cov / np.sqrt(var_x * var_y), np.nan)
+        resid = np.maximum(var_y - beta ** 2 * var_x, 0)
+        annual = np.sqrt(PERIODS_PER_YEAR) * 100
+        return {
+            'n': n,
+            'corr': corr,
+            'beta': beta,
+            'alpha': np.where(enough, (mean_y - beta * mean_x) * PERIODS_PER_YEAR * 100, np.nan),
+            'r2': corr ** 2,
+            'total_vol': np.where(enough, np.sqrt(var_y) * annual, np.nan),
+            'resid_vol': np.where(enough, np.sqrt(resid) * annual, np.nan),
+        }
+
+
+def regression_stats(returns: pd.DataFrame, benchmark: pd.Series, min_obs: int = MIN_OBSERVATIONS) -> pd.DataFrame:
+    """Correlation, beta, annualized alpha (%), R², total and residual volatility (%)
+    of every column against one benchmark over the whole sample, one row per ticker."""
+    mask, y, x = _pairwise(returns, benchmark)
+    n = mask.sum(axis=0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean_x, mean_y = x.sum(axis=0) / n, y.sum(axis=0) / n
+        # Centered second moments (sample, ddof=1) on each column's own pairs
+        dx, dy = np.where(mask, x - mean_x, 0.0), np.where(mask, y - mean_y, 0.0)
+        cov = (dx * dy).sum(axis=0) / (n - 1)
+        var_x, var_y = (dx ** 2).sum(axis=0) / (n - 1), (dy ** 2).sum(axis=0) / (n - 1)
+    return pd.DataFrame(_stats(n, mean_x, mean_y, cov, var_x, var_y, min_obs), index=returns.columns)[STAT_COLUMNS]
+
+
+def rolling_stats(returns: pd.DataFrame, benchmark: pd.Series, window: int = ROLLING_WINDOW,
+                  min_obs: int = MIN_OBSERVATIONS) -> dict:
+    """The regression_stats columns over a trailing `window` of sessions:
+    {stat: date x ticker frame}, from six rolling sums over the whole panel."""
+    mask, y, x = _pairwise(returns, benchmark)
+    roll = lambda a: pd.DataFrame(a).rolling(window, min_periods=1).sum().to_numpy()
+    n, sx, sy = roll(mask.astype(float)), roll(x), roll(y)
+    sxx, syy, sxy = roll(x * x), roll(y * y), roll(x * y)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean_x, mean_y = sx / n, sy / n
+        cov = (sxy - sx * sy / n) / (n - 1)
+        var_x = np.maximum((sxx - sx ** 2 / n) / (n - 1), 0)
+        var_y = np.maximum((syy - sy ** 2 / n) / (n - 1), 0)
+    stats = _stats(n, mean_x, mean_y, cov, var_x, var_y, min_obs)
+    return {name: pd.DataFrame(stats[name], index=returns.index, columns=returns.columns) for name in STAT_COLUMNS}
+
+
+def risk_table(returns: pd.DataFrame, benchmarks: pd.DataFrame, min_obs: int = MIN_OBSERVATIONS) -> pd.DataFrame:
+    """Per ticker: correlation and beta to every benchmark, alpha and residual risk
+    against the market, and reality_check's idiosyncratic score and alpha label."""
+    stats = {key: regression_stats(returns, benchmarks[key], min_obs) for key in benchmarks.columns}
+    table = pd.DataFrame({f'{key}_{col}': s[col] for key, s in stats.items() for col in ('corr', 'beta')},
+                         index=returns.columns)
+    if MARKET in stats:
+        table = table.join(stats[MARKET][['alpha', 'r2', 'total_vol', 'resid_vol', 'n']])
+    # Missing market correlation counts as fully correlated, missing crypto as uncorrelated
+    market = table[f'{MARKET}_corr'].abs().fillna(1) if f'{MARKET}_corr' in table else 1
+    others = [f'{k}_corr' for k in benchmarks.columns if k != MARKET]
+    crypto = table[others].abs().fillna(0).mean(axis=1) if others else 0
+    table['idiosyncratic_score'] = (1 - (market + crypto) / 2) * 100
+    table['alpha_potential'] = np.asarray(ALPHA_LABELS)[
+        ladder(table['idiosyncratic_score'], ALPHA_EDGES, range(len(ALPHA_LABELS)), right=True).astype(int)]
+    return table
+
+
+class FactorRiskEngine:
+    """Benchmark returns loaded once per period and shared by every universe.
+
+    loader(ticker, period) -> OHLCV frame (the price store behind DataEngine.get_history)."""
+
+    def __init__(self, loader, benchmarks: dict = None, ttl: float = 300):
+        self.loader = loader
+        self.symbols = benchmarks or BENCHMARKS
+        self.ttl = ttl
+        self._closes = {}
+        self._lock = threading.Lock()
+
+    def benchmark_closes(self, period: str = '1y') -> pd.DataFrame:
+        """date x benchmark close panel, reloaded at most once per ttl."""
+        with self._lock:
+            cached = self._closes.get(period)
+            if cached is not None and time.time() - cached[0] < self.ttl:
+                return cached[1]
+            closes = {}
+            for key, symbol in self.symbols.items():
+                hist = self.loader(symbol, period)
+                if hist is not None and not hist.empty:
+                    closes[key] = hist['Close'].set_axis(_naive_dates(hist.index))
+            frame = pd.DataFrame(closes)
+            if not frame.empty:
+                self._closes[period] = (time.time(), frame)
+            return frame
+
+    def returns(self, closes: pd.DataFrame, period: str = '1y') -> tuple:
+        """(ticker returns, benchmark returns), both on the market's sessions."""
+        bench = self.benchmark_closes(period)
+        if MARKET in bench:
+            calendar = bench[MARKET].dropna().index
+        else:
+            calendar = _naive_dates(closes.index).unique().sort_values()
+        return aligned_returns(closes, calendar), aligned_returns(bench, calendar)
+
+    def universe(self, closes: pd.DataFrame, period: str = '1y') -> pd.DataFrame:
+        """risk_table for every column of a close panel in one pass."""
+        returns, bench = self.returns(closes, period)
+        return risk_table(returns, bench)
+
+    def rolling(self, closes: pd.DataFrame, period: str = '1y', window: int = ROLLING_WINDOW) -> dict:
+        """{benchmark key: rolling_stats} for every column of a close panel."""
+        returns, bench = self.returns(closes, period)
+        return {key: rolling_stats(returns, bench[key], window) for key in bench.columns}
@@ -0,0 +1,238 @@
+import os
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from Modules.rules import RuleSet
+from Modules.price_store import DATA_DIR
+
+# ============================================================================
+# FEAR & GREED - Ten market indicators on one aligned close panel
+# ============================================================================
+# All components come from a single batched download. Every indicator is a
+# column operation over the whole panel, so the same code gives today's
+# reading and a full daily history.
+
+FG_COMPONENTS = ['^VIX', 'SPY', 'RSP', 'HYG', 'LQD', 'TLT', 'XLY', 'XLP', '^VIX3M']
+
+# The 52-week-high indicator needs 252 sessions; two years leaves room for holidays
+FG_PERIOD = '2y'
+
+# Backfill window for the daily history, and the calendar lookback an incremental
+# update needs so the longest rolling window (252 sessions) is fully populated
+FG_HISTORY_PERIOD = 'max'
+FG_WARMUP_DAYS = 400
+
+# Seconds the stored daily history is considered current
+FG_HISTORY_REFRESH = 3600
+
+# Neutral VIX assumed when the VIX series itself is unavailable
+DEFAULT_VIX = 20
+
+# Display label per indicator, in display order
+FG_INDICATORS = {
+    'vix_level': 'VIX Level',
+    'vix_trend': 'VIX 14D Change',
+    'momentum': 'Market Momentum',
+    'price_strength': '52W High Distance',
+    'breadth': 'Market Breadth',
+    'put_call': 'VIX Term Structure',
+    'junk_bond': 'Junk Bond Demand',
+    'safe_haven': 'Safe Haven Demand',
+    'rotation': 'Sector Rotation',
+    'credit': 'Credit Spreads',
+}
+
+# Each indicator is its own category scored 0-100 by one rule (see Modules/rules.py);
+# a missing input leaves its score NaN so the composite averages what is available
+FEAR_GREED_RULES = {
+    'name': 'fear_greed',
+    'missing': None,
+    'rules': [
+        {'category': key, 'name': key, 'metric': key, 'bands': bands, 'default': default}
+        for key, bands, default in [
+            ('vix_level', [['<', 12, 95], ['<', 15, 80], ['<', 18, 65], ['<', 22, 50], ['<', 28, 35], ['<', 35, 20]], 5),
+            ('vix_trend', [['<', -20, 90], ['<', -10, 75], ['<', -5, 60], ['<', 5, 50], ['<', 15, 35], ['<', 30, 20]], 5),
+            ('momentum', [['>', 10, 95], ['>', 6, 80], ['>', 3, 65], ['>', 0, 55], ['>', -3, 40], ['>', -6, 25]], 10),
+            ('price_strength', [['>', -2, 90], ['>', -5, 75], ['>', -10, 55], ['>', -15, 40], ['>', -20, 25]], 10),
+            ('breadth', [['>', 3, 85], ['>', 1, 70], ['>', -1, 50], ['>', -3, 35]], 20),
+            ('put_call', [['<', -15, 85], ['<', -8, 70], ['<', -2, 55], ['<', 5, 40], ['<', 15, 25]], 10),
+            ('junk_bond', [['>', 2, 85], ['>', 1, 70], ['>', 0, 55], ['>', -1, 40], ['>', -2, 25]], 10),
+            ('safe_haven', [['<', -5, 85], ['<', -2, 70], ['<', 1, 55], ['<', 3, 40], ['<', 6, 25]], 10),
+            ('rotation', [['>', 5, 90], ['>', 2, 75], ['>', 0, 55], ['>', -2, 40], ['>', -5, 25]], 10),
+            ('credit', [['>', 1.5, 85], ['>', 0.5, 70], ['>', -0.5, 50], ['>', -1.5, 35]], 15),
+        ]
+    ],
+}
+
+FEAR_GREED = RuleSet(FEAR_GREED_RULES)
+
+FG_LABELS = (['Extreme Fear', 'Fear', 'Mild Fear', 'Neutral', 'Mild Greed', 'Greed', 'Extreme Greed'],
+             [20, 35, 45, 55, 65, 80])
+
+
+def close_panel(closes: pd.DataFrame) -> pd.DataFrame:
+    """Align component closes on one session index (forward-filled across
+    exchange-holiday gaps) with every component present as a column."""
+    panel = closes.dropna(how='all').sort_index().ffill()
+    return panel.reindex(columns=FG_COMPONENTS)
+
+
+def indicator_values(panel: pd.DataFrame) -> pd.DataFrame:
+    """Raw value of every indicator on every session (NaN until its lookback fills)."""
+    col = lambda t: panel[t]
+    # "N-day" changes compare with the close N-1 sessions back, as the original
+    # iloc[-14] / iloc[-20] lookups did
+    ret = lambda t, n: (col(t) / col(t).shift(n - 1) - 1) * 100
+
+    vix = col('^VIX')
+    spy = col('SPY')
+    return pd.DataFrame({
+        'vix_level': vix,
+        'vix_trend': ret('^VIX', 14),
+        'momentum': (spy / spy.rolling(125).mean() - 1) * 100,
+        'price_strength': (spy / spy.rolling(252).max() - 1) * 100,
+        'breadth': ret('RSP', 20) - ret('SPY', 20),
+        'put_call': (vix / col('^VIX3M') - 1) * 100,
+        'junk_bond': ret('HYG', 20),
+        'safe_haven': ret('TLT', 20) - ret('SPY', 20),
+        'rotation': ret('XLY', 20) - ret('XLP', 20),
+        'credit': ret('HYG', 20) - ret('LQD', 20),
+    }, index=panel.index)
+
+
+def indicator_scores(values: pd.DataFrame) -> pd.DataFrame:
+    """0-100 score per indicator per session; NaN where the indicator is unavailable."""
+    return FEAR_GREED.components(values).droplevel('category', axis=1)
+
+
+def composite(scores: pd.DataFrame) -> pd.Series:
+    """Equal-weight average of whichever indicators are available, clipped to 0-100."""
+    return scores.mean(axis=1).clip(0, 100)
+
+
+def fear_greed_label(score: float) -> str:
+    labels, edges = FG_LABELS
+    return labels[int(np.digitize(score, edges))]
+
+
+def fear_greed_history(closes: pd.DataFrame) -> pd.DataFrame:
+    """Daily index in one vectorized pass: composite score, label, number of
+    indicators available, and each indicator's score and raw value per session."""
+    values = indicator_values(close_panel(closes))
+    scores = indicator_scores(values)
+    history = pd.concat([scores, values.add_suffix('_value')], axis=1)
+    history.insert(0, 'num_indicators', scores.notna().sum(axis=1))
+    history.insert(0, 'score', composite(scores))
+    history = history[history['num_indicators'] > 0]
+    labels, edges = FG_LABELS
+    history.insert(1, 'label', np.asarray(labels)[np.digitize(history['score'].to_numpy(), edges)])
+    return history
+
+
+def fear_greed_snapshot(closes: pd.DataFrame) -> dict:
+    """Latest Fear & Greed reading in the shape the dashboard renders."""
+    try:
+        panel = close_panel(closes)
+        values = indicator_values(panel)
+        latest = values.iloc[-1].copy() if len(values) else pd.Series(np.nan, index=list(FG_INDICATORS))
+
+        # The VIX level always counts, at a neutral reading if VIX itself is missing
+        vix_current = latest['vix_level'] if pd.notna(latest['vix_level']) else DEFAULT_VIX
+        latest['vix_level'] = vix_current
+
+        latest_scores = indicator_scores(latest.to_frame().T).iloc[0]
+        indicators = {'vix': vix_current}
+        scores = []
+        for key, label in FG_INDICATORS.items():
+            if pd.isna(latest[key]):
+                continue
+            score = float(latest_scores[key])
+            indicators[key] = {'value': float(latest[key]), 'score': score, 'label': label}
+            scores.append(score)
+
+        final_score = max(0, min(100, sum(scores) / len(scores))) if scores else 50
+        return {
+            'score': final_score,
+            'label': fear_greed_label(final_score),
+            'vix': vix_current,
+            'indicators': indicators,
+            'num_indicators': len(scores)
+        }
+    except Exception as e:
+        return {
+            'score': 50,
+            'label': "Neutral",
+            'vix': DEFAULT_VIX,
+            'indicators': {},
+            'num_indicators': 0,
+            'error': str(e)
+        }
+
+
+class FearGreedHistory:
+    """On-disk daily Fear & Greed series, backfilled once and then extended a row per day.
+
+    fetcher(period=None, start=None) -> DataFrame of component closes (one column each)."""
+
+    def __init__(self, root: str = None, fetcher=None):
+        self.root = root or os.path.join(DATA_DIR, 'fear_greed')
+        self.fetcher = fetcher
+        self._lock = threading.Lock()
+
+    @property
+    def path(self) -> str:
+        return os.path.join(self.root, 'daily.parquet')
+
+    def load(self) -> pd.DataFrame:
+        if not os.path.exists(self.path):
+            return pd.DataFrame()
+        try:
+            return pd.read_parquet(self.path)
+        except Exception:
+            return pd.DataFrame()
+
+    def save(self, df: pd.DataFrame):
+        """Atomically replace the stored series (best effort)."""
+        tmp = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(self.root, exist_ok=True)
+            df.to_parquet(tmp)
+            os.replace(tmp, self.path)
+        except Exception:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+
+    def age(self) -> float:
+        """Seconds since the series was last updated (inf if missing)."""
+        if not os.path.exists(self.path):
+            return float('inf')
+        return time.time() - os.path.getmtime(self.path)
+
+    def update(self, force: bool = False) -> pd.DataFrame:
+        """Bring the stored series up to date and return it.
+
+        A cold or forced update backfills FG_HISTORY_PERIOD. Otherwise only the
+        last FG_WARMUP_DAYS of closes are fetched: enough for every rolling window,
+        and the last stored row (possibly an intraday reading) is recomputed."""
+        with self._lock:
+            stored = self.load()
+            if not force and not stored.empty and self.age() < FG_HISTORY_REFRESH:
+                return stored
+
+            if force or stored.empty:
+                closes = self.fetcher(period=FG_HISTORY_PERIOD)
+                history = fear_greed_history(closes) if closes is not None and not closes.empty else stored
+            else:
+                last = stored.index[-1]
+                closes = self.fetcher(start=(last - pd.Timedelta(days=FG_WARMUP_DAYS)).strftime('%Y-%m-%d'))
+                if closes is None or closes.empty:
+                    return stored
+                fresh = fear_greed_history(closes)
+                history = pd.concat([stored[stored.index < last], fresh[fresh.index >= last]])
+
+            if not history.empty:
+                self.save(history)
+            return history
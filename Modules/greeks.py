@@ -0,0 +1,141 @@
+import numpy as np
+import pandas as pd
+
+from Modules.options_analytics import CONTRACT_MULTIPLIER
+
+# ============================================================================
+# GREEKS - Black-Scholes greeks and dealer gamma exposure for whole chains
+# ============================================================================
+# Every contract of a chain_table() is priced at once with array operations.
+# Inputs are the strike, impliedVolatility and expiry yfinance already returns.
+#
+# Gamma exposure (GEX) follows the usual dealer convention: customers buy calls
+# and sell puts, so dealers are long call gamma and short put gamma. Per contract
+#   GEX = +/- gamma * OI * 100 * S^2 * 1%
+# is the dollar delta dealers must trade for a 1% move in the underlying. The
+# zero-gamma flip is the spot level where the summed profile changes sign: above
+# it dealer hedging dampens moves, below it hedging chases them.
+
+RISK_FREE_RATE = 0.045
+
+# Options stop trading at 16:00 New York time on the expiry date
+EXPIRY_TIME = pd.Timedelta(hours=16)
+MARKET_TZ = 'America/New_York'
+
+# Floors for pricing a live contract: an hour to expiry, 1% volatility. Contracts
+# past their expiry close (Yahoo lists same-day expiries into the evening) are dropped
+MIN_YEARS = 1 / (365 * 24)
+MIN_IV = 0.01
+
+# Spot range (fraction either side) and grid size scanned for the zero-gamma flip
+FLIP_RANGE = 0.25
+FLIP_STEPS = 201
+
+
+def norm_pdf(x):
+    return np.exp(-0.5 * np.square(x)) / np.sqrt(2 * np.pi)
+
+
+def norm_cdf(x):
+    """Standard normal CDF (Abramowitz & Stegun 26.2.17, |error| < 7.5e-8) — numpy has
+    no erf and scipy is not a dependency."""
+    x = np.asarray(x, dtype=float)
+    t = 1 / (1 + 0.2316419 * np.abs(x))
+    poly = t * (0.319381530 + t * (-0.356563782 + t * (1.781477937 + t * (-1.821255978 + t * 1.330274429))))
+    upper = norm_pdf(x) * poly
+    return np.where(x >= 0, 1 - upper, upper)
+
+
+def years_to_expiry(expiry, now: pd.Timestamp = None) -> np.ndarray:
+    """Years from now to each expiry date's 16:00 New York close (negative once it has passed)."""
+    now = now if now is not None else pd.Timestamp.now(tz=MARKET_TZ)
+    if now.tzinfo is None:
+        now = now.tz_localize(MARKET_TZ)
+    close = (pd.to_datetime(pd.Series(expiry)) + EXPIRY_TIME).dt.tz_localize(MARKET_TZ)
+    years = (close - now).dt.total_seconds().to_numpy() / (365.25 * 24 * 3600)
+    return years
+
+
+def black_scholes(spot, strike, years, vol, is_call, rate: float = RISK_FREE_RATE, dividend: float = 0.0) -> dict:
+    """Price, delta, gamma, vega (per vol point) and theta (per calendar day) for
+    broadcastable arrays of inputs. Contracts without a usable vol or strike are NaN."""
+    S, K, T, sigma = (np.asarray(a, dtype=float) for a in (spot, strike, years, vol))
+    call = np.asarray(is_call, dtype=bool)
+    valid = (sigma >= MIN_IV) & (K > 0) & (T > 0) & (S > 0)
+    sigma = np.where(valid, sigma, np.nan)
+    sqrt_t = np.sqrt(np.where(T > 0, T, np.nan))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        d1 = (np.log(S / K) + (rate - dividend + 0.5 * sigma ** 2) * T) / (sigma * sqrt_t)
+    d2 = d1 - sigma * sqrt_t
+    disc_r, disc_q = np.exp(-rate * T), np.exp(-dividend * T)
+    pdf = norm_pdf(d1)
+    sign = np.where(call, 1.0, -1.0)
+    cdf1, cdf2 = norm_cdf(sign * d1), norm_cdf(sign * d2)
+
+    price = sign * (S * disc_q * cdf1 - K * disc_r * cdf2)
+    delta = sign * disc_q * cdf1
+    gamma = disc_q * pdf / (S * sigma * sqrt_t)
+    vega = S * disc_q * pdf * sqrt_t / 100
+    theta = (-S * disc_q * pdf * sigma / (2 * sqrt_t)
+             - sign * rate * K * disc_r * cdf2
+             + sign * dividend * S * disc_q * cdf1) / 365
+    return {'price': price, 'delta': delta, 'gamma': gamma, 'vega': vega, 'theta': theta}
+
+
+def chain_greeks(table: pd.DataFrame, spot: float, rate: float = RISK_FREE_RATE,
+                 now: pd.Timestamp = None) -> pd.DataFrame:
+    """chain_table() with years, delta, gamma, vega, theta and dealer gex per live contract
+    (expired ones are left out; the last hour is priced as one hour)."""
+    years = years_to_expiry(table['expiry'], now) if not table.empty else np.empty(0)
+    out = table[years > 0].copy()
+    if out.empty:
+        for col in ('years', 'delta', 'gamma', 'vega', 'theta', 'gex'):
+            out[col] = pd.Series(dtype=float)
+        return out
+    out['years'] = np.maximum(years[years > 0], MIN_YEARS)
+    is_call = (out['type'] == 'call').to_numpy()
+    g = black_scholes(spot, out['strike'], out['years'], out['impliedVolatility'], is_call, rate)
+    for name in ('delta', 'gamma', 'vega', 'theta'):
+        out[name] = g[name]
+    dealer_sign = np.where(is_call, 1.0, -1.0)
+    out['gex'] = dealer_sign * out['gamma'] * out['openInterest'] * CONTRACT_MULTIPLIER * spot ** 2 * 0.01
+    return out
+
+
+def gex_by_strike(greeks: pd.DataFrame) -> pd.DataFrame:
+    """Call, put and net dealer gamma exposure ($ per 1% move) per strike, all expiries summed."""
+    if greeks.empty:
+        return pd.DataFrame(columns=['call_gex', 'put_gex', 'net_gex'])
+    by_type = greeks.pivot_table(index='strike', columns='type', values='gex', aggfunc='sum')
+    by_type = by_type.reindex(columns=['call', 'put']).fillna(0)
+    out = pd.DataFrame({'call_gex': by_type['call'], 'put_gex': by_type['put']})
+    out['net_gex'] = out['call_gex'] + out['put_gex']
+    return out.sort_index()
+
+
+def gex_profile(greeks: pd.DataFrame, levels, rate: float = RISK_FREE_RATE) -> pd.Series:
+    """Net dealer gamma exposure if the underlying were at each spot level (vols and
+    times held fixed) — a (levels x contracts) array evaluation."""
+    levels = np.asarray(levels, dtype=float)
+    priced = greeks.dropna(subset=['gamma'])
+    if priced.empty:
+        return pd.Series(np.zeros(len(levels)), index=levels)
+    is_call = (priced['type'] == 'call').to_numpy()
+    gamma = black_scholes(levels[:, None], priced['strike'].to_numpy()[None, :], priced['years'].to_numpy()[None, :],
+                          priced['impliedVolatility'].to_numpy()[None, :], is_call[None, :], rate)['gamma']
+    weight = np.where(is_call, 1.0, -1.0) * priced['openInterest'].to_numpy() * CONTRACT_MULTIPLIER
+    net = np.nansum(gamma * weight[None, :], axis=1) * levels ** 2 * 0.01
+    return pd.Series(net, index=levels)
+
+
+def zero_gamma_level(greeks: pd.DataFrame, spot: float, width: float = FLIP_RANGE, steps: int = FLIP_STEPS,
+                     rate: float = RISK_FREE_RATE):
+    """Spot level nearest the current price where net dealer gamma crosses zero
+    (linear interpolation on the profile grid); None if it keeps one sign."""
+    profile = gex_profile(greeks, np.linspace(spot * (1 - width), spot * (1 + width), steps), rate)
+    x, y = profile.index.to_numpy(), profile.to_numpy()
+    crossing = np.nonzero(np.sign(y[:-1]) * np.sign(y[1:]) < 0)[0]
+    if len(crossing) == 0:
+        return None
+    levels = x[crossing] - y[crossing] * (x[crossing + 1] - x[crossing]) / (y[crossing + 1] - y[crossing])
+    return float(levels[np.argmin(np.abs(levels - spot))])
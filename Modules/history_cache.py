@@ -0,0 +1,95 @@
+import threading
+import time
+from collections import OrderedDict
+
+import pandas as pd
+
+from Modules.price_store import REFRESH_SECONDS, period_start, slice_period
+
+# ============================================================================
+# HISTORY CACHE - Range-aware in-memory cache over the price store
+# ============================================================================
+# One entry per (ticker, interval) holding the widest window loaded so far.
+# Any narrower period ('1y' inside '2y', 'ytd' inside 'max') is sliced out
+# locally; the loader only runs when the cached span does not cover a request.
+
+
+def _span_start(period: str, now: pd.Timestamp):
+    """Calendar start of a period for coverage comparisons ('Nd' counted as sessions)."""
+    if period and period.endswith('d') and period[:-1].isdigit():
+        sessions = int(period[:-1])
+        # Sessions -> calendar days, allowing for weekends and a holiday
+        return now.normalize() - pd.Timedelta(days=sessions * 7 // 5 + 3)
+    return period_start(period, now)
+
+
+def period_covers(span: str, period: str) -> bool:
+    """True when a frame loaded for `span` contains everything `period` asks for."""
+    if span == 'max':
+        return True
+    if period == 'max':
+        return False
+    now = pd.Timestamp.now()
+    span_start = _span_start(span, now)
+    want_start = _span_start(period, now)
+    if span_start is None or want_start is None:
+        return span == period
+    return span_start <= want_start
+
+
+class HistoryCache:
+    """Serves sub-ranges of a cached superset frame.
+
+    loader(ticker, interval, period) -> (DataFrame, span) where span is the
+    period the frame actually covers ('max' when the full stored history was loaded)."""
+
+    def __init__(self, loader, max_entries: int = 256):
+        self.loader = loader
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0}
+
+    def _lookup(self, key, period: str):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        frame, span, loaded_at = entry
+        if time.time() - loaded_at > REFRESH_SECONDS.get(key[1], 300):
+            return None
+        if not period_covers(span, period):
+            return None
+        self._entries.move_to_end(key)
+        return frame
+
+    def get(self, ticker: str, period: str = '1y', interval: str = '1d') -> pd.DataFrame:
+        key = (ticker.upper(), interval)
+        with self._lock:
+            frame = self._lookup(key, period)
+            if frame is not None:
+                self.stats['hits'] += 1
+                return slice_period(frame, period).copy()
+            self.stats['misses'] += 1
+
+        frame, span = self.loader(ticker, interval, period)
+        if frame.empty:
+            return frame
+
+        with self._lock:
+            current = self._entries.get(key)
+            stale = current is None or time.time() - current[2] > REFRESH_SECONDS.get(interval, 300)
+            # Never replace a wider fresh span with a narrower fallback fetch
+            if stale or period_covers(span, current[1]):
+                self._entries[key] = (frame, span, time.time())
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return slice_period(frame, period).copy()
+
+    def invalidate(self, ticker: str = None):
+        with self._lock:
+            if ticker is None:
+                self._entries.clear()
+            else:
+                for key in [k for k in self._entries if k[0] == ticker.upper()]:
+                    del self._entries[key]
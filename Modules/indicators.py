@@ -0,0 +1,246 @@
+import copy
+import math
+import threading
+from collections import OrderedDict, deque
+
+import pandas as pd
+
+# ============================================================================
+# INDICATORS - Incremental RSI, EMA/MACD, Bollinger, ATR and moving averages
+# ============================================================================
+# The calculate_* helpers recompute every rolling and EWM statistic over the
+# whole series on each call. Here each (ticker, interval, window) keeps its rolling
+# state: a new bar updates every indicator in O(1), and the full series is only
+# walked on a cold start or when the history under it was revised.
+#
+# Definitions match the dashboard's helpers: RSI on simple 14-bar means of gains
+# and losses, EMAs with adjust=False seeded on the first close, Bollinger bands
+# on a sample (ddof=1) standard deviation, ATR as a simple mean of true range.
+
+
+class RollingWindow:
+    """Fixed-size window with a running sum and sum of squares.
+
+    Values are stored relative to the first one seen so the variance does not
+    cancel catastrophically at price scale; the sums are rebuilt exactly once
+    per window length to stop rounding drift (amortized O(1))."""
+
+    def __init__(self, size: int):
+        self.size = size
+        self.values = deque(maxlen=size)
+        self.anchor = None
+        self.total = 0.0
+        self.total_sq = 0.0
+        self.nonzero = 0
+        self._pushes = 0
+
+    def push(self, x: float):
+        if self.anchor is None:
+            self.anchor = x
+        if len(self.values) == self.size:
+            old = self.values[0]
+            self.total -= old - self.anchor
+            self.total_sq -= (old - self.anchor) ** 2
+            self.nonzero -= old != 0
+        self.values.append(x)
+        self.total += x - self.anchor
+        self.total_sq += (x - self.anchor) ** 2
+        self.nonzero += x != 0
+        self._pushes += 1
+        if self._pushes % self.size == 0:
+            self.total = math.fsum(v - self.anchor for v in self.values)
+            self.total_sq = math.fsum((v - self.anchor) ** 2 for v in self.values)
+
+    @property
+    def full(self) -> bool:
+        return len(self.values) == self.size
+
+    def mean(self) -> float:
+        if not self.full:
+            return math.nan
+        # An all-zero window is exactly zero, whatever rounding the running sum carries
+        return 0.0 if self.nonzero == 0 else self.anchor + self.total / self.size
+
+    def std(self) -> float:
+        if not self.full or self.size < 2:
+            return math.nan
+        var = (self.total_sq - self.total ** 2 / self.size) / (self.size - 1)
+        return math.sqrt(max(var, 0.0))
+
+
+class EMA:
+    """Exponential moving average with pandas' adjust=False recursion."""
+
+    def __init__(self, span: int):
+        self.alpha = 2 / (span + 1)
+        self.value = math.nan
+
+    def push(self, x: float) -> float:
+        self.value = x if math.isnan(self.value) else self.alpha * x + (1 - self.alpha) * self.value
+        return self.value
+
+
+class IndicatorState:
+    """Rolling state of every indicator for one bar series."""
+
+    def __init__(self, rsi_period: int = 14, macd: tuple = (12, 26, 9), bb_period: int = 20,
+                 bb_std: float = 2.0, atr_period: int = 14, sma_windows: tuple = (50, 200)):
+        self.bb_std = bb_std
+        self.gains = RollingWindow(rsi_period)
+        self.losses = RollingWindow(rsi_period)
+        self.ema_fast, self.ema_slow, self.ema_signal = (EMA(span) for span in macd)
+        self.bb = RollingWindow(bb_period)
+        self.tr = RollingWindow(atr_period)
+        self.smas = {w: RollingWindow(w) for w in sma_windows}
+        self.prev_close = math.nan
+        self.close = math.nan
+        self.bars = 0
+
+    def push(self, high: float, low: float, close: float):
+        delta = close - self.prev_close
+        # The first bar has no delta; the rolling-mean RSI counts it as a zero gain and loss
+        self.gains.push(delta if delta > 0 else 0.0)
+        self.losses.push(-delta if delta < 0 else 0.0)
+        macd = self.ema_fast.push(close) - self.ema_slow.push(close)
+        self.ema_signal.push(macd)
+        self.bb.push(close)
+        ranges = [high - low] + ([] if math.isnan(self.prev_close) else
+                                 [abs(high - self.prev_close), abs(low - self.prev_close)])
+        self.tr.push(max(ranges))
+        for sma in self.smas.values():
+            sma.push(close)
+        self.prev_close = close
+        self.close = close
+        self.bars += 1
+
+    def values(self) -> dict:
+        gain, loss = self.gains.mean(), self.losses.mean()
+        if math.isnan(gain) or (gain == 0 and loss == 0):
+            rsi = math.nan
+        else:
+            rsi = 100.0 if loss == 0 else 100 - 100 / (1 + gain / loss)
+        macd = self.ema_fast.value - self.ema_slow.value
+        middle, std = self.bb.mean(), self.bb.std()
+        return {
+            'close': self.close,
+            'bars': self.bars,
+            'rsi': rsi,
+            'ema_fast': self.ema_fast.value,
+            'ema_slow': self.ema_slow.value,
+            'macd': macd,
+            'macd_signal': self.ema_signal.value,
+            'macd_histogram': macd - self.ema_signal.value,
+            'bb_middle': middle,
+            'bb_upper': middle + std * self.bb_std,
+            'bb_lower': middle - std * self.bb_std,
+            'atr': self.tr.mean(),
+            **{f'sma{w}': sma.mean() for w, sma in self.smas.items()},
+        }
+
+
+class IndicatorSeries:
+    """IndicatorState tracking one bar history window as it is refreshed.
+
+    The last bar may still be forming (an intraday bar, today's daily bar), so the
+    state is checkpointed before it: the next update rolls back to the checkpoint
+    and replays from that bar on. Earlier bars are verified against the checkpoint;
+    if the source revised them (splits, dividend adjustment), or a trailing window
+    moved its first bar, the series is rebuilt so it matches the bars it was fed."""
+
+    def __init__(self, **params):
+        self.params = params
+        self.state = None
+        self._checkpoint = None
+        self._last_ts = None
+        self._anchor = None  # (timestamp, close) of the last settled bar
+        self._start = None  # first timestamp of the window the state was built from
+
+    def _replay(self, state: IndicatorState, bars: pd.DataFrame) -> IndicatorState:
+        highs, lows, closes = (bars[c].to_numpy(dtype=float) for c in ('High', 'Low', 'Close'))
+        for i in range(len(bars)):
+            if i == len(bars) - 1:
+                self._checkpoint = copy.deepcopy(state)
+            state.push(highs[i], lows[i], closes[i])
+        self._last_ts = bars.index[-1]
+        if len(bars) > 1:
+            self._anchor = (bars.index[-2], closes[-2])
+        return state
+
+    def _settled(self, bars: pd.DataFrame) -> bool:
+        if self._last_ts is None or self._last_ts not in bars.index or pd.isna(bars.at[self._last_ts, 'Close']):
+            return False
+        if self._anchor is None:
+            return True
+        ts, close = self._anchor
+        return ts in bars.index and math.isclose(bars.at[ts, 'Close'], close, rel_tol=1e-9)
+
+    def update(self, bars: pd.DataFrame) -> str:
+        """Advance to the end of bars; returns 'rebuilt', 'updated' or 'unchanged'."""
+        clean = lambda df: df[~df.index.duplicated(keep='last')].sort_index().dropna(subset=['High', 'Low', 'Close'])
+        start = bars.index.min() if len(bars) else None
+        if self.state is not None and start == self._start and self._settled(bars):
+            # Only the bars from the checkpoint on are read
+            self.state = self._replay(self._checkpoint, clean(bars[bars.index >= self._last_ts]))
+            return 'updated'
+        bars = clean(bars)
+        if bars.empty:
+            return 'unchanged'
+        self.state = self._replay(IndicatorState(**self.params), bars)
+        self._start = start
+        return 'rebuilt'
+
+    def values(self) -> dict:
+        return self.state.values() if self.state is not None else {}
+
+
+class IndicatorEngine:
+    """Process-wide incremental indicators keyed by (ticker, interval, period), LRU-bounded.
+
+    EMA-based values depend on where the series starts, so each history window
+    a caller reads (a chart timeframe, the watchlist's indicator window) keeps
+    its own state and matches a full computation over that window."""
+
+    def __init__(self, max_series: int = 1024, **params):
+        self.params = params
+        self.max_series = max_series
+        self._series = OrderedDict()
+        self._locks = {}
+        self._lock = threading.Lock()
+        self.stats = {'rebuilt': 0, 'updated': 0, 'unchanged': 0}
+
+    def _get(self, key: tuple) -> tuple:
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = IndicatorSeries(**self.params)
+                self._locks[key] = threading.Lock()
+            self._series.move_to_end(key)
+            while len(self._series) > self.max_series:
+                old, _ = self._series.popitem(last=False)
+                self._locks.pop(old, None)
+            return series, self._locks.setdefault(key, threading.Lock())
+
+    def update(self, ticker: str, interval: str, bars: pd.DataFrame, period: str = None) -> dict:
+        """Feed the latest OHLC bars for a series and return its current indicator values.
+        `period` names the history window the bars come from."""
+        series, lock = self._get((ticker, interval, period))
+        with lock:
+            outcome = series.update(bars)
+            values = series.values()
+        with self._lock:
+            self.stats[outcome] += 1
+        return values
+
+    def latest(self, ticker: str, interval: str, period: str = None) -> dict:
+        """Last computed values for a series without feeding it ({} if never fed)."""
+        with self._lock:
+            series = self._series.get((ticker, interval, period))
+        return series.values() if series is not None else {}
+
+    def invalidate(self):
+        with self._lock:
+            self._series.clear()
+            self._locks.clear()
+
+    def __len__(self):
+        return len(self._series)
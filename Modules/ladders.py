@@ -0,0 +1,20 @@
+import numpy as np
+
+# ============================================================================
+# LADDERS - Threshold-to-score lookups as one vectorized step
+# ============================================================================
+# Scoring code is full of if/elif ladders ("x < 12 -> 95, x < 15 -> 80, ...").
+# Expressed as (edges, scores) they score a scalar, a Series or a whole panel
+# with np.digitize instead of a branch per element.
+
+
+def ladder(x, edges, scores, right: bool = False):
+    """Map x onto scores by ascending edges; len(scores) == len(edges) + 1.
+
+    right=False reproduces an "x < edge" ladder (edge values fall in the band above),
+    right=True an "x > edge" ladder (edge values fall in the band below).
+    NaN inputs give NaN. Returns a float array shaped like x (a float for a scalar)."""
+    values = np.asarray(x, dtype=float)
+    out = np.asarray(scores, dtype=float)[np.digitize(values, edges, right=right)]
+    out = np.where(np.isnan(values), np.nan, out)
+    return float(out) if out.ndim == 0 else out
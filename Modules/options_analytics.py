@@ -0,0 +1,155 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+# ============================================================================
+# OPTIONS ANALYTICS - Whole-chain open-interest analytics across every expiry
+# ============================================================================
+# A chain is one long table: a row per contract with its expiry, type, strike
+# and open interest. Max pain for every expiry comes from one sort and two
+# cumulative sums per side instead of re-filtering the chain for every strike:
+#
+#   pain(K) = sum_calls OI * max(K - strike, 0) + sum_puts OI * max(strike - K, 0)
+#           = K * OI_calls_below(K) - (OI*strike)_calls_below(K)
+#             + (OI*strike)_puts_above(K) - K * OI_puts_above(K)
+#
+# Each prefix sum is read with a searchsorted on (expiry, strike) keys, so all
+# expiries are evaluated together in O(S log S).
+
+CONTRACT_MULTIPLIER = 100
+
+# Per-contract fields kept from yfinance option_chain() frames
+CHAIN_FIELDS = ['contractSymbol', 'strike', 'lastPrice', 'bid', 'ask', 'volume', 'openInterest',
+                'impliedVolatility', 'inTheMoney', 'lastTradeDate']
+
+ALL_EXPIRIES = 'ALL'
+
+
+def chain_table(chains: dict) -> pd.DataFrame:
+    """Long contract table from {expiry: {'calls': frame, 'puts': frame}}."""
+    parts = []
+    for expiry, chain in chains.items():
+        for kind in ('calls', 'puts'):
+            frame = chain.get(kind) if chain else None
+            if frame is None or frame.empty:
+                continue
+            part = frame.reindex(columns=CHAIN_FIELDS).copy()
+            part.insert(0, 'type', kind[:-1])
+            part.insert(0, 'expiry', expiry)
+            parts.append(part)
+    if not parts:
+        return pd.DataFrame(columns=['expiry', 'type'] + CHAIN_FIELDS)
+    table = pd.concat(parts, ignore_index=True)
+    for col in ('strike', 'lastPrice', 'bid', 'ask', 'volume', 'openInterest', 'impliedVolatility'):
+        table[col] = pd.to_numeric(table[col], errors='coerce')
+    table[['volume', 'openInterest']] = table[['volume', 'openInterest']].fillna(0)
+    return table.dropna(subset=['strike'])
+
+
+def pain_curve(table: pd.DataFrame, pooled: bool = False) -> pd.DataFrame:
+    """Total intrinsic payout (in dollars) at expiry for every listed strike of every
+    expiry: columns expiry, strike, call_pain, put_pain, pain. pooled=True treats all
+    expiries as one (expiry 'ALL')."""
+    columns = ['expiry', 'strike', 'call_pain', 'put_pain', 'pain']
+    if table.empty:
+        return pd.DataFrame(columns=columns)
+    expiry = pd.Series(ALL_EXPIRIES, index=table.index) if pooled else table['expiry'].astype(str)
+    codes, labels = pd.factorize(expiry, sort=True)
+    strike = table['strike'].to_numpy(dtype=float)
+    oi = table['openInterest'].to_numpy(dtype=float)
+    # (expiry, strike) as one sortable number: each expiry owns a span wider than any strike
+    span = 2 * max(float(np.abs(strike).max()), 1.0) + 1
+    key = codes * span + strike
+    is_call = (table['type'] == 'call').to_numpy()
+
+    def prefix(mask):
+        order = np.argsort(key[mask], kind='stable')
+        k, w = key[mask][order], oi[mask][order]
+        s = strike[mask][order]
+        return k, np.concatenate([[0.0], np.cumsum(w)]), np.concatenate([[0.0], np.cumsum(w * s)])
+
+    call_key, call_oi, call_oik = prefix(is_call)
+    put_key, put_oi, put_oik = prefix(~is_call)
+
+    candidates = pd.DataFrame({'code': codes, 'strike': strike}).drop_duplicates().sort_values(['code', 'strike'])
+    c_code = candidates['code'].to_numpy()
+    c_strike = candidates['strike'].to_numpy()
+    c_key = c_code * span + c_strike
+    group_start, group_end = c_code * span - span / 2, c_code * span + span / 2
+
+    # Calls of the same expiry struck below K
+    lo = np.searchsorted(call_key, group_start, side='left')
+    hi = np.searchsorted(call_key, c_key, side='left')
+    call_pain = c_strike * (call_oi[hi] - call_oi[lo]) - (call_oik[hi] - call_oik[lo])
+    # Puts of the same expiry struck above K
+    lo = np.searchsorted(put_key, c_key, side='right')
+    hi = np.searchsorted(put_key, group_end, side='left')
+    put_pain = (put_oik[hi] - put_oik[lo]) - c_strike * (put_oi[hi] - put_oi[lo])
+
+    curve = pd.DataFrame({
+        'expiry': np.asarray(labels)[c_code],
+        'strike': c_strike,
+        'call_pain': call_pain * CONTRACT_MULTIPLIER,
+        'put_pain': put_pain * CONTRACT_MULTIPLIER,
+    })
+    curve['pain'] = curve['call_pain'] + curve['put_pain']
+    return curve[columns].reset_index(drop=True)
+
+
+def max_pain(table: pd.DataFrame, pooled: bool = False) -> pd.DataFrame:
+    """Max-pain strike per expiry (the lowest strike on a tie) with the payout there and
+    the open interest behind it. pooled=True gives one row across every expiry."""
+    columns = ['max_pain', 'pain', 'call_oi', 'put_oi', 'put_call_oi']
+    curve = pain_curve(table, pooled)
+    if curve.empty:
+        return pd.DataFrame(columns=columns)
+    best = curve.loc[curve.groupby('expiry', sort=True)['pain'].idxmin()].set_index('expiry')
+    expiry = pd.Series(ALL_EXPIRIES, index=table.index) if pooled else table['expiry'].astype(str)
+    oi = table.pivot_table(index=expiry, columns='type', values='openInterest', aggfunc='sum')
+    oi = oi.reindex(index=best.index, columns=['call', 'put']).fillna(0)
+    result = pd.DataFrame({
+        'max_pain': best['strike'],
+        'pain': best['pain'],
+        'call_oi': oi['call'],
+        'put_oi': oi['put'],
+    })
+    result['put_call_oi'] = result['put_oi'] / result['call_oi'].where(result['call_oi'] > 0)
+    return result[columns]
+
+
+def chain_fingerprint(table: pd.DataFrame) -> int:
+    """Content hash of a chain snapshot — equal snapshots share cached analytics.
+    The fetch time (ChainStore's `snapshot` column) is not part of the content."""
+    if table.empty:
+        return 0
+    return int(pd.util.hash_pandas_object(table.drop(columns='snapshot', errors='ignore'), index=False).sum())
+
+
+class ChainAnalyticsCache:
+    """Analytics results memoized per chain snapshot, LRU-bounded.
+
+    get(table, name, fn) returns fn(table), computing it once per distinct snapshot
+    content — re-rendering a page or re-reading an unchanged chain is a lookup."""
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {'hit': 0, 'miss': 0}
+
+    def get(self, table: pd.DataFrame, name: str, fn):
+        key = (chain_fingerprint(table), name)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.stats['hit'] += 1
+                return self._entries[key]
+        value = fn(table)
+        with self._lock:
+            self.stats['miss'] += 1
+            self._entries[key] = value
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
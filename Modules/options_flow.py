@@ -0,0 +1,143 @@
+import heapq
+import itertools
+
+import numpy as np
+import pandas as pd
+
+from Modules.chain_store import CONTRACT_KEY
+from Modules.greeks import MIN_IV
+from Modules.options_analytics import CONTRACT_MULTIPLIER
+
+# ============================================================================
+# OPTIONS FLOW - Unusual options activity across a watchlist
+# ============================================================================
+# A contract is unusual when today's volume dwarfs its open interest (new
+# positions rather than existing ones changing hands), when the premium traded
+# is large, or when its implied vol moved sharply since the previous stored
+# snapshot day. Each ticker's chain is flagged and scored with array
+# operations; only flagged contracts enter a bounded min-heap, so ranking a
+# whole universe keeps K rows in memory and never sorts the full set.
+
+# Volume at least this multiple of open interest
+UOA_VOL_OI = 3.0
+# Contracts traded below this volume are never flagged
+UOA_MIN_VOLUME = 100
+# Dollar premium traded today (volume x price x 100)
+UOA_MIN_PREMIUM = 250_000
+# Implied vol change vs the previous snapshot day, in vol (not percent) points
+UOA_IV_CHANGE = 0.10
+
+# Score weights (sum to 100) and the level at which each part saturates
+UOA_WEIGHTS = {'vol_oi': 40, 'premium': 40, 'iv_change': 20}
+UOA_SATURATION = {'vol_oi': UOA_VOL_OI * 4, 'premium': UOA_MIN_PREMIUM * 10, 'iv_change': UOA_IV_CHANGE * 2}
+
+UOA_TOP_K = 50
+
+UOA_COLUMNS = ['ticker', 'expiry', 'type', 'strike', 'volume', 'openInterest', 'vol_oi', 'price', 'premium',
+               'impliedVolatility', 'iv_change', 'flags', 'score']
+
+
+# Flag names by bit; every combination's label is precomputed
+UOA_FLAGS = ['VOL>OI', 'PREMIUM', 'IV JUMP']
+_FLAG_LABELS = np.array([' '.join(f for bit, f in enumerate(UOA_FLAGS) if code >> bit & 1)
+                         for code in range(2 ** len(UOA_FLAGS))], dtype=object)
+
+
+def _activity(table: pd.DataFrame, previous: pd.DataFrame = None) -> dict:
+    """Per-contract activity measures, flags and score as arrays aligned with table."""
+    col = lambda name: table[name].to_numpy(dtype=float)
+    bid, ask, last, volume, oi, iv = (col(c) for c in ('bid', 'ask', 'lastPrice', 'volume', 'openInterest',
+                                                       'impliedVolatility'))
+    mid = np.where((bid > 0) & (ask >= bid), (bid + ask) / 2, np.nan)
+    price = np.where(last > 0, last, mid)
+    premium = np.nan_to_num(volume * price * CONTRACT_MULTIPLIER)
+    vol_oi = volume / np.maximum(oi, 1)
+    iv_change = np.full(len(table), np.nan)
+    if previous is not None and not previous.empty:
+        prev_iv = previous.groupby(CONTRACT_KEY)['impliedVolatility'].last()
+        pos = prev_iv.index.get_indexer(pd.MultiIndex.from_arrays([table[c] for c in CONTRACT_KEY]))
+        before = np.where(pos >= 0, prev_iv.to_numpy(dtype=float)[pos], np.nan)
+        # Yahoo reports near-zero vols for stale quotes; a change needs real vols on both days
+        iv_change = np.where((iv >= MIN_IV) & (before >= MIN_IV), iv - before, np.nan)
+
+    traded = volume >= UOA_MIN_VOLUME
+    with np.errstate(invalid='ignore'):
+        hits = np.column_stack([traded & (vol_oi >= UOA_VOL_OI),
+                                traded & (premium >= UOA_MIN_PREMIUM),
+                                traded & (np.abs(iv_change) >= UOA_IV_CHANGE)])
+    parts = {'vol_oi': vol_oi, 'premium': premium, 'iv_change': np.abs(iv_change)}
+    score = sum(UOA_WEIGHTS[k] * np.nan_to_num(np.clip(parts[k] / UOA_SATURATION[k], 0, 1)) for k in parts)
+    return {
+        'price': price, 'premium': premium, 'vol_oi': vol_oi, 'iv_change': iv_change,
+        'flags': _FLAG_LABELS[hits @ (1 << np.arange(len(UOA_FLAGS)))],
+        'score': np.where(hits.any(axis=1), score, 0.0),
+    }
+
+
+class TopK:
+    """The K highest-scoring items pushed so far, kept in a min-heap."""
+
+    def __init__(self, k: int = UOA_TOP_K):
+        self.k = k
+        self._heap = []
+        self._seq = itertools.count()
+
+    def push(self, score: float, item):
+        # The sequence number breaks ties without ever comparing items
+        entry = (score, next(self._seq), item)
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+        elif score > self._heap[0][0]:
+            heapq.heapreplace(self._heap, entry)
+
+    def floor(self) -> float:
+        """Score an item must beat to enter (−inf until the heap is full)."""
+        return self._heap[0][0] if len(self._heap) == self.k else -np.inf
+
+    def items(self) -> list:
+        """Items, highest score first."""
+        return [item for _, _, item in sorted(self._heap, key=lambda e: (-e[0], e[1]))]
+
+    def __len__(self):
+        return len(self._heap)
+
+
+def unusual_activity(ticker: str, table: pd.DataFrame, previous: pd.DataFrame = None, top: TopK = None) -> TopK:
+    """Push one ticker's flagged contracts (those beating the heap floor) into `top`."""
+    top = top if top is not None else TopK()
+    if table.empty:
+        return top
+    activity = _activity(table, previous)
+    # Rows are only built for contracts that can still enter the heap
+    rows = np.nonzero((activity['score'] > 0) & (activity['score'] > top.floor()))[0]
+    if len(rows) == 0:
+        return top
+    base = table.iloc[rows].assign(ticker=ticker)
+    columns = {c: activity[c][rows] if c in activity else base[c].to_numpy() for c in UOA_COLUMNS}
+    for values in zip(*columns.values()):
+        item = dict(zip(UOA_COLUMNS, values))
+        top.push(item['score'], item)
+    return top
+
+
+def scan_unusual(tickers, load, k: int = UOA_TOP_K, executor=None) -> pd.DataFrame:
+    """Top-K unusual contracts across tickers, one row each (UOA_COLUMNS).
+
+    load(ticker) -> (chain_table, previous snapshot or None); with an executor the
+    chains are loaded in parallel and scored as they arrive. Tickers that fail to
+    load are skipped."""
+    def safe_load(ticker):
+        try:
+            return load(ticker)
+        except Exception:
+            return None
+
+    top = TopK(k)
+    loaded = executor.map(safe_load, tickers) if executor is not None else map(safe_load, tickers)
+    for ticker, result in zip(tickers, loaded):
+        if result is None:
+            continue
+        table, previous = result
+        if table is not None and not table.empty:
+            unusual_activity(ticker, table, previous, top)
+    return pd.DataFrame(top.items(), columns=UOA_COLUMNS)
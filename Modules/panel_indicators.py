@@ -0,0 +1,148 @@
+import numpy as np
+import pandas as pd
+
+# ============================================================================
+# PANEL INDICATORS - Technical indicators for every column of a close panel
+# ============================================================================
+# Inputs are date x ticker panels (DataFrame or 2-D array). Histories are ragged:
+# tickers start on different dates and exchanges skip different sessions. Each
+# column is first compacted onto its own sessions (valid values pushed to the
+# bottom, NaN padding on top), every indicator runs column-wise on that block,
+# and the result is scattered back to the original dates. So a holiday on one
+# exchange never opens a NaN hole in another ticker's rolling window, and no
+# ticker is ever looped over in Python.
+
+
+def align_order(values: np.ndarray) -> np.ndarray:
+    """Row order per column that pushes NaN to the top and keeps valid rows in sequence."""
+    return np.argsort(~np.isnan(values), axis=0, kind='stable')
+
+
+def right_align(panel) -> np.ndarray:
+    """Panel as a (sessions x tickers) array with each ticker's own series pushed to
+    the bottom, so row -k is every ticker's k-th most recent value."""
+    values = np.asarray(panel, dtype=float)
+    return np.take_along_axis(values, align_order(values), axis=0)
+
+
+class _Aligned:
+    """One panel compacted per column, and the inverse scatter back to its dates."""
+
+    def __init__(self, panel, order: np.ndarray = None):
+        self.index = panel.index if isinstance(panel, pd.DataFrame) else None
+        self.columns = panel.columns if isinstance(panel, pd.DataFrame) else None
+        values = np.asarray(panel, dtype=float)
+        self.order = align_order(values) if order is None else order
+        self.frame = pd.DataFrame(np.take_along_axis(values, self.order, axis=0))
+        # Row of each column's first valid value in the compacted block
+        self.start = len(values) - (~np.isnan(values)).sum(axis=0)
+
+    def restore(self, aligned):
+        out = np.empty(self.frame.shape)
+        np.put_along_axis(out, self.order, np.asarray(aligned, dtype=float), axis=0)
+        if self.index is None:
+            return out
+        return pd.DataFrame(out, index=self.index, columns=self.columns)
+
+    def since_start(self, offset: int = 0) -> np.ndarray:
+        """Boolean mask of rows at least `offset` rows past each column's first value."""
+        rows = np.arange(len(self.frame))[:, None]
+        return rows >= self.start[None, :] + offset
+
+
+def sma(panel, window: int):
+    """Simple moving average over each ticker's last `window` sessions."""
+    a = _Aligned(panel)
+    return a.restore(a.frame.rolling(window).mean())
+
+
+def ema(panel, span: int):
+    """Exponential moving average (adjust=False, seeded on each ticker's first close)."""
+    a = _Aligned(panel)
+    return a.restore(a.frame.ewm(span=span, adjust=False).mean())
+
+
+def wilder_rsi(panel, period: int = 14):
+    """Wilder's RSI: average gain/loss seeded with the simple mean of the first
+    `period` changes, then smoothed with alpha = 1/period."""
+    a = _Aligned(panel)
+    delta = a.frame.diff()
+    seed_row = a.since_start(period) & ~a.since_start(period + 1)
+    live = a.since_start(period + 1)
+
+    def smoothed(moves: pd.DataFrame) -> pd.DataFrame:
+        seed = moves.rolling(period).mean()
+        # NaN before the seed row, so the recursion starts exactly there
+        start = moves.where(live, seed.where(seed_row))
+        return start.ewm(alpha=1 / period, adjust=False).mean()
+
+    gain = smoothed(delta.clip(lower=0))
+    loss = smoothed(-delta.clip(upper=0))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rsi = 100 - 100 / (1 + gain / loss)
+    return a.restore(rsi)
+
+
+def macd(panel, fast: int = 12, slow: int = 26, signal: int = 9) -> dict:
+    """MACD line, signal line and histogram per ticker."""
+    a = _Aligned(panel)
+    line = a.frame.ewm(span=fast, adjust=False).mean() - a.frame.ewm(span=slow, adjust=False).mean()
+    sig = line.ewm(span=signal, adjust=False).mean()
+    return {'macd': a.restore(line), 'signal': a.restore(sig), 'histogram': a.restore(line - sig)}
+
+
+def bollinger(panel, period: int = 20, std_dev: float = 2.0) -> dict:
+    """Bollinger middle/upper/lower bands and %B per ticker (sample std, as calculate_bollinger_bands)."""
+    a = _Aligned(panel)
+    middle = a.frame.rolling(period).mean()
+    width = a.frame.rolling(period).std() * std_dev
+    upper, lower = middle + width, middle - width
+    with np.errstate(divide='ignore', invalid='ignore'):
+        pct_b = (a.frame - lower) / (upper - lower)
+    return {'middle': a.restore(middle), 'upper': a.restore(upper), 'lower': a.restore(lower),
+            'pct_b': a.restore(pct_b)}
+
+
+def atr(high, low, close, period: int = 14):
+    """Average true range per ticker (simple mean of true range, as calculate_atr).
+    High and low are compacted on the close panel's sessions."""
+    c = _Aligned(close)
+    take = lambda p: pd.DataFrame(np.take_along_axis(np.asarray(p, dtype=float), c.order, axis=0))
+    h, l = take(high), take(low)
+    prev = c.frame.shift()
+    tr = np.fmax(h - l, np.fmax((h - prev).abs(), (l - prev).abs()))
+    tr = tr.where(c.since_start(0))
+    return c.restore(tr.rolling(period).mean())
+
+
+def realized_vol(panel, window: int = 20, periods_per_year: int = 252):
+    """Annualized realized volatility of simple returns over `window` sessions, in percent."""
+    a = _Aligned(panel)
+    returns = a.frame.pct_change(fill_method=None)
+    return a.restore(returns.rolling(window).std() * np.sqrt(periods_per_year) * 100)
+
+
+def last_valid(frame: pd.DataFrame) -> pd.Series:
+    """Each column's most recent non-NaN value."""
+    return pd.Series(right_align(frame)[-1] if len(frame) else np.nan, index=frame.columns)
+
+
+def technical_snapshot(panel: pd.DataFrame) -> pd.DataFrame:
+    """Latest technicals per ticker for screening: Wilder RSI, MACD histogram,
+    Bollinger %B, distance from the 50/200-session means and 20-session volatility."""
+    if panel.empty:
+        return pd.DataFrame(index=panel.columns, columns=['rsi', 'macd_hist', 'pct_b', 'vs_ma50', 'vs_ma200', 'vol_20d'])
+    # Read every indicator on each ticker's own last session
+    order = align_order(panel.to_numpy(dtype=float))
+    latest = lambda frame: pd.Series(np.take_along_axis(np.asarray(frame, dtype=float), order, axis=0)[-1],
+                                     index=panel.columns)
+    last = latest(panel)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return pd.DataFrame({
+            'rsi': latest(wilder_rsi(panel)),
+            'macd_hist': latest(macd(panel)['histogram']),
+            'pct_b': latest(bollinger(panel)['pct_b']),
+            'vs_ma50': (last / latest(sma(panel, 50)) - 1) * 100,
+            'vs_ma200': (last / latest(sma(panel, 200)) - 1) * 100,
+            'vol_20d': latest(realized_vol(panel)),
+        }, index=panel.columns)
@@ -0,0 +1,279 @@
+import os
+import threading
+import time
+
+import pandas as pd
+
+# ============================================================================
+# PRICE STORE - Persistent Parquet-backed OHLCV history
+# ============================================================================
+# Layout: <root>/<interval>/<TICKER>.parquet — one file per ticker and interval,
+# holding the full history ever fetched. Reads only go to the network for the
+# bars after the last stored timestamp.
+
+DATA_DIR = os.environ.get('MISPRICED_DATA_DIR', os.path.join(os.path.expanduser('~'), '.mispriced'))
+
+# Longest window Yahoo serves for each interval on a cold fetch
+COLD_FETCH_PERIOD = {
+    '1m': '7d',
+    '2m': '60d', '5m': '60d', '15m': '60d', '30m': '60d', '90m': '60d',
+    '60m': '730d', '1h': '730d',
+}
+
+# Seconds a stored series is considered current before a delta fetch
+REFRESH_SECONDS = {
+    '1m': 60, '2m': 60, '5m': 60, '15m': 60, '30m': 120, '90m': 300,
+    '60m': 300, '1h': 300,
+    '1d': 300, '5d': 900, '1wk': 3600, '1mo': 3600, '3mo': 3600,
+}
+
+# Relative Close drift on the overlapping bar that means Yahoo re-adjusted history
+ADJUSTMENT_TOLERANCE = 1e-4
+
+
+def period_start(period: str, end: pd.Timestamp):
+    """First timestamp covered by a Yahoo-style period ending at `end` (None for 'max')."""
+    if not period or period == 'max':
+        return None
+    if period == 'ytd':
+        return end.normalize().replace(month=1, day=1)
+    for suffix, unit in (('mo', 'months'), ('wk', 'weeks'), ('y', 'years'), ('d', 'days')):
+        if period.endswith(suffix):
+            try:
+                n = int(period[:-len(suffix)])
+            except ValueError:
+                return None
+            return end.normalize() - pd.DateOffset(**{unit: n})
+    return None
+
+
+def slice_period(df: pd.DataFrame, period: str) -> pd.DataFrame:
+    """Cut a stored frame down to a Yahoo-style period.
+    'Nd' counts trading sessions (as Yahoo does); everything else is calendar based."""
+    if df.empty or not period or period == 'max':
+        return df
+    if period.endswith('d') and period[:-1].isdigit():
+        sessions = pd.Index(df.index.normalize()).unique()
+        n = int(period[:-1])
+        if len(sessions) <= n:
+            return df
+        return df[df.index.normalize() >= sessions[-n]]
+    now = pd.Timestamp.now(tz=df.index.tz)
+    start = period_start(period, now)
+    if start is None:
+        return df
+    return df[df.index >= start]
+
+
+def normalize_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Flatten yf.download column levels, sort, and drop duplicate bars."""
+    if df is None or df.empty:
+        return pd.DataFrame()
+    df = df.copy()
+    if isinstance(df.columns, pd.MultiIndex):
+        df.columns = df.columns.get_level_values(0)
+    df = df.loc[:, ~df.columns.duplicated()]
+    if not isinstance(df.index, pd.DatetimeIndex):
+        df.index = pd.to_datetime(df.index)
+    df = df[~df.index.duplicated(keep='last')].sort_index()
+    df.index.name = 'Date'
+    return df
+
+
+def _align_tz(df: pd.DataFrame, tz) -> pd.DataFrame:
+    """Bring `df` onto the timezone of the stored series so the two can be merged."""
+    if df.empty or df.index.tz == tz:
+        return df
+    df = df.copy()
+    if df.index.tz is None:
+        df.index = df.index.tz_localize(tz)
+    elif tz is None:
+        df.index = df.index.tz_localize(None)
+    else:
+        df.index = df.index.tz_convert(tz)
+    return df
+
+
+class PriceStore:
+    """On-disk OHLCV store partitioned by ticker and interval.
+
+    fetcher(ticker, period=None, interval='1d', start=None) -> DataFrame
+    is the network source; the store decides whether it needs a full or a delta fetch."""
+
+    def __init__(self, root: str = None, fetcher=None):
+        self.root = root or os.path.join(DATA_DIR, 'ohlcv')
+        self.fetcher = fetcher
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Paths and locking
+    # ------------------------------------------------------------------
+    def path(self, ticker: str, interval: str) -> str:
+        safe = ticker.upper().replace('/', '_').replace('\\', '_')
+        return os.path.join(self.root, interval, f"{safe}.parquet")
+
+    def _lock(self, ticker: str, interval: str) -> threading.Lock:
+        key = (ticker.upper(), interval)
+        with self._locks_guard:
+            if key not in self._locks:
+                self._locks[key] = threading.Lock()
+            return self._locks[key]
+
+    # ------------------------------------------------------------------
+    # Disk I/O
+    # ------------------------------------------------------------------
+    def load(self, ticker: str, interval: str = '1d') -> pd.DataFrame:
+        """Read the stored series (empty frame if nothing is stored yet)."""
+        path = self.path(ticker, interval)
+        if not os.path.exists(path):
+            return pd.DataFrame()
+        try:
+            return pd.read_parquet(path)
+        except Exception:
+            return pd.DataFrame()
+
+    def save(self, ticker: str, interval: str, df: pd.DataFrame):
+        """Atomically replace the stored series (best effort — a read never fails on a write)."""
+        path = self.path(ticker, interval)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            df.to_parquet(tmp)
+            os.replace(tmp, path)
+        except Exception:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+
+    def has(self, ticker: str, interval: str = '1d') -> bool:
+        """Whether a series for this ticker and interval is stored locally."""
+        return os.path.exists(self.path(ticker, interval))
+
+    def age(self, ticker: str, interval: str = '1d') -> float:
+        """Seconds since the stored series was last synced (inf if missing)."""
+        path = self.path(ticker, interval)
+        if not os.path.exists(path):
+            return float('inf')
+        return time.time() - os.path.getmtime(path)
+
+    def is_fresh(self, ticker: str, interval: str = '1d') -> bool:
+        return self.age(ticker, interval) < REFRESH_SECONDS.get(interval, 300)
+
+    # ------------------------------------------------------------------
+    # Sync
+    # ------------------------------------------------------------------
+    def _fetch(self, ticker: str, interval: str, period: str = None, start=None) -> pd.DataFrame:
+        if self.fetcher is None:
+            return pd.DataFrame()
+        try:
+            return normalize_frame(self.fetcher(ticker, period=period, interval=interval, start=start))
+        except Exception:
+            return pd.DataFrame()
+
+    def _full_fetch(self, ticker: str, interval: str) -> pd.DataFrame:
+        return self._fetch(ticker, interval, period=COLD_FETCH_PERIOD.get(interval, 'max'))
+
+    def sync(self, ticker: str, interval: str = '1d', force: bool = False) -> pd.DataFrame:
+        """Bring the stored series up to date and return it.
+        Cold: one full fetch. Warm: fetch only bars from the last stored session on.
+        A dividend, split or re-adjusted overlap bar triggers a full refetch."""
+        with self._lock(ticker, interval):
+            stored = self.load(ticker, interval)
+            if not force and not stored.empty and self.is_fresh(ticker, interval):
+                return stored
+
+            if stored.empty:
+                fresh = self._full_fetch(ticker, interval)
+                if not fresh.empty:
+                    self.save(ticker, interval, fresh)
+                return fresh
+
+            last_ts = stored.index[-1]
+            delta = _align_tz(self._fetch(ticker, interval, start=last_ts.normalize().date()), stored.index.tz)
+            if delta.empty:
+                # Network failed — serve what we have, retry after the refresh window
+                try:
+                    os.utime(self.path(ticker, interval))
+                except OSError:
+                    pass
+                return stored
+
+            if self._needs_rebuild(stored, delta):
+                fresh = self._full_fetch(ticker, interval)
+                if not fresh.empty:
+                    self.save(ticker, interval, fresh)
+                    return fresh
+                return stored
+
+            merged = pd.concat([stored[stored.index < delta.index[0]], delta])
+            merged = merged[~merged.index.duplicated(keep='last')].sort_index()
+            self.save(ticker, interval, merged)
+            return merged
+
+    @staticmethod
+    def _needs_rebuild(stored: pd.DataFrame, delta: pd.DataFrame) -> bool:
+        """Detect that Yahoo's adjusted history no longer lines up with ours."""
+        for col in ('Dividends', 'Stock Splits'):
+            if col not in delta.columns:
+                continue
+            events = delta.index[delta[col].fillna(0) != 0]
+            if col in stored.columns:
+                # Events we already rebuilt for are not new
+                known = stored.index[stored[col].fillna(0) != 0]
+                events = events.difference(known)
+            if len(events) > 0:
+                return True
+        overlap = stored.index.intersection(delta.index)
+        if len(overlap) > 1 and 'Close' in stored.columns and 'Close' in delta.columns:
+            # The final stored bar may have been a live partial bar — compare the settled ones
+            settled = overlap[:-1]
+            old = stored.loc[settled, 'Close'].astype(float)
+            new = delta.loc[settled, 'Close'].astype(float)
+            drift = ((new - old).abs() / old.abs().where(old != 0)).max()
+            if pd.notna(drift) and drift > ADJUSTMENT_TOLERANCE:
+                return True
+        return False
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+    def get(self, ticker: str, period: str = '1y', interval: str = '1d') -> pd.DataFrame:
+        """History for a Yahoo-style period, served from the store."""
+        return slice_period(self.sync(ticker, interval), period)
+
+    def get_range(self, ticker: str, start=None, end=None, interval: str = '1d') -> pd.DataFrame:
+        """History between two dates (end exclusive, matching yf.Ticker.history)."""
+        df = self.sync(ticker, interval)
+        if df.empty:
+            return df
+        tz = df.index.tz
+        if start is not None:
+            start = pd.Timestamp(start)
+            start = start.tz_localize(tz) if start.tzinfo is None and tz is not None else start
+            df = df[df.index >= start]
+        if end is not None:
+            end = pd.Timestamp(end)
+            end = end.tz_localize(tz) if end.tzinfo is None and tz is not None else end
+            df = df[df.index < end]
+        return df
+
+
+_shared_stores = {}
+_shared_guard = threading.Lock()
+
+
+def shared_store(fetcher=None, root: str = None) -> PriceStore:
+    """The process-wide store for a data directory. Every entry point gets the same
+    instance, and with it the per-ticker locks that keep two syncs off one file.
+    One fetcher serves the whole process: a store created without one takes the
+    first fetcher given, and a different fetcher afterwards raises ValueError."""
+    root = root or os.path.join(DATA_DIR, 'ohlcv')
+    with _shared_guard:
+        store = _shared_stores.get(root)
+        if store is None:
+            store = _shared_stores[root] = PriceStore(root=root, fetcher=fetcher)
+        elif fetcher is not None and store.fetcher is None:
+            store.fetcher = fetcher
+        elif fetcher is not None and store.fetcher is not fetcher:
+            raise ValueError(f"The price store at {root} already has a different fetcher")
+        return store
@@ -0,0 +1,87 @@
+import numpy as np
+import pandas as pd
+
+# ============================================================================
+# QUOTE SNAPSHOT - One batched download behind every market-overview widget
+# ============================================================================
+# The movers, ticker tape and index cards used to download overlapping symbol
+# sets separately and walk each result per ticker. The union is now fetched
+# once and reduced to a quote table with column operations; each widget is a
+# view over that table.
+
+MOVERS_UNIVERSE = ['AAPL', 'MSFT', 'GOOGL', 'AMZN', 'NVDA', 'META', 'TSLA', 'AMD', 'NFLX', 'CRM',
+                   'JPM', 'V', 'MA', 'BAC', 'WMT', 'JNJ', 'PG', 'UNH', 'HD', 'DIS',
+                   'PYPL', 'ADBE', 'INTC', 'CSCO', 'PEP', 'KO', 'MRK', 'ABT', 'TMO', 'COST']
+TAPE_TICKERS = ['SPY', 'QQQ', 'DIA', 'IWM', 'AAPL', 'MSFT', 'GOOGL', 'AMZN', 'NVDA', 'TSLA', 'META',
+                'BTC-USD', 'GC=F', 'CL=F']
+INDEX_TICKERS = ['SPY', 'QQQ', 'DIA', 'IWM']
+
+QUOTE_UNIVERSE = list(dict.fromkeys(INDEX_TICKERS + TAPE_TICKERS + MOVERS_UNIVERSE))
+
+# Enough sessions that every symbol has two closes across weekends and holidays
+SNAPSHOT_PERIOD = '5d'
+
+
+def _field(data: pd.DataFrame, field: str, symbols: list) -> pd.DataFrame:
+    """One OHLCV field as a date x symbol frame, whichever column layout yf.download returned."""
+    if isinstance(data.columns, pd.MultiIndex):
+        if field not in data.columns.get_level_values(0):
+            return pd.DataFrame(index=data.index)
+        frame = data[field]
+    else:
+        if field not in data.columns:
+            return pd.DataFrame(index=data.index)
+        frame = data[[field]].set_axis(symbols[:1], axis=1)
+    return frame.astype(float)
+
+
+def quote_table(data: pd.DataFrame, symbols: list) -> pd.DataFrame:
+    """Per-symbol last close, prior close, % change and last-session volume.
+
+    Symbols trade on different calendars (crypto on weekends), so "last" and
+    "prior" are each symbol's own last two valid closes, not the last two rows."""
+    columns = ['price', 'prev_close', 'change', 'volume']
+    if data is None or data.empty:
+        return pd.DataFrame(columns=columns)
+
+    closes = _field(data, 'Close', symbols)
+    volumes = _field(data, 'Volume', symbols).reindex(index=closes.index, columns=closes.columns)
+
+    valid = closes.notna()
+    rank = valid.cumsum()
+    count = valid.sum()
+    last_mask = valid & rank.eq(count, axis=1)
+    prev_mask = valid & rank.eq(count - 1, axis=1)
+
+    table = pd.DataFrame({
+        'price': closes.where(last_mask).sum(min_count=1),
+        'prev_close': closes.where(prev_mask).sum(min_count=1),
+        'volume': volumes.where(last_mask).sum(min_count=1).fillna(0),
+    })
+    table['change'] = (table['price'] / table['prev_close'] - 1) * 100
+    table = table.replace([np.inf, -np.inf], np.nan).dropna(subset=['price', 'prev_close'])
+    return table[columns]
+
+
+def movers_view(table: pd.DataFrame, universe: list = MOVERS_UNIVERSE, top: int = 5) -> dict:
+    """Top gainers, losers and most active of the movers universe."""
+    quotes = table.reindex([t for t in universe if t in table.index])
+    rows = lambda frame: [{'ticker': t, 'name': t, 'price': r.price, 'change': r.change, 'volume': r.volume}
+                          for t, r in frame.iterrows()]
+    return {
+        'gainers': rows(quotes.nlargest(top, 'change')),
+        'losers': rows(quotes.nsmallest(top, 'change')),
+        'active': rows(quotes.nlargest(top, 'volume')),
+    }
+
+
+def tape_view(table: pd.DataFrame, tickers: list = TAPE_TICKERS) -> list:
+    """Ticker tape entries in display order."""
+    quotes = table.reindex([t for t in tickers if t in table.index])
+    return [{'ticker': t, 'price': r.price, 'change': r.change} for t, r in quotes.iterrows()]
+
+
+def indices_view(table: pd.DataFrame, tickers: list = INDEX_TICKERS) -> dict:
+    """Index cards keyed by symbol."""
+    quotes = table.reindex([t for t in tickers if t in table.index])
+    return {t: {'current': r.price, 'prev': r.prev_close, 'change': r.change} for t, r in quotes.iterrows()}
@@ -0,0 +1,97 @@
+import heapq
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+
+# ============================================================================
+# RATE LIMITER - Process-wide token bucket with priorities for Yahoo calls
+# ============================================================================
+# Yahoo calls come from many places that know nothing about each other. They
+# all take a token from one bucket; when tokens are scarce, waiters are served
+# strictly by priority, so interactive single-asset loads go ahead of
+# background refreshes such as the ticker tape. A batched download of N
+# symbols makes N requests and takes N tokens; a batch larger than the burst
+# waits for a full bucket and leaves it in debt, so the average rate still holds.
+
+INTERACTIVE = 0
+BACKGROUND = 1
+
+
+class RateLimiter:
+    """Token bucket refilled at `rate` tokens/second up to `burst`, with a priority queue of waiters."""
+
+    def __init__(self, rate: float = 3.0, burst: int = 15):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._last = time.monotonic()
+        self._waiters = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._local = threading.local()
+        self.stats = {'granted': 0, 'waited': 0, 'timed_out': 0}
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    def current_priority(self) -> int:
+        return getattr(self._local, 'priority', INTERACTIVE)
+
+    @contextmanager
+    def priority(self, level: int):
+        """Run a block with a default priority for every acquire() on this thread."""
+        previous = getattr(self._local, 'priority', None)
+        self._local.priority = level
+        try:
+            yield
+        finally:
+            if previous is None:
+                del self._local.priority
+            else:
+                self._local.priority = previous
+
+    def acquire(self, priority: int = None, timeout: float = None, tokens: int = 1) -> bool:
+        """Take `tokens` tokens, waiting behind higher-priority callers. False on timeout."""
+        if priority is None:
+            priority = self.current_priority()
+        need = min(tokens, self.burst)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            ticket = (priority, next(self._seq))
+            heapq.heappush(self._waiters, ticket)
+            waited = False
+            try:
+                while True:
+                    self._refill()
+                    if self._waiters[0] == ticket and self._tokens >= need:
+                        self._tokens -= tokens
+                        self.stats['granted'] += tokens
+                        if waited:
+                            self.stats['waited'] += 1
+                        return True
+                    wait = max((need - self._tokens) / self.rate, 0.005)
+                    if deadline is not None:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            self.stats['timed_out'] += 1
+                            return False
+                        wait = min(wait, remaining)
+                    waited = True
+                    self._cond.wait(wait)
+            finally:
+                self._waiters.remove(ticket)
+                heapq.heapify(self._waiters)
+                self._cond.notify_all()
+
+    def call(self, fn, priority: int = None, tokens: int = 1):
+        """acquire() then fn() — for one-off call sites."""
+        self.acquire(priority, tokens=tokens)
+        return fn()
+
+    def snapshot(self) -> dict:
+        with self._cond:
+            self._refill()
+            return {'tokens': self._tokens, 'queued': len(self._waiters), **self.stats}
@@ -0,0 +1,88 @@
+import pandas as pd
+
+from Modules.price_store import COLD_FETCH_PERIOD
+from Modules.history_cache import period_covers
+
+# ============================================================================
+# RESAMPLER - Derive coarser OHLCV bars from a finer cached base series
+# ============================================================================
+
+# Candidate base intervals for each target, preferred first. A base is only used
+# when it is already stored and the target itself is not.
+RESAMPLE_BASES = {
+    '1wk': ['1d'],
+    '1mo': ['1d'],
+    '3mo': ['1d'],
+    '1h': ['15m', '5m', '30m', '2m', '1m'],
+    '60m': ['15m', '5m', '30m', '2m', '1m'],
+    '90m': ['15m', '5m', '30m', '1m'],
+    '30m': ['15m', '5m', '1m'],
+    '15m': ['5m', '1m'],
+    '5m': ['1m'],
+}
+
+# Calendar intervals: Yahoo labels weekly bars by their Monday and monthly bars by the 1st
+CALENDAR_RULES = {'1wk': 'W-MON', '1mo': 'MS', '3mo': 'QS'}
+
+INTRADAY_MINUTES = {'1m': 1, '2m': 2, '5m': 5, '15m': 15, '30m': 30, '60m': 60, '90m': 90, '1h': 60}
+
+OHLCV_AGG = {
+    'Open': 'first',
+    'High': 'max',
+    'Low': 'min',
+    'Close': 'last',
+    'Adj Close': 'last',
+    'Volume': 'sum',
+    'Dividends': 'sum',
+}
+
+
+def resample_base(interval: str, period: str, available) -> str:
+    """Pick the stored base interval to build `interval` bars from.
+    available(base) -> bool says whether a series is already stored locally.
+    Returns None — serve or fetch `interval` itself — when `interval` is stored,
+    or when no stored base can cover `period`: fetching the target directly is
+    never more data than fetching a finer base would be."""
+    if available(interval):
+        return None
+    for base in RESAMPLE_BASES.get(interval, []):
+        if period_covers(COLD_FETCH_PERIOD.get(base, 'max'), period) and available(base):
+            return base
+    return None
+
+
+def _session_offset(index: pd.DatetimeIndex, minutes: int) -> pd.Timedelta:
+    """Offset that makes intraday bins start at the exchange session open
+    (e.g. 09:30 for US equities, so hourly bars are 09:30, 10:30, ...)."""
+    open_minute = int((index.hour * 60 + index.minute).min())
+    return pd.Timedelta(minutes=open_minute % minutes)
+
+
+def resample_ohlcv(df: pd.DataFrame, interval: str) -> pd.DataFrame:
+    """Aggregate OHLCV bars to a coarser interval.
+    Open=first, High=max, Low=min, Close=last, Volume/Dividends=sum, splits compound."""
+    if df.empty:
+        return df
+
+    agg = {col: how for col, how in OHLCV_AGG.items() if col in df.columns}
+    if 'Stock Splits' in df.columns:
+        # Split ratios compound within a bar; 0 means "no split" in Yahoo data
+        df = df.assign(**{'Stock Splits': df['Stock Splits'].where(df['Stock Splits'] != 0, 1.0)})
+        agg['Stock Splits'] = 'prod'
+
+    if interval in CALENDAR_RULES:
+        resampler = df.resample(CALENDAR_RULES[interval], label='left', closed='left')
+    elif interval in INTRADAY_MINUTES:
+        minutes = INTRADAY_MINUTES[interval]
+        resampler = df.resample(f"{minutes}min", label='left', closed='left',
+                                origin='start_day', offset=_session_offset(df.index, minutes))
+    else:
+        return df
+
+    out = resampler.agg(agg)
+    if 'Stock Splits' in out.columns:
+        out['Stock Splits'] = out['Stock Splits'].where(out['Stock Splits'] != 1.0, 0.0)
+
+    # Bins with no trades (weekends, overnight) have no Open
+    out = out.dropna(subset=['Open']) if 'Open' in out.columns else out.dropna(how='all')
+    return out[[c for c in df.columns if c in out.columns]]
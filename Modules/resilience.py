@@ -0,0 +1,128 @@
+import random
+import threading
+import time
+
+# ============================================================================
+# RESILIENCE - Jittered exponential backoff and per-source circuit breakers
+# ============================================================================
+# A fixed sleep per retry piles up under throttling and keeps hammering the
+# endpoint. Each upstream source (Ticker.info, fast_info, download, history...)
+# gets its own breaker: after repeated failures it opens and calls fail fast,
+# so callers move straight to their next source instead of sleeping.
+
+CLOSED = 'CLOSED'
+OPEN = 'OPEN'
+HALF_OPEN = 'HALF_OPEN'
+
+
+def backoff_delay(attempt: int, base: float = 0.5, cap: float = 4.0) -> float:
+    """Full-jitter exponential backoff: uniform(0, min(cap, base * 2**attempt))."""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+class CircuitBreaker:
+    """Closed -> open after `failure_threshold` consecutive failures; after
+    `reset_timeout` seconds one half-open probe is let through to test recovery."""
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probing = False
+        self.counters = {'success': 0, 'failure': 0, 'short_circuited': 0, 'opened': 0}
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN and time.time() - self.opened_at >= self.reset_timeout:
+                self.state = HALF_OPEN
+                self.probing = False
+            if self.state == HALF_OPEN and not self.probing:
+                self.probing = True
+                return True
+            self.counters['short_circuited'] += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.counters['success'] += 1
+            self.failures = 0
+            self.probing = False
+            self.state = CLOSED
+
+    def record_failure(self):
+        with self._lock:
+            self.counters['failure'] += 1
+            self.failures += 1
+            self.probing = False
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != OPEN:
+                    self.counters['opened'] += 1
+                self.state = OPEN
+                self.opened_at = time.time()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            retry_in = max(0.0, self.reset_timeout - (time.time() - self.opened_at)) if self.state == OPEN else 0.0
+            return {'state': self.state, 'failures': self.failures, 'retry_in': retry_in, **self.counters}
+
+
+class Resilience:
+    """Registry of per-source breakers plus a retry helper that uses them."""
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0,
+                 base_delay: float = 0.5, max_delay: float = 4.0, limiter=None):
+        self.limiter = limiter
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._breakers = {}
+        self._lock = threading.Lock()
+
+    def breaker(self, source: str) -> CircuitBreaker:
+        with self._lock:
+            if source not in self._breakers:
+                self._breakers[source] = CircuitBreaker(source, self.failure_threshold, self.reset_timeout)
+            return self._breakers[source]
+
+    def call(self, source: str, fn, accept=None, retries: int = 2, cost: int = 1):
+        """Run fn() against `source` with up to `retries` attempts.
+
+        An exception or a result rejected by accept(result) (e.g. an empty frame
+        from a throttled endpoint) counts against the source's breaker and is retried.
+        Returns the first accepted result, else the last result obtained (or None).
+        While the breaker is open, returns None immediately. Every attempt takes
+        `cost` tokens (one per HTTP request fn makes) from the shared rate limiter,
+        if one is set."""
+        breaker = self.breaker(source)
+        result = None
+        for attempt in range(retries):
+            if not breaker.allow():
+                break
+            if self.limiter is not None:
+                self.limiter.acquire(tokens=cost)
+            try:
+                result = fn()
+            except Exception:
+                breaker.record_failure()
+                result = None
+            else:
+                if accept is None or accept(result):
+                    breaker.record_success()
+                    return result
+                breaker.record_failure()
+            if attempt < retries - 1:
+                time.sleep(backoff_delay(attempt, self.base_delay, self.max_delay))
+        return result
+
+    def states(self) -> dict:
+        """Breaker snapshot per source, for display."""
+        with self._lock:
+            breakers = list(self._breakers.values())
+        return {b.name: b.snapshot() for b in breakers}
@@ -0,0 +1,132 @@
+import json
+
+import numpy as np
+import pandas as pd
+
+from Modules.ladders import ladder
+
+# ============================================================================
+# RULES - Scoring rules as data, compiled into a vectorized evaluator
+# ============================================================================
+# A rule set is plain data (JSON-compatible):
+#
+#   {'name': 'smart_score',
+#    'base': {'valuation': 50, ...},       # starting points per category
+#    'clamp': [0, 100],                     # or {'growth': [None, 100], ...}
+#    'missing': 0,                          # points when a metric is NaN (None keeps NaN)
+#    'rules': [{'category': 'valuation', 'name': 'pe', 'metric': 'pe', 'when': 'has_pe',
+#               'bands': [['<', 10, 20], ['<', 15, 15], ...], 'default': -15}, ...],
+#    'strategies': {'Deep Value': {'valuation': 0.5, ...}}}   # optional named weights
+#
+# Bands read like the if/elif chain they replace: the first band whose test
+# passes gives its points, otherwise `default`. Tests are '<', '<=', '>', '>=',
+# '==' against a threshold, or a range [lo, hi] with '[]', '[)', '(]', '()'.
+# `when` names a boolean metric; where it is False the rule gives 0. A rule's own
+# 'missing' overrides the rule set's for NaN inputs.
+#
+# compile_rules() turns each rule into one array operation — a ladder() lookup
+# when the chain is a plain one-sided ladder, np.select otherwise — so the same
+# rule set scores one ticker (a one-row frame) or a whole universe.
+
+_COMPARE = {
+    '<': np.less, '<=': np.less_equal, '>': np.greater, '>=': np.greater_equal, '==': np.equal,
+}
+_RANGE = {
+    '[]': (np.greater_equal, np.less_equal), '[)': (np.greater_equal, np.less),
+    '(]': (np.greater, np.less_equal), '()': (np.greater, np.less),
+}
+
+
+def _band_test(x: np.ndarray, op: str, threshold) -> np.ndarray:
+    with np.errstate(invalid='ignore'):
+        if op in _RANGE:
+            lower, upper = _RANGE[op]
+            lo, hi = threshold
+            return lower(x, lo) & upper(x, hi)
+        return _COMPARE[op](x, threshold)
+
+
+def _as_ladder(bands: list, default):
+    """(edges, points, right) when the chain is a plain one-sided ladder, else None."""
+    ops = {b[0] for b in bands}
+    thresholds = [b[1] for b in bands]
+    points = [b[2] for b in bands]
+    if ops == {'<'} and thresholds == sorted(thresholds) and len(set(thresholds)) == len(thresholds):
+        return thresholds, points + [default], False
+    if ops == {'>'} and thresholds == sorted(thresholds, reverse=True) and len(set(thresholds)) == len(thresholds):
+        return thresholds[::-1], [default] + points[::-1], True
+    return None
+
+
+def compile_rule(rule: dict, missing=0.0):
+    """One rule as a function of a metrics frame returning points per row."""
+    bands = [tuple(b) for b in rule['bands']]
+    default = float(rule.get('default', 0))
+    metric, when = rule['metric'], rule.get('when')
+    missing = rule.get('missing', missing)
+    fill = np.nan if missing is None else float(missing)
+    as_ladder = _as_ladder(bands, default)
+
+    def evaluate(metrics: pd.DataFrame) -> np.ndarray:
+        x = metrics[metric].to_numpy(dtype=float)
+        if as_ladder is not None:
+            edges, points, right = as_ladder
+            out = ladder(x, edges, points, right)
+        else:
+            out = np.select([_band_test(x, op, t) for op, t, _ in bands], [p for _, _, p in bands], default=default)
+            out = np.where(np.isnan(x), np.nan, out)
+        out = np.where(np.isnan(out), fill, out)
+        if when is not None:
+            out = np.where(metrics[when].to_numpy(dtype=bool), out, 0.0)
+        return out
+
+    return evaluate
+
+
+class RuleSet:
+    """A compiled rule set: points per rule, clamped category scores, weighted totals."""
+
+    def __init__(self, spec: dict):
+        self.spec = spec
+        self.name = spec.get('name', 'rules')
+        self.base = spec.get('base', {})
+        self.strategies = spec.get('strategies', {})
+        missing = spec.get('missing', 0)
+        self.rules = [(r['category'], r['name'], compile_rule(r, missing)) for r in spec['rules']]
+        self.categories = list(dict.fromkeys([c for c, _, _ in self.rules] + list(self.base)))
+        clamp = spec.get('clamp')
+        self.clamp = clamp if isinstance(clamp, dict) else {cat: clamp for cat in self.categories}
+
+    def components(self, metrics: pd.DataFrame) -> pd.DataFrame:
+        """Points from every rule per row, as (category, rule) columns."""
+        columns = pd.MultiIndex.from_tuples([(c, n) for c, n, _ in self.rules], names=['category', 'component'])
+        data = np.column_stack([fn(metrics) for _, _, fn in self.rules]) if self.rules else np.empty((len(metrics), 0))
+        return pd.DataFrame(data, index=metrics.index, columns=columns)
+
+    def category_scores(self, components: pd.DataFrame) -> pd.DataFrame:
+        """Base plus the sum of a category's rule points, clamped."""
+        sums = components.T.groupby(level='category', sort=False).sum(min_count=1).T
+        out = {}
+        for cat in self.categories:
+            score = self.base.get(cat, 0) + (sums[cat] if cat in sums else 0)
+            lo, hi = self.clamp.get(cat) or (None, None)
+            out[cat] = score.clip(lower=lo, upper=hi)
+        return pd.DataFrame(out, index=components.index)
+
+    def scores(self, metrics: pd.DataFrame) -> pd.DataFrame:
+        return self.category_scores(self.components(metrics))
+
+    @staticmethod
+    def weighted(scores: pd.DataFrame, weights: dict, normalize: bool = False) -> pd.Series:
+        """Dot product of category scores and weights (divided by their sum if normalize)."""
+        cats = list(weights)
+        w = np.array([weights[c] for c in cats], dtype=float)
+        total = scores[cats].to_numpy() @ w
+        return pd.Series(total / w.sum() if normalize else total, index=scores.index)
+
+
+def load_rules(path: str) -> RuleSet:
+    """Compile a rule set stored as JSON — custom strategies are configuration."""
+    with open(path) as f:
+        return RuleSet(json.load(f))
+
@@ -1,116 +1,8 @@
 import numpy as np
+import pandas as pd
 
-def calculate_investment_score(info, fundamentals, hist, weights):
-    scores = {}
-    
-    # VALUATION
-    pe = info.get('trailingPE', 0)
-    ps = info.get('priceToSalesTrailing12Months', 0)
-    pb = info.get('priceToBook', 0)
-    
-    valuation_score = 0
-    if pe > 0 and pe < 14:
-        valuation_score += 40
-    elif pe < 20:
-        valuation_score += 25
-    else:
-        valuation_score += 10
-    
-    if ps < 3:
-        valuation_score += 30
-    elif ps < 5:
-        valuation_score += 20
-    
-    if pb < 2:
-        valuation_score += 30
-    elif pb < 5:
-        valuation_score += 15
-    
-    scores['valuation'] = min(valuation_score, 100)
-    
-    # QUALITY
-    roe = fundamentals['roe']
-    margin = fundamentals['profit_margin']
-    debt_equity = fundamentals['debt_to_equity']
-    
-    quality_score = 0
-    if roe > 20:
-        quality_score += 40
-    elif roe > 15:
-        quality_score += 30
-    elif roe > 10:
-        quality_score += 20
-    
-    if margin > 20:
-        quality_score += 35
-    elif margin > 10:
-        quality_score += 25
-    
-    if debt_equity < 0.5:
-        quality_score += 25
-    elif debt_equity < 1:
-        quality_score += 15
-    
-    scores['quality'] = min(quality_score, 100)
-    
-    # GROWTH
-    rev_growth = fundamentals['revenue_growth']
-    
-    if rev_growth > 30:
-        growth_score = 100
-    elif rev_growth > 20:
-        growth_score = 80
-    elif rev_growth > 10:
-        growth_score = 60
-    else:
-        growth_score = 20
-    
-    scores['growth'] = growth_score
-    
-    # MOMENTUM
-    current_price = hist['Close'].iloc[-1]
-    ma50 = hist['Close'].rolling(50).mean().iloc[-1]
-    ma200 = hist['Close'].rolling(200).mean().iloc[-1]
-    
-    momentum_score = 0
-    if current_price > ma50:
-        momentum_score += 30
-    if current_price > ma200:
-        momentum_score += 30
-    if ma50 > ma200:
-        momentum_score += 20
-    
-    scores['momentum'] = min(momentum_score, 100)
-    
-    # RISK
-    beta = info.get('beta', 1)
-    volatility = hist['Close'].pct_change().std() * np.sqrt(252) * 100
-    
-    risk_score = 0
-    if beta < 0.8:
-        risk_score += 50
-    elif beta < 1.2:
-        risk_score += 35
-    
-    if volatility < 20:
-        risk_score += 50
-    elif volatility < 30:
-        risk_score += 35
-    
-    scores['risk'] = min(risk_score, 100)
-    
-    # TOTAL
-    total_score = (
-        scores['valuation'] * weights['valuation'] +
-        scores['quality'] * weights['quality'] +
-        scores['growth'] * weights['growth'] +
-        scores['momentum'] * weights['momentum'] +
-        scores['risk'] * weights['risk']
-    ) / sum(weights.values())
-    
-    scores['total'] = total_score
-    
-    return scores
+from Modules.rules import RuleSet
+from Modules.screener import fundamentals_frame, price_features
 
 def get_rating(score):
     if score >= 80:
@@ -122,4 +14,75 @@ def get_rating(score):
     elif score >= 35:
         return "SELL", "#f15e6c"
     else:
-        return "STRONG SELL", "#f15e6c"
\ No newline at end of file
+        return "STRONG SELL", "#f15e6c"
+
+
+# calculate_investment_score's rules as data (see Modules/rules.py). Category
+# scores start at 0; growth is a plain ladder and is not capped.
+INVESTMENT_SCORE_RULES = {
+    'name': 'investment_score',
+    'clamp': {'valuation': [None, 100], 'quality': [None, 100], 'growth': None,
+              'momentum': [None, 100], 'risk': [None, 100]},
+    'missing': 0,
+    'rules': [
+        {'category': 'valuation', 'name': 'pe', 'metric': 'pe',
+         'bands': [['()', [0, 14], 40], ['<', 20, 25]], 'default': 10},
+        {'category': 'valuation', 'name': 'ps', 'metric': 'ps', 'bands': [['<', 3, 30], ['<', 5, 20]]},
+        {'category': 'valuation', 'name': 'pb', 'metric': 'pb', 'bands': [['<', 2, 30], ['<', 5, 15]]},
+        {'category': 'quality', 'name': 'roe', 'metric': 'roe', 'bands': [['>', 20, 40], ['>', 15, 30], ['>', 10, 20]]},
+        {'category': 'quality', 'name': 'margin', 'metric': 'profit_margin', 'bands': [['>', 20, 35], ['>', 10, 25]]},
+        {'category': 'quality', 'name': 'debt_equity', 'metric': 'debt_to_equity',
+         'bands': [['<', 0.5, 25], ['<', 1, 15]]},
+        {'category': 'growth', 'name': 'revenue', 'metric': 'revenue_growth',
+         'bands': [['>', 30, 100], ['>', 20, 80], ['>', 10, 60]], 'default': 20, 'missing': 20},
+        {'category': 'momentum', 'name': 'price_vs_ma50', 'metric': 'above_ma50', 'bands': [['==', 1, 30]]},
+        {'category': 'momentum', 'name': 'price_vs_ma200', 'metric': 'above_ma200', 'bands': [['==', 1, 30]]},
+        {'category': 'momentum', 'name': 'ma50_vs_ma200', 'metric': 'ma50_above_ma200', 'bands': [['==', 1, 20]]},
+        {'category': 'risk', 'name': 'beta', 'metric': 'beta', 'bands': [['<', 0.8, 50], ['<', 1.2, 35]]},
+        {'category': 'risk', 'name': 'volatility', 'metric': 'volatility', 'bands': [['<', 20, 50], ['<', 30, 35]]},
+    ],
+}
+
+INVESTMENT_SCORE = RuleSet(INVESTMENT_SCORE_RULES)
+
+
+def investment_metrics(fund, panel):
+    """Inputs of INVESTMENT_SCORE_RULES, one row per ticker.
+
+    fund is screener.fundamentals_frame() output; panel is a date x ticker close panel."""
+    px = price_features(panel).reindex(fund.index)
+    volatility = panel.pct_change(fill_method=None).std() * np.sqrt(252) * 100
+    pct = lambda col: fund[col].fillna(0) * 100
+    return pd.DataFrame({
+        'pe': fund['trailingPE'].fillna(0),
+        'ps': fund['priceToSalesTrailing12Months'].fillna(0),
+        'pb': fund['priceToBook'].fillna(0),
+        'roe': pct('returnOnEquity'),
+        'profit_margin': pct('profitMargins'),
+        'debt_to_equity': fund['debtToEquity'].fillna(0) / 100,
+        'revenue_growth': pct('revenueGrowth'),
+        'above_ma50': px['price'] > px['ma50'],
+        'above_ma200': px['price'] > px['ma200'],
+        'ma50_above_ma200': px['ma50'] > px['ma200'],
+        'beta': fund['beta'].fillna(1),
+        'volatility': volatility.reindex(fund.index),
+    }, index=fund.index)
+
+
+def investment_scores(fund, panel, weights, rules=INVESTMENT_SCORE):
+    """calculate_investment_score for every ticker at once: category scores plus 'total'."""
+    scores = rules.scores(investment_metrics(fund, panel))
+    scores['total'] = RuleSet.weighted(scores, weights, normalize=True)
+    return scores
+
+
+def calculate_investment_score(info, fundamentals, hist, weights):
+    """One ticker through INVESTMENT_SCORE: category scores plus 'total'.
+    roe, profit_margin, debt_to_equity and revenue_growth come from `fundamentals`
+    as the caller derived them; everything else from info and the price history."""
+    metrics = investment_metrics(fundamentals_frame({0: info}), pd.DataFrame({0: hist['Close']}, dtype=float))
+    for name in ('roe', 'profit_margin', 'debt_to_equity', 'revenue_growth'):
+        metrics[name] = float(fundamentals[name])
+    scores = INVESTMENT_SCORE.scores(metrics)
+    scores['total'] = RuleSet.weighted(scores, weights, normalize=True)
+    return {name: float(value) for name, value in scores.iloc[0].items()}
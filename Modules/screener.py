@@ -0,0 +1,264 @@
+import numpy as np
+import pandas as pd
+
+from Modules.panel_indicators import right_align
+from Modules.rules import RuleSet
+
+# ============================================================================
+# SCREENER - calculate_smart_score for a whole universe at once
+# ============================================================================
+# Same rules as the single-ticker calculate_smart_score, evaluated column-wise:
+# one row per ticker in a fundamentals frame, one column per ticker in a close
+# panel. The rules themselves are data (SMART_SCORE_RULES) compiled by
+# Modules/rules.py; this module derives the metrics they read.
+
+# yfinance info fields the scores read
+INFO_FIELDS = [
+    'trailingPE', 'forwardPE', 'pegRatio', 'marketCap', 'freeCashflow', 'enterpriseToEbitda',
+    'fiftyTwoWeekHigh', 'fiftyTwoWeekLow', 'shortPercentOfFloat', 'beta',
+    'profitMargins', 'grossMargins', 'operatingMargins', 'returnOnEquity', 'returnOnAssets',
+    'currentRatio', 'debtToEquity', 'revenueGrowth', 'earningsGrowth',
+    'priceToSalesTrailing12Months', 'priceToBook',
+]
+
+CATEGORIES = ['valuation', 'quality', 'growth', 'momentum', 'risk']
+
+# Starting points per category before component adjustments
+CATEGORY_BASE = {'valuation': 50, 'quality': 50, 'growth': 50, 'momentum': 50, 'risk': 70}
+
+# Weights calculate_smart_score falls back to for a missing category
+DEFAULT_WEIGHTS = {'valuation': 0.20, 'quality': 0.25, 'growth': 0.20, 'momentum': 0.15, 'risk': 0.20}
+
+
+def fundamentals_frame(infos: dict) -> pd.DataFrame:
+    """One row per ticker from {ticker: info dict}, restricted to the numeric fields scored."""
+    frame = pd.DataFrame.from_dict(infos, orient='index') if infos else pd.DataFrame()
+    # A ticker whose info came back empty keeps its (all-NaN) row
+    frame = frame.reindex(index=list(infos), columns=INFO_FIELDS)
+    return frame.apply(pd.to_numeric, errors='coerce')
+
+
+def _or(x: pd.Series, default) -> pd.Series:
+    """Vectorized `x or default` for info values (missing and 0 are falsy)."""
+    return x.where(x.notna() & (x != 0), default)
+
+
+def _truthy(x: pd.Series) -> pd.Series:
+    return x.notna() & (x != 0)
+
+
+def _window_mean(aligned: np.ndarray, window: int) -> np.ndarray:
+    return aligned[-window:].mean(axis=0) if len(aligned) >= window else np.full(aligned.shape[1], np.nan)
+
+
+def _last_rsi(aligned: np.ndarray, period: int = 14) -> np.ndarray:
+    """Latest rolling-mean RSI for every column (NaN where undefined)."""
+    if len(aligned) <= period:
+        return np.full(aligned.shape[1], np.nan)
+    delta = np.diff(aligned[-(period + 1):], axis=0)
+    gain = np.where(delta > 0, delta, 0.0).mean(axis=0)
+    loss = np.where(delta < 0, -delta, 0.0).mean(axis=0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return 100 - (100 / (1 + gain / loss))
+
+
+def price_features(panel: pd.DataFrame) -> pd.DataFrame:
+    """Per-ticker price inputs of the momentum score, read off the right-aligned panel."""
+    aligned = right_align(panel)
+    length = (~np.isnan(aligned)).sum(axis=0)
+    at = lambda k: aligned[-k] if len(aligned) >= k else np.full(aligned.shape[1], np.nan)
+    return pd.DataFrame({
+        'length': length,
+        'price': at(1),
+        'rsi': _last_rsi(aligned),
+        'ma50': _window_mean(aligned, 50),
+        'ma200': _window_mean(aligned, 200),
+        'price_3m_ago': at(63),
+    }, index=panel.columns)
+
+
+def smart_score_metrics(fund: pd.DataFrame, prices: pd.DataFrame) -> pd.DataFrame:
+    """Every input SMART_SCORE_RULES reads, one row per ticker.
+
+    fund is fundamentals_frame() output; prices is price_features() output (or a
+    close panel, converted here)."""
+    if 'length' not in prices.columns:
+        prices = price_features(prices)
+    px = prices.reindex(fund.index)
+    length = px['length'].fillna(0)
+    price = px['price']
+
+    # Derived fundamentals, as get_fundamental_metrics builds them
+    pct = lambda col: fund[col].fillna(0) * 100
+    rev_growth = pct('revenueGrowth')
+    earnings_growth = pct('earningsGrowth')
+
+    pe = _or(fund['trailingPE'], fund['forwardPE'])
+    forward_pe = fund['forwardPE']
+    mkt_cap = _or(fund['marketCap'], 1)
+    fcf = fund['freeCashflow'].fillna(0)
+    peg = fund['pegRatio']
+    ev = fund['enterpriseToEbitda']
+
+    ma50, ma200 = px['ma50'], px['ma200']
+    high_52w = fund['fiftyTwoWeekHigh'].fillna(price)
+    low_52w = fund['fiftyTwoWeekLow'].fillna(price)
+
+    return pd.DataFrame({
+        'pe': pe,
+        'has_pe': _truthy(pe) & (pe > 0),
+        'forward_discount': _truthy(forward_pe) & (forward_pe < pe * 0.85),
+        'peg': peg,
+        'has_peg': _truthy(peg) & (peg > 0),
+        'fcf': fcf,
+        'fcf_nonnegative': fcf >= 0,
+        'fcf_yield': (fcf / mkt_cap * 100).where(mkt_cap > 0, 0),
+        'ev_ebitda': ev,
+        'has_ev_ebitda': _truthy(ev) & (ev > 0),
+        'profit_margin': pct('profitMargins'),
+        'gross_margin': pct('grossMargins'),
+        'roe': pct('returnOnEquity'),
+        'roa': pct('returnOnAssets'),
+        'current_ratio': fund['currentRatio'].fillna(0),
+        'debt_to_equity': fund['debtToEquity'].fillna(0) / 100,
+        'rev_growth': rev_growth,
+        'earnings_growth': earnings_growth,
+        'both_growing': (rev_growth > 10) & (earnings_growth > 10),
+        'margin_expansion': (rev_growth > 0) & (earnings_growth > rev_growth),
+        'margin_compression': (rev_growth > 0) & (earnings_growth < rev_growth * 0.5),
+        'has_hist': length > 0,
+        'rsi': px['rsi'].where((length > 14) & px['rsi'].notna(), 50.0),
+        'has_ma50': length >= 50,
+        'pct_from_ma50': (price - ma50) / ma50 * 100,
+        'has_ma200': length >= 200,
+        'ma50_above_ma200': ma50 > ma200,
+        'above_ma200': price > ma200,
+        'has_3m': length >= 63,
+        'return_3m': (price - px['price_3m_ago']) / px['price_3m_ago'] * 100,
+        'has_52w_range': (length > 0) & (high_52w > low_52w),
+        'range_position': (price - low_52w) / (high_52w - low_52w),
+        'short_float': fund['shortPercentOfFloat'].fillna(0),
+        'beta': _or(fund['beta'], 1.0),
+    }, index=fund.index)
+
+
+def _rule(category, name, metric, bands, default=0, when=None):
+    return {'category': category, 'name': name, 'metric': metric, 'bands': bands, 'default': default, 'when': when}
+
+
+# calculate_smart_score's rules as data, in its own order
+SMART_SCORE_RULES = {
+    'name': 'smart_score',
+    'base': CATEGORY_BASE,
+    'clamp': [0, 100],
+    'missing': 0,
+    'rules': [
+        # Valuation
+        _rule('valuation', 'pe', 'pe', [['<', 10, 20], ['<', 15, 15], ['<', 20, 10], ['<', 25, 5],
+                                        ['<', 35, -5], ['<', 50, -10]], -15, when='has_pe'),
+        _rule('valuation', 'forward_pe', 'forward_discount', [['==', 1, 8]], when='has_pe'),
+        _rule('valuation', 'peg', 'peg', [['<', 0.75, 15], ['<', 1.0, 10], ['<', 1.5, 5], ['<', 2.0, 0],
+                                          ['<', 3.0, -5]], -10, when='has_peg'),
+        _rule('valuation', 'fcf_yield', 'fcf_yield', [['>', 10, 15], ['>', 7, 12], ['>', 5, 8], ['>', 3, 4],
+                                                      ['>', 0, 0]], -10),
+        _rule('valuation', 'ev_ebitda', 'ev_ebitda', [['<', 8, 10], ['<', 12, 6], ['<', 16, 2], ['<', 20, -3]], -8,
+              when='has_ev_ebitda'),
+        # Quality
+        _rule('quality', 'profit_margin', 'profit_margin', [['>', 30, 15], ['>', 20, 10], ['>', 10, 5], ['>', 5, 2],
+                                                            ['<', 0, -10]]),
+        _rule('quality', 'gross_margin', 'gross_margin', [['>', 60, 10], ['>', 40, 6], ['>', 25, 2], ['<', 15, -5]]),
+        _rule('quality', 'roe', 'roe', [['>', 25, 12], ['>', 18, 8], ['>', 12, 4], ['>', 8, 1], ['<', 0, -8]]),
+        _rule('quality', 'roa', 'roa', [['>', 15, 8], ['>', 10, 5], ['>', 5, 2], ['<', 0, -5]]),
+        _rule('quality', 'current_ratio', 'current_ratio', [['>', 2.5, 8], ['>', 1.5, 5], ['>', 1.0, 2], ['<', 0.8, -8]]),
+        _rule('quality', 'debt_to_equity', 'debt_to_equity', [['<', 0.3, 10], ['<', 0.6, 6], ['<', 1.0, 2],
+                                                              ['<', 1.5, -3], ['<', 2.5, -8]], -12),
+        # Growth
+        _rule('growth', 'revenue', 'rev_growth', [['>', 50, 18], ['>', 30, 14], ['>', 20, 10], ['>', 10, 6],
+                                                  ['>', 5, 2], ['>', 0, 0], ['>', -5, -5]], -12),
+        _rule('growth', 'earnings', 'earnings_growth', [['>', 50, 18], ['>', 30, 14], ['>', 20, 10], ['>', 10, 6],
+                                                        ['>', 0, 2], ['>', -10, -5]], -12),
+        _rule('growth', 'both_growing', 'both_growing', [['==', 1, 8]]),
+        _rule('growth', 'margin_expansion', 'margin_expansion', [['==', 1, 5]]),
+        _rule('growth', 'margin_compression', 'margin_compression', [['==', 1, -5]]),
+        # Momentum
+        _rule('momentum', 'rsi', 'rsi', [['[]', [45, 55], 10], ['[]', [40, 60], 8], ['(]', [55, 65], 5],
+                                         ['[)', [35, 40], 6], ['>', 75, -8], ['<', 25, -5]], when='has_hist'),
+        # Above the 50-day mean means pct_from_ma50 > 0
+        _rule('momentum', 'ma50', 'pct_from_ma50', [['()', [0, 5], 10], ['()', [0, 10], 8], ['()', [0, 20], 4],
+                                                    ['>', 0, -2], ['>', -5, 2], ['>', -10, -3]], -8, when='has_ma50'),
+        _rule('momentum', 'ma50_vs_ma200', 'ma50_above_ma200', [['==', 1, 10]], -5, when='has_ma200'),
+        _rule('momentum', 'price_vs_ma200', 'above_ma200', [['==', 1, 5]], -5, when='has_ma200'),
+        _rule('momentum', 'return_3m', 'return_3m', [['>', 20, 8], ['>', 10, 5], ['>', 0, 2], ['>', -10, -3]], -8,
+              when='has_3m'),
+        _rule('momentum', '52w_position', 'range_position', [['[]', [0.7, 0.9], 8], ['[)', [0.5, 0.7], 5],
+                                                             ['[)', [0.3, 0.5], 2], ['<', 0.2, -5], ['>', 0.95, -2]],
+              when='has_52w_range'),
+        # Risk
+        _rule('risk', 'short_interest', 'short_float', [['>', 0.30, -20], ['>', 0.20, -15], ['>', 0.10, -8],
+                                                        ['>', 0.05, -3], ['<', 0.02, 5]]),
+        _rule('risk', 'beta', 'beta', [['>', 2.5, -20], ['>', 2.0, -15], ['>', 1.5, -8], ['>', 1.2, -3],
+                                       ['[]', [0.8, 1.2], 5], ['[)', [0.5, 0.8], 3]]),
+        _rule('risk', 'leverage', 'debt_to_equity', [['>', 3, -15], ['>', 2, -10], ['>', 1.5, -5], ['<', 0.5, 8]]),
+        _rule('risk', 'liquidity', 'current_ratio', [['<', 0.5, -12], ['<', 1.0, -5], ['>', 2.0, 5]]),
+        _rule('risk', 'profitability', 'profit_margin', [['<', 0, -15], ['<', 5, -5], ['>', 15, 5]]),
+        _rule('risk', 'negative_fcf', 'fcf', [['<', 0, -10]]),
+        _rule('risk', 'fcf_yield', 'fcf_yield', [['>', 5, 5]], when='fcf_nonnegative'),
+    ],
+}
+
+SMART_SCORE = RuleSet(SMART_SCORE_RULES)
+
+
+def score_components(fund: pd.DataFrame, prices: pd.DataFrame, rules: RuleSet = SMART_SCORE) -> pd.DataFrame:
+    """Point contribution of every scoring rule per ticker, as (category, component) columns.
+    Category scores are the rule set's base plus the row sum of a category's
+    components, clamped to 0-100 — see category_scores."""
+    return rules.components(smart_score_metrics(fund, prices))
+
+
+def category_scores(components: pd.DataFrame, rules: RuleSet = SMART_SCORE) -> pd.DataFrame:
+    """0-100 score per category from score_components() output."""
+    return rules.category_scores(components)[CATEGORIES]
+
+
+def smart_score(info: dict, closes: pd.Series, weights: dict, rules: RuleSet = SMART_SCORE) -> tuple:
+    """One ticker through the same compiled rules: ({category: score}, weighted total,
+    metrics row the rules read)."""
+    metrics = smart_score_metrics(fundamentals_frame({0: info}), pd.DataFrame({0: closes}, dtype=float))
+    scores = {cat: float(v) for cat, v in rules.scores(metrics)[CATEGORIES].iloc[0].items()}
+    return scores, weighted_score(scores, weights), metrics.iloc[0]
+
+
+def weighted_total(scores: pd.DataFrame, weights: dict) -> pd.Series:
+    """Weighted total per ticker — a dot product of category scores and weights."""
+    w = np.array([weights.get(cat, DEFAULT_WEIGHTS[cat]) for cat in CATEGORIES])
+    return pd.Series(scores[CATEGORIES].to_numpy() @ w, index=scores.index)
+
+
+def weighted_score(scores: dict, weights: dict) -> float:
+    """Weighted total of one ticker's category scores, as calculate_smart_score sums it.
+    A strategy change only needs this — the category scores do not depend on weights."""
+    return sum(scores[cat] * weights.get(cat, DEFAULT_WEIGHTS[cat]) for cat in CATEGORIES)
+
+
+def normalize_weights(weights: dict) -> dict:
+    """Weights rescaled to sum to 1 (equal weights if they are all zero)."""
+    total = sum(weights.get(cat, 0) for cat in CATEGORIES)
+    if total <= 0:
+        return {cat: 1 / len(CATEGORIES) for cat in CATEGORIES}
+    return {cat: weights.get(cat, 0) / total for cat in CATEGORIES}
+
+
+def rank(scores: pd.DataFrame, weights: dict) -> pd.DataFrame:
+    """Category scores plus weighted total and rank, best first.
+    Pure re-weighting of cached scores: no metric or rule is re-evaluated."""
+    ranked = scores[CATEGORIES].copy()
+    ranked['total'] = weighted_total(ranked, weights)
+    ranked = ranked.sort_values('total', ascending=False)
+    ranked['rank'] = np.arange(1, len(ranked) + 1)
+    return ranked
+
+
+def screen(fund: pd.DataFrame, panel: pd.DataFrame, weights: dict, rules: RuleSet = SMART_SCORE) -> pd.DataFrame:
+    """Category scores and weighted total for every ticker, best first."""
+    return rank(category_scores(score_components(fund, panel, rules), rules), weights)
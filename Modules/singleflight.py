@@ -0,0 +1,64 @@
+import threading
+from concurrent.futures import Future
+
+# ============================================================================
+# SINGLE FLIGHT - Coalesce concurrent identical fetches
+# ============================================================================
+# st.cache_data does not stop several sessions that miss at the same moment
+# from each running the same fetch. The first caller for a key runs it; callers
+# arriving while it is in flight wait on the same future and share the result.
+
+
+class SingleFlight:
+    """Per-key request coalescing with counters by kind (the first element of the key)."""
+
+    def __init__(self):
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def _count(self, kind, field: str):
+        counters = self._stats.setdefault(kind, {'executed': 0, 'coalesced': 0})
+        counters[field] += 1
+
+    def do(self, key: tuple, fn):
+        """Run fn() once for all concurrent callers with the same key."""
+        kind = key[0] if isinstance(key, tuple) and key else key
+        with self._lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._inflight[key] = future
+                self._count(kind, 'executed')
+            else:
+                self._count(kind, 'coalesced')
+
+        if not leader:
+            return future.result()
+
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def stats(self) -> dict:
+        """Snapshot of executed/coalesced counts per kind, plus totals."""
+        with self._lock:
+            snapshot = {kind: dict(c) for kind, c in self._stats.items()}
+        snapshot['total'] = {
+            'executed': sum(c['executed'] for c in snapshot.values()),
+            'coalesced': sum(c['coalesced'] for c in snapshot.values()),
+        }
+        return snapshot
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._inflight)
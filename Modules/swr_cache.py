@@ -0,0 +1,182 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+# ============================================================================
+# STALE-WHILE-REVALIDATE - Serve the last good value, refresh it off the hot path
+# ============================================================================
+# With a plain TTL cache the first caller after expiry waits for a full refetch.
+# Here a value past its refresh age is still returned immediately while one
+# background worker reloads it. Only a value older than its kind's maximum
+# staleness (or a cold miss) is loaded synchronously. A load that fails or is
+# rejected backs the key off for a short, doubling window, so during an outage
+# a cold key is not reloaded synchronously on every page view.
+
+# Backoff after a rejected load: NEGATIVE_TTL seconds, doubling per consecutive
+# failure up to NEGATIVE_TTL_MAX
+NEGATIVE_TTL = 15
+NEGATIVE_TTL_MAX = 300
+
+
+class StaleWhileRevalidate:
+    """Keyed cache with per-kind (refresh_after, max_stale) policies, in seconds.
+
+    The kind is the first element of the key, e.g. ('info', 'AAPL'). A reload that
+    fails or is rejected by `accept` keeps the previous good value in place.
+    `wrap` (e.g. a rate limiter's background-priority context) is entered around
+    every background revalidation."""
+
+    def __init__(self, policies: dict, default_policy: tuple = (300, 3600),
+                 max_entries: int = 2048, workers: int = 4, wrap=None):
+        self.policies = policies
+        self.wrap = wrap
+        self.default_policy = default_policy
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._failures = {}
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='revalidate')
+        self.stats = {'fresh': 0, 'stale': 0, 'miss': 0, 'expired': 0, 'backoff': 0, 'refreshed': 0,
+                      'refresh_failed': 0}
+
+    def policy(self, kind) -> tuple:
+        return self.policies.get(kind, self.default_policy)
+
+    def _store(self, key, value):
+        with self._lock:
+            self._entries[key] = (value, time.time())
+            self._entries.move_to_end(key)
+            self._failures.pop(key, None)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _reject(self, key, value):
+        """Back key off after a failed or rejected load, keeping the rejected value to serve."""
+        with self._lock:
+            streak = self._failures[key][1] + 1 if key in self._failures else 1
+            until = time.time() + min(NEGATIVE_TTL * 2 ** (streak - 1), NEGATIVE_TTL_MAX)
+            self._failures[key] = (until, streak, value)
+            while len(self._failures) > self.max_entries:
+                self._failures.pop(next(iter(self._failures)))
+
+    def _load(self, key, loader, accept) -> tuple:
+        """Run loader(); store and return (value, True) if accepted, else (value, False)."""
+        try:
+            value = loader()
+        except Exception:
+            self._reject(key, None)
+            return None, False
+        if accept is not None and not accept(value):
+            self._reject(key, value)
+            return value, False
+        self._store(key, value)
+        return value, True
+
+    def _revalidate(self, key, loader, accept):
+        try:
+            if self.wrap is not None:
+                with self.wrap():
+                    _, ok = self._load(key, loader, accept)
+            else:
+                _, ok = self._load(key, loader, accept)
+            with self._lock:
+                self.stats['refreshed' if ok else 'refresh_failed'] += 1
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def get(self, key: tuple, loader, accept=None):
+        """Cached value for key (a copy), loading or revalidating it as its policy says."""
+        kind = key[0] if isinstance(key, tuple) and key else key
+        refresh_after, max_stale = self.policy(kind)
+        now = time.time()
+
+        servable = False
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats['miss'] += 1
+            else:
+                age = now - entry[1]
+                if age < refresh_after:
+                    self.stats['fresh'] += 1
+                    servable = True
+                elif age < max_stale:
+                    self.stats['stale'] += 1
+                    servable = True
+                    if key not in self._refreshing:
+                        self._refreshing.add(key)
+                        self._executor.submit(self._revalidate, key, loader, accept)
+                else:
+                    self.stats['expired'] += 1
+            failure = self._failures.get(key) if not servable else None
+            if failure is not None and now < failure[0]:
+                # A recent load was rejected — don't rerun the loader until the backoff ends
+                self.stats['backoff'] += 1
+                return copy.deepcopy(entry[0] if entry is not None else failure[2])
+        if servable:
+            return copy.deepcopy(entry[0])
+
+        value, ok = self._load(key, loader, accept)
+        if not ok and entry is not None:
+            # Past max staleness but the source is down — the old value beats nothing
+            return copy.deepcopy(entry[0])
+        return copy.deepcopy(value)
+
+    def refresh(self, key: tuple, loader, accept=None):
+        """Load key now and publish it if accepted — for a scheduler keeping values warm.
+        Returns a copy of the value now cached (the previous one if the load was rejected)."""
+        value, ok = self._load(key, loader, accept)
+        if not ok:
+            with self._lock:
+                entry = self._entries.get(key)
+            value = entry[0] if entry is not None else value
+        return copy.deepcopy(value)
+
+    def peek(self, key: tuple):
+        """Copy of the cached value for key without loading or revalidating it (None if not cached)."""
+        with self._lock:
+            entry = self._entries.get(key)
+        return None if entry is None else copy.deepcopy(entry[0])
+
+    def age(self, key: tuple) -> float:
+        """Seconds since the cached value for key was fetched, or None if not cached."""
+        with self._lock:
+            entry = self._entries.get(key)
+        return None if entry is None else time.time() - entry[1]
+
+    def discard(self, key: tuple):
+        """Drop one entry (the next read loads it synchronously)."""
+        with self._lock:
+            self._entries.pop(key, None)
+            self._failures.pop(key, None)
+
+    def invalidate(self, kind=None):
+        """Drop every entry, or only those of one kind (the next read loads synchronously)."""
+        with self._lock:
+            if kind is None:
+                self._entries.clear()
+                self._failures.clear()
+            else:
+                for store in (self._entries, self._failures):
+                    for key in [k for k in store if isinstance(k, tuple) and k and k[0] == kind]:
+                        del store[key]
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def format_age(seconds: float) -> str:
+    """Compact age for display: 'just now', '45s ago', '3m ago', '2h ago'."""
+    if seconds is None:
+        return ''
+    if seconds < 5:
+        return 'just now'
+    if seconds < 60:
+        return f"{seconds:.0f}s ago"
+    if seconds < 3600:
+        return f"{seconds / 60:.0f}m ago"
+    return f"{seconds / 3600:.0f}h ago"
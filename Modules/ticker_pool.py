@@ -0,0 +1,139 @@
+import threading
+import time
+from collections import OrderedDict
+
+import yfinance as yf
+
+# ============================================================================
+# TICKER POOL - Shared yf.Ticker handles with explicit lifetimes
+# ============================================================================
+# Every DataEngine accessor used to build a fresh yf.Ticker, repeating the
+# crumb/cookie handshake and losing yfinance's per-ticker caches. The pool keeps
+# idle handles per ticker for a refresh window and checks one out to a single
+# caller at a time: neither yf.Ticker nor its session is thread-safe, so
+# concurrent callers on one ticker (the chain pool's per-expiry workers, the
+# parts of a prefetch) each get a handle, and session, of their own. With
+# requests every session mounts one pooled adapter and shares its keep-alive
+# connections. A handle whose call raised is dropped, so the retry starts from
+# a fresh handshake.
+
+
+def build_adapter(pool_size: int = 32):
+    """Keep-alive connection pool shared by every requests session (None without requests)."""
+    try:
+        from requests.adapters import HTTPAdapter
+        return HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    except Exception:
+        return None
+
+
+def build_session(adapter=None):
+    """HTTP session for one handle. Newer yfinance releases require a curl_cffi
+    session (which keeps its own connections); older ones take requests, mounted
+    on the shared `adapter`."""
+    try:
+        from curl_cffi import requests as curl_requests
+        return curl_requests.Session(impersonate="chrome")
+    except Exception:
+        pass
+    try:
+        import requests
+        session = requests.Session()
+        if adapter is not None:
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+        return session
+    except Exception:
+        return None
+
+
+class TickerPool:
+    """Thread-safe pool of yf.Ticker handles, each used by one caller at a time.
+
+    A handle lives for `ttl` seconds (one refresh window) and is then rebuilt, so
+    stale per-ticker state never outlives the data caches in front of it. Up to
+    `max_idle` handles per ticker wait between uses; the least recently used
+    tickers' handles are dropped past `max_size` in total."""
+
+    def __init__(self, ttl: float = 300, max_size: int = 512, max_idle: int = 8, session_factory=None):
+        self.ttl = ttl
+        self.max_size = max_size
+        self.max_idle = max_idle
+        adapter = build_adapter() if session_factory is None else None
+        self.session_factory = session_factory or (lambda: build_session(adapter))
+        # ticker -> idle [(handle, created_at)], least recently used ticker first
+        self._idle = OrderedDict()
+        # ticker -> generation, bumped by invalidate so checked-out handles are not returned
+        self._generation = {}
+        self._size = 0
+        self._lock = threading.Lock()
+        self.stats = {'created': 0, 'reused': 0, 'expired': 0, 'evicted': 0}
+
+    def _make(self, ticker: str):
+        if self.session_factory is not None:
+            session = self.session_factory()
+            if session is not None:
+                try:
+                    return yf.Ticker(ticker, session=session)
+                except Exception:
+                    # This yfinance build rejects the session type — let it manage its own
+                    self.session_factory = None
+        return yf.Ticker(ticker)
+
+    def _checkout(self, key: str, ticker: str) -> tuple:
+        """(handle, created_at, generation) held exclusively by the caller."""
+        now = time.time()
+        with self._lock:
+            generation = self._generation.get(key, 0)
+            idle = self._idle.get(key, [])
+            while idle:
+                handle, created_at = idle.pop()
+                self._size -= 1
+                if now - created_at < self.ttl:
+                    self.stats['reused'] += 1
+                    return handle, created_at, generation
+                self.stats['expired'] += 1
+            self.stats['created'] += 1
+        # Built outside the lock: a handshake for one ticker never blocks the others
+        return self._make(ticker), now, generation
+
+    def _checkin(self, key: str, handle, created_at: float, generation: int):
+        """Return a handle to its ticker's idle list unless it expired or was invalidated."""
+        with self._lock:
+            if self._generation.get(key, 0) != generation or time.time() - created_at >= self.ttl:
+                return
+            idle = self._idle.setdefault(key, [])
+            if len(idle) >= self.max_idle:
+                return
+            idle.append((handle, created_at))
+            self._idle.move_to_end(key)
+            self._size += 1
+            while self._size > self.max_size:
+                _, dropped = self._idle.popitem(last=False)
+                self._size -= len(dropped)
+
+    def use(self, ticker: str, fn):
+        """fn(handle) on a handle no other caller holds meanwhile. It goes back to the
+        pool afterwards; if fn raises it is dropped instead, so the next attempt rebuilds it."""
+        key = ticker.upper()
+        handle, created_at, generation = self._checkout(key, ticker)
+        try:
+            result = fn(handle)
+        except Exception:
+            with self._lock:
+                self.stats['evicted'] += 1
+            raise
+        self._checkin(key, handle, created_at, generation)
+        return result
+
+    def invalidate(self, ticker: str = None):
+        """Drop one ticker's handles, or all of them (e.g. on a manual data refresh);
+        handles in use at the time are discarded when they come back."""
+        with self._lock:
+            keys = list(self._generation.keys() | self._idle.keys()) if ticker is None else [ticker.upper()]
+            for key in keys:
+                self._generation[key] = self._generation.get(key, 0) + 1
+                self._size -= len(self._idle.pop(key, []))
+
+    def __len__(self):
+        return self._size
@@ -0,0 +1,185 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from Modules.greeks import MIN_IV, RISK_FREE_RATE, black_scholes, years_to_expiry
+from Modules.options_analytics import chain_fingerprint
+
+# ============================================================================
+# VOL SURFACE - Implied volatility solved from quotes, smoothed per expiry
+# ============================================================================
+# Yahoo's impliedVolatility column is often stale or zero away from the money.
+# Here every contract's vol is solved from its own mid price in one batched
+# Newton iteration: each contract keeps a [lo, hi] bracket that the price error
+# narrows, and any Newton step leaving the bracket (or stalling on a tiny vega)
+# falls back to bisection, so every solvable contract converges.
+#
+# The surface uses out-of-the-money contracts only (puts below the price, calls
+# above), which also sidesteps early-exercise premium in the deep ITM American
+# quotes the European formula cannot price. Each expiry's smile is a vega-
+# weighted Gaussian kernel average in log-moneyness, read on a fixed moneyness
+# grid and never extrapolated past the strikes actually quoted.
+
+IV_MAX = 5.0
+IV_TOL = 1e-6
+IV_MAX_ITER = 50
+
+# Strike / spot grid the surface is read on, and the kernel width in log-moneyness
+MONEYNESS_GRID = np.round(np.arange(0.70, 1.3001, 0.025), 3)
+SMOOTHING = 0.04
+
+# Spot moves within one bucket (in log terms, ~0.25%) reuse an expiry's cached smile
+SPOT_BUCKET = 0.0025
+
+
+def mid_price(table: pd.DataFrame) -> pd.Series:
+    """Bid/ask midpoint where the quote is two-sided, else the last trade (NaN if neither)."""
+    bid, ask, last = (table[c] for c in ('bid', 'ask', 'lastPrice'))
+    two_sided = (bid > 0) & (ask >= bid)
+    return ((bid + ask) / 2).where(two_sided, last.where(last > 0))
+
+
+def implied_vol(price, spot, strike, years, is_call, rate: float = RISK_FREE_RATE,
+                tol: float = IV_TOL, max_iter: int = IV_MAX_ITER) -> np.ndarray:
+    """Black-Scholes implied volatility for arrays of option prices, in their broadcast
+    shape (NaN when the price lies outside what any vol in [MIN_IV, IV_MAX] produces)."""
+    P, S, K, T = np.broadcast_arrays(*(np.asarray(a, dtype=float) for a in (price, spot, strike, years)))
+    shape = P.shape
+    call = np.broadcast_to(np.asarray(is_call, dtype=bool), P.shape)
+    P, S, K, T, call = (a.ravel() for a in (P, S, K, T, call))
+    out = np.full(P.shape, np.nan)
+
+    lo, hi = np.full(P.shape, MIN_IV), np.full(P.shape, IV_MAX)
+    price_lo = black_scholes(S, K, T, lo, call, rate)['price']
+    price_hi = black_scholes(S, K, T, hi, call, rate)['price']
+    active = np.nonzero(np.isfinite(P) & (P >= price_lo) & (P <= price_hi))[0]
+    # Brenner-Subrahmanyam at-the-money guess as the starting point
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sigma = np.clip(np.sqrt(2 * np.pi / T) * P / S, MIN_IV * 2, IV_MAX / 2)
+
+    for _ in range(max_iter):
+        if len(active) == 0:
+            break
+        s, k, t, c = S[active], K[active], T[active], call[active]
+        g = black_scholes(s, k, t, sigma[active], c, rate)
+        diff = g['price'] - P[active]
+        done = np.abs(diff) < tol
+        out[active[done]] = sigma[active[done]]
+        # Price rises with vol: a positive error caps the bracket from above
+        hi[active] = np.where(diff > 0, sigma[active], hi[active])
+        lo[active] = np.where(diff < 0, sigma[active], lo[active])
+        vega = g['vega'] * 100
+        with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+            newton = sigma[active] - diff / vega
+        inside = (vega > 1e-12) & (newton > lo[active]) & (newton < hi[active])
+        sigma[active] = np.where(inside, newton, (lo[active] + hi[active]) / 2)
+        narrow = (hi[active] - lo[active]) < tol
+        out[active[narrow & ~done]] = sigma[active[narrow & ~done]]
+        active = active[~(done | narrow)]
+    # Scalar inputs give a scalar back
+    return out.reshape(shape)[()]
+
+
+def chain_iv(table: pd.DataFrame, spot: float, rate: float = RISK_FREE_RATE, now: pd.Timestamp = None) -> pd.DataFrame:
+    """chain_table() with years, mid and iv (solved from mid) per contract; iv is NaN
+    for contracts already past their expiry close."""
+    out = table.copy()
+    if out.empty:
+        for col in ('years', 'mid', 'iv'):
+            out[col] = pd.Series(dtype=float)
+        return out
+    out['years'] = years_to_expiry(out['expiry'], now)
+    out['mid'] = mid_price(out)
+    out['iv'] = implied_vol(out['mid'], spot, out['strike'], out['years'], (out['type'] == 'call').to_numpy(), rate)
+    return out
+
+
+def with_solved_iv(table: pd.DataFrame, spot: float, rate: float = RISK_FREE_RATE) -> pd.DataFrame:
+    """chain_table() whose impliedVolatility is the solved vol where one exists,
+    Yahoo's value otherwise — for greeks on illiquid strikes."""
+    solved = chain_iv(table, spot, rate)
+    out = table.copy()
+    if not out.empty:
+        out['impliedVolatility'] = solved['iv'].fillna(out['impliedVolatility'])
+    return out
+
+
+def smile_grid(ivs: pd.DataFrame, spot: float, grid=MONEYNESS_GRID, smoothing: float = SMOOTHING,
+               rate: float = RISK_FREE_RATE) -> pd.DataFrame:
+    """Smoothed smile of every expiry in a chain_iv() table on a moneyness grid:
+    expiry x moneyness frame of implied vol, one kernel product for all expiries."""
+    grid = np.asarray(grid, dtype=float)
+    strike = ivs['strike'].to_numpy(dtype=float)
+    otm = np.where(ivs['type'] == 'call', strike >= spot, strike < spot)
+    use = ivs[otm & np.isfinite(ivs['iv'].to_numpy(dtype=float))]
+    expiries = sorted(ivs['expiry'].astype(str).unique())
+    if use.empty:
+        return pd.DataFrame(np.nan, index=pd.Index(expiries, name='expiry'), columns=grid)
+
+    codes = pd.Categorical(use['expiry'].astype(str), categories=expiries).codes
+    k = np.log(use['strike'].to_numpy(dtype=float) / spot)
+    iv = use['iv'].to_numpy(dtype=float)
+    vega = black_scholes(spot, use['strike'], use['years'], iv, (use['type'] == 'call').to_numpy(), rate)['vega']
+    weight = np.nan_to_num(vega)
+    onehot = np.zeros((len(use), len(expiries)))
+    onehot[np.arange(len(use)), codes] = 1.0
+
+    kernel = np.exp(-0.5 * ((np.log(grid)[:, None] - k[None, :]) / smoothing) ** 2) * weight[None, :]
+    num, den = (kernel * iv[None, :]) @ onehot, kernel @ onehot
+    with np.errstate(divide='ignore', invalid='ignore'):
+        smile = (num / den).T
+    # Only between the lowest and highest strike quoted for that expiry
+    lo = np.full(len(expiries), np.inf)
+    hi = np.full(len(expiries), -np.inf)
+    np.minimum.at(lo, codes, k)
+    np.maximum.at(hi, codes, k)
+    lg = np.log(grid)[None, :]
+    smile = np.where((lg >= lo[:, None]) & (lg <= hi[:, None]) & (den.T > 1e-12), smile, np.nan)
+    return pd.DataFrame(smile, index=pd.Index(expiries, name='expiry'), columns=grid)
+
+
+class VolSurfaceCache:
+    """Smiles memoized per expiry slice of a chain snapshot, LRU-bounded.
+
+    surface(table, spot) re-solves only the expiries whose contracts changed, or
+    whose spot left its SPOT_BUCKET, since they were last seen; the rest of the
+    surface is reassembled from cached rows. Expiries are fingerprinted on their
+    own slice of the table. A reused smile was solved at a spot within the bucket."""
+
+    def __init__(self, max_smiles: int = 4096, grid=MONEYNESS_GRID):
+        self.grid = np.asarray(grid, dtype=float)
+        self.max_smiles = max_smiles
+        self._smiles = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {'hit': 0, 'miss': 0}
+
+    def surface(self, table: pd.DataFrame, spot: float, rate: float = RISK_FREE_RATE) -> pd.DataFrame:
+        if table.empty:
+            return pd.DataFrame(columns=self.grid)
+        slices = {str(e): part for e, part in table.groupby(table['expiry'].astype(str), sort=True)}
+        bucket = int(np.floor(np.log(float(spot)) / SPOT_BUCKET))
+        keys = {e: (chain_fingerprint(part), bucket, rate) for e, part in slices.items()}
+        with self._lock:
+            rows = {e: self._smiles[key] for e, key in keys.items() if key in self._smiles}
+            for e in rows:
+                self._smiles.move_to_end(keys[e])
+            self.stats['hit'] += len(rows)
+        stale = [e for e in slices if e not in rows]
+        if stale:
+            # Every changed expiry is solved and smoothed in one batch
+            fresh = smile_grid(chain_iv(pd.concat([slices[e] for e in stale]), spot, rate), spot, self.grid, rate=rate)
+            with self._lock:
+                self.stats['miss'] += len(stale)
+                for e in stale:
+                    rows[e] = self._smiles[keys[e]] = fresh.loc[e].to_numpy()
+                while len(self._smiles) > self.max_smiles:
+                    self._smiles.popitem(last=False)
+        ordered = sorted(slices)
+        return pd.DataFrame(np.vstack([rows[e] for e in ordered]), index=pd.Index(ordered, name='expiry'),
+                            columns=self.grid)
+
+    def clear(self):
+        with self._lock:
+            self._smiles.clear()
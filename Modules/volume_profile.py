@@ -0,0 +1,204 @@
+import numpy as np
+import pandas as pd
+
+from Modules.ladders import ladder
+
+# ============================================================================
+# VOLUME PROFILE - Volume-at-price for many tickers with weighted histograms
+# ============================================================================
+# Inputs are date x ticker OHLCV panels (a single ticker is a one-column panel,
+# intraday bars work the same as daily ones). Each ticker gets `bins` equal
+# price bins between its own lowest low and highest high. A bar's volume goes
+# either to the bin holding its close ('close', as bagholder_detector always
+# did) or is spread evenly across its high-low range ('range'). Both are one
+# weighted bincount / cumulative-share computation over the whole panel.
+
+DEFAULT_BINS = 20
+
+# Share of volume the value area covers around the point of control
+VALUE_AREA_SHARE = 0.70
+
+# A bin is a supply/support zone above this multiple of the average bin volume
+ZONE_THRESHOLD = 1.5
+
+# Overhead supply risk by distance (%) to the nearest zone above the price
+RISK_EDGES = [3, 5, 10]
+RISK_SCORES = [90, 70, 50, 20]
+RISK_LABELS = ['CRITICAL', 'HIGH', 'MODERATE', 'LOW']
+
+# Memory budget for the range split, in array elements per chunk of tickers
+_RANGE_CHUNK = 4_000_000
+
+
+def ohlcv_panels(hists: dict) -> dict:
+    """{'High', 'Low', 'Close', 'Volume'} date x ticker panels from {ticker: OHLCV frame}."""
+    hists = {t: h for t, h in hists.items() if h is not None and not h.empty}
+    return {field: pd.DataFrame({t: h[field] for t, h in hists.items()})
+            for field in ('High', 'Low', 'Close', 'Volume')}
+
+
+def _bin_index(price: np.ndarray, lo: np.ndarray, step: np.ndarray, edges: np.ndarray, bins: int) -> np.ndarray:
+    """Bin of each price under edges[i] <= price < edges[i + 1]; -1 outside every bin.
+    The arithmetic guess is corrected against the edges themselves, so a price on an
+    edge lands exactly where the comparison would put it."""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        idx = np.floor((price - lo) / step)
+    idx = np.clip(np.nan_to_num(idx, nan=-1), -1, bins).astype(int)
+    cols = np.broadcast_to(np.arange(price.shape[1]), price.shape)
+    at = lambda i: edges[cols, np.clip(i, 0, bins)]
+    idx = np.where((idx >= 0) & (idx <= bins) & (price < at(idx)), idx - 1, idx)
+    idx = np.where((idx >= 0) & (idx < bins) & (price >= at(idx + 1)), idx + 1, idx)
+    valid = (idx >= 0) & (idx < bins) & ~np.isnan(price)
+    return np.where(valid, idx, -1)
+
+
+def profile_panel(high: pd.DataFrame, low: pd.DataFrame, close: pd.DataFrame, volume: pd.DataFrame,
+                  bins: int = DEFAULT_BINS, mode: str = 'close') -> dict:
+    """Volume profile of every ticker.
+
+    Returns {'edges': ticker x (bins + 1) frame of bin edges,
+             'volume': ticker x bins frame of volume per bin}."""
+    tickers = close.columns
+    h, l, c = (p.reindex(columns=tickers).to_numpy(dtype=float) for p in (high, low, close))
+    v = np.nan_to_num(volume.reindex(index=close.index, columns=tickers).to_numpy(dtype=float))
+    lo, hi = np.nanmin(l, axis=0, initial=np.inf), np.nanmax(h, axis=0, initial=-np.inf)
+    empty = ~np.isfinite(lo) | ~np.isfinite(hi) | (hi <= lo)
+    lo, hi = np.where(empty, 0.0, lo), np.where(empty, 0.0, hi)
+    step = (hi - lo) / bins
+    # Same edges np.linspace(lo, hi, bins + 1) gives
+    edges = np.arange(bins + 1)[None, :] * step[:, None] + lo[:, None]
+    edges[:, -1] = hi
+
+    profile = np.zeros((len(tickers), bins))
+    if mode == 'close':
+        idx = _bin_index(c, lo, step, edges, bins)
+        flat = idx + np.arange(len(tickers))[None, :] * bins
+        keep = idx >= 0
+        profile = np.bincount(flat[keep], weights=v[keep], minlength=len(tickers) * bins).reshape(len(tickers), bins)
+    elif mode == 'range':
+        # Share of each bar's range below every edge, summed over bars, differenced per bin
+        with np.errstate(divide='ignore', invalid='ignore'):
+            a, b = (l - lo) / step, (h - lo) / step
+        flat_bar = ~(b > a) & ~np.isnan(c)
+        chunk = max(1, _RANGE_CHUNK // max(1, len(c) * (bins + 1)))
+        k = np.arange(bins + 1, dtype=float)
+        for start in range(0, len(tickers), chunk):
+            j = slice(start, start + chunk)
+            aj, bj, vj = a[:, j, None], b[:, j, None], v[:, j, None]
+            with np.errstate(divide='ignore', invalid='ignore'):
+                share = np.clip((k - aj) / (bj - aj), 0, 1)
+            cdf = np.nansum(np.where(flat_bar[:, j, None], 0.0, share * vj), axis=0)
+            profile[j] = np.diff(cdf, axis=1)
+        # A bar with no range (or a missing high/low) trades at its close; one at the
+        # period high belongs to the top bin, like the top of every ranged bar
+        at_close = np.where(flat_bar, c, np.nan)
+        idx = _bin_index(at_close, lo, step, edges, bins)
+        idx = np.where((idx < 0) & (at_close == hi[None, :]), bins - 1, idx)
+        flat = idx + np.arange(len(tickers))[None, :] * bins
+        keep = idx >= 0
+        profile += np.bincount(flat[keep], weights=v[keep], minlength=len(tickers) * bins).reshape(len(tickers), bins)
+    else:
+        raise ValueError(f"Unknown volume profile mode: {mode}")
+
+    profile[empty] = 0.0
+    return {'edges': pd.DataFrame(edges, index=tickers), 'volume': pd.DataFrame(profile, index=tickers)}
+
+
+def profile_frame(profiles: dict, ticker) -> pd.DataFrame:
+    """One ticker's profile as rows of price_low, price_high, price_mid, volume."""
+    edges = profiles['edges'].loc[ticker].to_numpy()
+    return pd.DataFrame({
+        'price_low': edges[:-1],
+        'price_high': edges[1:],
+        'price_mid': (edges[:-1] + edges[1:]) / 2,
+        'volume': profiles['volume'].loc[ticker].to_numpy(),
+    })
+
+
+def overhead_risk(distance_pct) -> tuple:
+    """(risk labels, risk scores) for distances (%) to the nearest overhead zone;
+    NaN (no zone above the price) is LOW with a score of 0."""
+    distance = np.asarray(distance_pct, dtype=float)
+    labels = np.where(np.isnan(distance), 'LOW', np.asarray(RISK_LABELS)[np.digitize(distance, RISK_EDGES)])
+    scores = np.nan_to_num(ladder(distance, RISK_EDGES, RISK_SCORES), nan=0).astype(int)
+    return labels, scores
+
+
+def point_of_control(profiles: dict) -> pd.Series:
+    """Mid price of each ticker's highest-volume bin (NaN without volume)."""
+    vol = profiles['volume'].to_numpy()
+    edges = profiles['edges'].to_numpy()
+    poc = vol.argmax(axis=1)
+    rows = np.arange(len(vol))
+    mid = (edges[rows, poc] + edges[rows, poc + 1]) / 2
+    return pd.Series(np.where(vol.sum(axis=1) > 0, mid, np.nan), index=profiles['volume'].index)
+
+
+def value_area(profiles: dict, share: float = VALUE_AREA_SHARE) -> pd.DataFrame:
+    """Value area low/high per ticker: from the point of control, add the heavier
+    neighbouring bin until `share` of the volume is covered (all tickers per step)."""
+    vol = profiles['volume'].to_numpy()
+    edges = profiles['edges'].to_numpy()
+    n, bins = vol.shape
+    rows = np.arange(n)
+    low = high = vol.argmax(axis=1)
+    covered = vol[rows, low].copy()
+    target = vol.sum(axis=1) * share
+    for _ in range(bins - 1):
+        growing = covered < target
+        if not growing.any():
+            break
+        up = np.where(high + 1 < bins, vol[rows, np.minimum(high + 1, bins - 1)], -1.0)
+        down = np.where(low - 1 >= 0, vol[rows, np.maximum(low - 1, 0)], -1.0)
+        take_up = growing & (up >= down) & (up >= 0)
+        take_down = growing & ~take_up & (down >= 0)
+        high = np.where(take_up, high + 1, high)
+        low = np.where(take_down, low - 1, low)
+        covered = covered + np.where(take_up, up, 0) + np.where(take_down, down, 0)
+    has_volume = target > 0
+    return pd.DataFrame({
+        'va_low': np.where(has_volume, edges[rows, low], np.nan),
+        'va_high': np.where(has_volume, edges[rows, high + 1], np.nan),
+    }, index=profiles['volume'].index)
+
+
+def supply_zones(profiles: dict, price: pd.Series, threshold: float = ZONE_THRESHOLD) -> pd.DataFrame:
+    """Every high-volume bin as a row: ticker, price_low, price_high, volume, strength
+    (multiple of the ticker's average bin volume) and whether it sits above the price."""
+    vol = profiles['volume']
+    edges = profiles['edges'].to_numpy()
+    avg = vol.sum(axis=1) / vol.shape[1]
+    strength = vol.div(avg.where(avg > 0), axis=0)
+    tickers, bins = np.nonzero((vol.to_numpy() > (avg.to_numpy() * threshold)[:, None]))
+    mid = (edges[tickers, bins] + edges[tickers, bins + 1]) / 2
+    names = vol.index[tickers]
+    return pd.DataFrame({
+        'ticker': names,
+        'price_low': edges[tickers, bins],
+        'price_high': edges[tickers, bins + 1],
+        'volume': vol.to_numpy()[tickers, bins],
+        'strength': strength.fillna(0).to_numpy()[tickers, bins],
+        'overhead': mid > price.reindex(names).to_numpy(),
+    })
+
+
+def overhead_supply_scan(panels: dict, bins: int = DEFAULT_BINS, mode: str = 'close',
+                         threshold: float = ZONE_THRESHOLD) -> pd.DataFrame:
+    """Overhead-supply risk for every ticker of an OHLCV panel set, one row each:
+    price, point of control, value area, nearest supply zone above the price,
+    its distance in percent, and the bagholder risk label and score."""
+    close = panels['Close']
+    profiles = profile_panel(panels['High'], panels['Low'], close, panels['Volume'], bins, mode)
+    price = close.ffill().iloc[-1] if len(close) else pd.Series(np.nan, index=close.columns)
+    zones = supply_zones(profiles, price, threshold)
+    overhead = zones[zones['overhead']]
+    nearest = overhead.groupby('ticker')['price_low'].min().reindex(close.columns)
+    distance = (nearest - price) / price * 100
+
+    scan = pd.DataFrame({'price': price, 'poc': point_of_control(profiles)}, index=close.columns)
+    scan = scan.join(value_area(profiles))
+    scan['nearest_supply'] = nearest
+    scan['distance_pct'] = distance
+    scan['supply_zones'] = overhead.groupby('ticker').size().reindex(close.columns).fillna(0).astype(int)
+    scan['risk'], scan['risk_score'] = overhead_risk(distance)
+    return scan.sort_values('risk_score', ascending=False)
@@ -7,8 +7,37 @@ from datetime import datetime, timedelta
 import yfinance as yf
 from io import BytesIO
 import warnings
+import os
 import random
 import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+from Modules.price_store import PriceStore, shared_store
+from Modules.ticker_pool import TickerPool
+from Modules.singleflight import SingleFlight
+from Modules.resilience import Resilience
+from Modules.rate_limiter import RateLimiter, BACKGROUND, INTERACTIVE
+from Modules.swr_cache import StaleWhileRevalidate, format_age
+from Modules.cache_warmer import CacheWarmer
+from Modules.fear_greed import FG_COMPONENTS, FG_PERIOD, FearGreedHistory, fear_greed_snapshot
+from Modules.screener import (CATEGORIES, SMART_SCORE, category_scores, fundamentals_frame, normalize_weights, rank,
+                              score_components, smart_score, weighted_score)
+from Modules.rules import RuleSet, load_rules
+from Modules.quote_snapshot import (QUOTE_UNIVERSE, SNAPSHOT_PERIOD, MOVERS_UNIVERSE, quote_table,
+                                    movers_view, tape_view, indices_view)
+from Modules.history_cache import HistoryCache
+from Modules.indicators import IndicatorEngine
+from Modules.panel_indicators import technical_snapshot
+from Modules.options_analytics import ChainAnalyticsCache, chain_table, max_pain
+from Modules.chain_store import ChainStore
+from Modules.options_flow import scan_unusual
+from Modules.factor_risk import ROLLING_WINDOW, FactorRiskEngine
+from Modules.greeks import MARKET_TZ, chain_greeks, gex_by_strike, zero_gamma_level
+from Modules.vol_surface import VolSurfaceCache, with_solved_iv
+from Modules.volume_profile import (DEFAULT_BINS, ohlcv_panels, overhead_risk, overhead_supply_scan, point_of_control,
+                                    profile_frame, profile_panel, supply_zones, value_area)
+from Modules.resample import resample_base, resample_ohlcv
 warnings.filterwarnings('ignore')
 
 # ============================================================================
@@ -652,6 +681,45 @@ TIMEFRAMES = {
     'MAX': {'period': 'max', 'interval': '1mo', 'label': 'Maximum'},
 }
 
+# ============================================================================
+# RATE LIMITS - shared by every outbound Yahoo call in the process
+# ============================================================================
+YAHOO_REQUESTS_PER_SECOND = float(os.environ.get('MISPRICED_YAHOO_RPS', 3.0))
+YAHOO_BURST = int(os.environ.get('MISPRICED_YAHOO_BURST', 15))
+
+# Stale-while-revalidate policy per data kind: (refresh after, max staleness) in seconds.
+# Past "refresh after" the cached value is still served while it reloads in the
+# background; only past "max staleness" does a reader wait for the network.
+CACHE_POLICIES = {
+    'info': (300, 3600),
+    'financials': (600, 86400),
+    'quotes': (120, 900),
+    'fear_greed': (600, 3600),
+    'fear_greed_history': (3600, 86400),
+    'unusual_options': (1800, 86400),
+}
+
+# Background warmer cadence in seconds — shorter than each kind's refresh age, so
+# sessions read values that are already fresh and first paint needs no network
+WARM_INTERVALS = {'quotes': 60, 'fear_greed': 300, 'fear_greed_history': 3600, 'watchlist': 240,
+                  'watchlist_intraday': 300, 'option_chains': 3600, 'unusual_options': 1800}
+
+# Concurrent per-expiry option chain fetches (every one still takes a rate-limiter token)
+CHAIN_WORKERS = 6
+# Tickers a universe-wide load (unusual-options scan, screens, panels) works on at once
+SCAN_WORKERS = 4
+
+# History window read for each indicator interval
+INDICATOR_PERIODS = {'15m': '5d', '1h': '1mo', '1d': '2y'}
+WATCHLIST = [t.strip().upper() for t in
+             os.environ.get('MISPRICED_WATCHLIST', 'AAPL,MSFT,NVDA,AMZN,GOOGL,META,TSLA').split(',') if t.strip()]
+# JSON rule set (Modules/rules.py format, reading screener.smart_score_metrics) that
+# replaces the built-in smart score; its optional 'strategies' join the sidebar
+SCORE_RULES_PATH = os.environ.get('MISPRICED_SCORE_RULES')
+# Tickers the background unusual-options scan walks (watchlist and movers by default)
+OPTIONS_SCAN_UNIVERSE = [t.strip().upper() for t in os.environ.get('MISPRICED_OPTIONS_SCAN', '').split(',')
+                         if t.strip()] or list(dict.fromkeys(WATCHLIST + MOVERS_UNIVERSE))
+
 # ============================================================================
 # CLASS: DataEngine - Core data fetching and caching
 # ============================================================================
@@ -659,39 +727,54 @@ class DataEngine:
     """Centralized data fetching — always returns complete data, retries all sources"""
 
     MAX_RETRIES = 2
-    RETRY_DELAY = 1  # seconds
+    RETRY_DELAY = 1  # seconds — base of the jittered exponential backoff
 
     @staticmethod
     def get_stock(ticker: str):
         """Fetch stock object (not cached - Ticker objects are not serializable)"""
-        try:
-            stock = yf.Ticker(ticker)
+        def with_info(stock):
             _ = stock.info
             return stock
+
+        try:
+            return get_ticker_pool().use(ticker, with_info)
         except Exception:
             return None
 
     @staticmethod
-    @st.cache_data(ttl=300)
     def get_info(ticker: str) -> dict:
         """Fetch complete stock info — exhausts all sources before returning.
         Source chain: yf.Ticker.info -> yf.Ticker.fast_info -> yf.download
-        Each source is retried. Results are merged so nothing is missing."""
+        Each source is retried. Results are merged so nothing is missing.
+        Served stale-while-revalidate (CACHE_POLICIES['info'])."""
+        return get_swr_cache().get(
+            ('info', ticker), lambda: get_flight().do(('info', ticker), lambda: DataEngine._load_info(ticker)),
+            accept=DataEngine._has_price)
+
+    @staticmethod
+    def _has_price(info: dict) -> bool:
+        return bool(info.get('currentPrice') or info.get('regularMarketPrice') or info.get('navPrice'))
+
+    @staticmethod
+    def warm(ticker: str):
+        """Reload a watchlist ticker's info and bring its stored daily history up to date"""
+        get_swr_cache().refresh(
+            ('info', ticker), lambda: get_flight().do(('info', ticker), lambda: DataEngine._load_info(ticker)),
+            accept=DataEngine._has_price)
+        get_history_cache().get(ticker, period='2y', interval='1d')
+
+    @staticmethod
+    def _load_info(ticker: str) -> dict:
+        """Source chain behind get_info — runs once per ticker however many sessions ask at once."""
         info = {}
 
         # --- Source 1: yf.Ticker.info (most complete) ---
-        for attempt in range(DataEngine.MAX_RETRIES):
-            try:
-                stock = yf.Ticker(ticker)
-                raw = stock.info
-                if raw and isinstance(raw, dict):
-                    info = {k: v for k, v in raw.items() if v is not None}
-                    if info.get('currentPrice') or info.get('regularMarketPrice') or info.get('navPrice'):
-                        break
-            except Exception:
-                pass
-            if attempt < DataEngine.MAX_RETRIES - 1:
-                time.sleep(DataEngine.RETRY_DELAY)
+        raw = get_resilience().call(
+            'info', lambda: get_ticker_pool().use(ticker, lambda t: t.info),
+            accept=lambda r: isinstance(r, dict) and bool(r.get('currentPrice') or r.get('regularMarketPrice') or r.get('navPrice')),
+            retries=DataEngine.MAX_RETRIES)
+        if raw and isinstance(raw, dict):
+            info = {k: v for k, v in raw.items() if v is not None}
 
         # --- Source 2: yf.Ticker.fast_info (fills gaps) ---
         needs_price = not (info.get('currentPrice') or info.get('regularMarketPrice'))
@@ -699,53 +782,44 @@ class DataEngine:
         needs_range = not info.get('fiftyTwoWeekHigh')
 
         if needs_price or needs_cap or needs_range:
-            for attempt in range(DataEngine.MAX_RETRIES):
-                try:
-                    stock = yf.Ticker(ticker)
-                    fi = stock.fast_info
-                    if fi is not None:
-                        fi_data = {
-                            'currentPrice': getattr(fi, 'last_price', None),
-                            'regularMarketPrice': getattr(fi, 'last_price', None),
-                            'marketCap': getattr(fi, 'market_cap', None),
-                            'fiftyDayAverage': getattr(fi, 'fifty_day_average', None),
-                            'twoHundredDayAverage': getattr(fi, 'two_hundred_day_average', None),
-                            'fiftyTwoWeekHigh': getattr(fi, 'year_high', None),
-                            'fiftyTwoWeekLow': getattr(fi, 'year_low', None),
-                            'sharesOutstanding': getattr(fi, 'shares', None),
-                            'previousClose': getattr(fi, 'previous_close', None),
-                        }
-                        # Only fill gaps — never overwrite good data
-                        for k, v in fi_data.items():
-                            if v is not None and not info.get(k):
-                                info[k] = v
-                        break
-                except Exception:
-                    pass
-                if attempt < DataEngine.MAX_RETRIES - 1:
-                    time.sleep(DataEngine.RETRY_DELAY)
+            def read_fast_info():
+                fi = get_ticker_pool().use(ticker, lambda t: t.fast_info)
+                if fi is None:
+                    return None
+                return {
+                    'currentPrice': getattr(fi, 'last_price', None),
+                    'regularMarketPrice': getattr(fi, 'last_price', None),
+                    'marketCap': getattr(fi, 'market_cap', None),
+                    'fiftyDayAverage': getattr(fi, 'fifty_day_average', None),
+                    'twoHundredDayAverage': getattr(fi, 'two_hundred_day_average', None),
+                    'fiftyTwoWeekHigh': getattr(fi, 'year_high', None),
+                    'fiftyTwoWeekLow': getattr(fi, 'year_low', None),
+                    'sharesOutstanding': getattr(fi, 'shares', None),
+                    'previousClose': getattr(fi, 'previous_close', None),
+                }
+
+            fi_data = get_resilience().call('fast_info', read_fast_info, accept=bool, retries=DataEngine.MAX_RETRIES)
+            # Only fill gaps — never overwrite good data
+            for k, v in (fi_data or {}).items():
+                if v is not None and not info.get(k):
+                    info[k] = v
 
         # --- Source 3: yf.download (last resort for price) ---
         if not (info.get('currentPrice') or info.get('regularMarketPrice')):
-            for attempt in range(DataEngine.MAX_RETRIES):
-                try:
-                    dl = yf.download(ticker, period='5d', progress=False, threads=False)
-                    if not dl.empty:
-                        last_close = dl['Close'].iloc[-1]
-                        if hasattr(last_close, 'iloc'):
-                            last_close = last_close.iloc[0]
-                        info['currentPrice'] = float(last_close)
-                        info['regularMarketPrice'] = float(last_close)
-                        if len(dl) >= 2:
-                            prev_close = dl['Close'].iloc[-2]
-                            if hasattr(prev_close, 'iloc'):
-                                prev_close = prev_close.iloc[0]
-                            info['previousClose'] = float(prev_close)
-                        break
-                except Exception:
-                    pass
-                if attempt < DataEngine.MAX_RETRIES - 1:
-                    time.sleep(DataEngine.RETRY_DELAY)
+            dl = get_resilience().call(
+                'download', lambda: yf.download(ticker, period='5d', progress=False, threads=False),
+                accept=lambda df: df is not None and not df.empty, retries=DataEngine.MAX_RETRIES)
+            if dl is not None and not dl.empty:
+                last_close = dl['Close'].iloc[-1]
+                if hasattr(last_close, 'iloc'):
+                    last_close = last_close.iloc[0]
+                info['currentPrice'] = float(last_close)
+                info['regularMarketPrice'] = float(last_close)
+                if len(dl) >= 2:
+                    prev_close = dl['Close'].iloc[-2]
+                    if hasattr(prev_close, 'iloc'):
+                        prev_close = prev_close.iloc[0]
+                    info['previousClose'] = float(prev_close)
 
         # --- Derived fields ---
         prev = info.get('previousClose')
@@ -759,217 +833,485 @@ class DataEngine:
         return info
 
     @staticmethod
-    @st.cache_data(ttl=300)
     def get_history(ticker: str, period: str = '1y', interval: str = '1d') -> pd.DataFrame:
-        """Fetch price history — tries Ticker.history then yf.download, retries each."""
+        """Fetch price history — sliced from a range-aware cache of the full stored
+        series, so '1y', '3mo' or 'ytd' after a '2y' load cost no network calls.
+        Weekly/monthly/hourly bars are resampled locally from a finer base series."""
+        base = resample_base(interval, period, available=lambda b: get_price_store().has(ticker, b))
+        if base:
+            base_hist = get_history_cache().get(ticker, period=period, interval=base)
+            if not base_hist.empty:
+                return resample_ohlcv(base_hist, interval)
+        return get_history_cache().get(ticker, period=period, interval=interval)
+
+    @staticmethod
+    def _load_history(ticker: str, interval: str, period: str) -> tuple:
+        """History cache loader — the full local series, or a direct fetch of the window."""
+        hist = get_flight().do(('history', ticker, interval), lambda: get_price_store().sync(ticker, interval))
+        if not hist.empty:
+            return hist, 'max'
+        # Store could not be populated — fall back to a direct fetch for this window
+        return DataEngine._fetch_history(ticker, period=period, interval=interval), period
+
+    @staticmethod
+    def _fetch_history(ticker: str, period: str = None, interval: str = '1d', start=None) -> pd.DataFrame:
+        """Network fetch for the price store — tries Ticker.history then yf.download, retries each.
+        Pass either a period or a start date (delta fetch up to now)."""
+        window = {'start': start} if start is not None else {'period': period or 'max'}
+
+        has_rows = lambda df: df is not None and len(df) > 0
+
         # --- Source 1: yf.Ticker.history ---
-        for attempt in range(DataEngine.MAX_RETRIES):
-            try:
-                stock = yf.Ticker(ticker)
-                hist = stock.history(period=period, interval=interval)
-                if len(hist) > 0:
-                    return hist
-            except Exception:
-                pass
-            if attempt < DataEngine.MAX_RETRIES - 1:
-                time.sleep(DataEngine.RETRY_DELAY)
+        hist = get_resilience().call(
+            'history', lambda: get_ticker_pool().use(ticker, lambda t: t.history(interval=interval, **window)),
+            accept=has_rows, retries=DataEngine.MAX_RETRIES)
+        if has_rows(hist):
+            return hist
 
         # --- Source 2: yf.download ---
-        for attempt in range(DataEngine.MAX_RETRIES):
-            try:
-                df = yf.download(ticker, period=period, interval=interval, progress=False, threads=False)
-                if not df.empty:
-                    if isinstance(df.columns, pd.MultiIndex):
-                        df.columns = df.columns.get_level_values(0)
-                    return df
-            except Exception:
-                pass
-            if attempt < DataEngine.MAX_RETRIES - 1:
-                time.sleep(DataEngine.RETRY_DELAY)
+        df = get_resilience().call(
+            'download', lambda: yf.download(ticker, interval=interval, progress=False, threads=False, **window),
+            accept=has_rows, retries=DataEngine.MAX_RETRIES)
+        if has_rows(df):
+            if isinstance(df.columns, pd.MultiIndex):
+                df.columns = df.columns.get_level_values(0)
+            return df
 
         return pd.DataFrame()
 
     @staticmethod
-    @st.cache_data(ttl=600)
     def get_financials(ticker: str) -> dict:
-        """Fetch all financial statements with retry"""
-        for attempt in range(DataEngine.MAX_RETRIES):
-            try:
-                stock = yf.Ticker(ticker)
-                result = {
-                    'income_stmt': stock.quarterly_income_stmt,
-                    'balance_sheet': stock.quarterly_balance_sheet,
-                    'cash_flow': stock.quarterly_cash_flow,
-                    'income_annual': stock.income_stmt,
-                    'balance_annual': stock.balance_sheet,
-                    'cash_flow_annual': stock.cash_flow,
-                }
-                # Verify we actually got data
-                if any(v is not None and not (isinstance(v, pd.DataFrame) and v.empty) for v in result.values()):
-                    return result
-            except Exception:
-                pass
-            if attempt < DataEngine.MAX_RETRIES - 1:
-                time.sleep(DataEngine.RETRY_DELAY)
-        return {}
+        """Fetch all financial statements with retry — served stale-while-revalidate"""
+        return get_swr_cache().get(
+            ('financials', ticker),
+            lambda: get_flight().do(('financials', ticker), lambda: DataEngine._load_financials(ticker)),
+            accept=bool)
+
+    @staticmethod
+    def _load_financials(ticker: str) -> dict:
+        """Statement fetch behind get_financials."""
+        def read_statements(stock):
+            return {
+                'income_stmt': stock.quarterly_income_stmt,
+                'balance_sheet': stock.quarterly_balance_sheet,
+                'cash_flow': stock.quarterly_cash_flow,
+                'income_annual': stock.income_stmt,
+                'balance_annual': stock.balance_sheet,
+                'cash_flow_annual': stock.cash_flow,
+            }
+
+        # Verify we actually got data
+        has_data = lambda r: any(v is not None and not (isinstance(v, pd.DataFrame) and v.empty) for v in r.values())
+        result = get_resilience().call('financials', lambda: get_ticker_pool().use(ticker, read_statements),
+                                       accept=has_data, retries=DataEngine.MAX_RETRIES)
+        return result if result and has_data(result) else {}
 
     @staticmethod
     @st.cache_data(ttl=600)
     def get_earnings_dates(ticker: str) -> pd.DataFrame:
         """Fetch earnings dates with retry"""
-        for attempt in range(DataEngine.MAX_RETRIES):
-            try:
-                stock = yf.Ticker(ticker)
-                earnings = stock.earnings_dates
-                if earnings is not None and not earnings.empty:
-                    return earnings
-            except Exception:
-                pass
-            if attempt < DataEngine.MAX_RETRIES - 1:
-                time.sleep(DataEngine.RETRY_DELAY)
-        return pd.DataFrame()
+        earnings = get_resilience().call(
+            'earnings', lambda: get_ticker_pool().use(ticker, lambda t: t.earnings_dates),
+            accept=lambda df: df is not None and not df.empty, retries=DataEngine.MAX_RETRIES)
+        return earnings if earnings is not None and not earnings.empty else pd.DataFrame()
 
     @staticmethod
     @st.cache_data(ttl=600)
     def get_recommendations(ticker: str) -> pd.DataFrame:
         """Fetch analyst recommendations with retry"""
-        for attempt in range(DataEngine.MAX_RETRIES):
-            try:
-                stock = yf.Ticker(ticker)
-                recs = stock.recommendations
-                if recs is not None and not recs.empty:
-                    return recs
-            except Exception:
-                pass
-            if attempt < DataEngine.MAX_RETRIES - 1:
-                time.sleep(DataEngine.RETRY_DELAY)
-        return pd.DataFrame()
+        recs = get_resilience().call(
+            'recommendations', lambda: get_ticker_pool().use(ticker, lambda t: t.recommendations),
+            accept=lambda df: df is not None and not df.empty, retries=DataEngine.MAX_RETRIES)
+        return recs if recs is not None and not recs.empty else pd.DataFrame()
 
     @staticmethod
     @st.cache_data(ttl=600)
     def get_institutional_holders(ticker: str) -> pd.DataFrame:
         """Fetch institutional holders with retry"""
-        for attempt in range(DataEngine.MAX_RETRIES):
-            try:
-                stock = yf.Ticker(ticker)
-                holders = stock.institutional_holders
-                if holders is not None and not holders.empty:
-                    return holders
-            except Exception:
-                pass
-            if attempt < DataEngine.MAX_RETRIES - 1:
-                time.sleep(DataEngine.RETRY_DELAY)
-        return pd.DataFrame()
+        holders = get_resilience().call(
+            'institutional_holders', lambda: get_ticker_pool().use(ticker, lambda t: t.institutional_holders),
+            accept=lambda df: df is not None and not df.empty, retries=DataEngine.MAX_RETRIES)
+        return holders if holders is not None and not holders.empty else pd.DataFrame()
 
     @staticmethod
     @st.cache_data(ttl=600)
     def get_insider_transactions(ticker: str) -> pd.DataFrame:
         """Fetch insider transactions with retry"""
-        for attempt in range(DataEngine.MAX_RETRIES):
-            try:
-                stock = yf.Ticker(ticker)
-                insiders = stock.insider_transactions
-                if insiders is not None and not insiders.empty:
-                    return insiders
-            except Exception:
-                pass
-            if attempt < DataEngine.MAX_RETRIES - 1:
-                time.sleep(DataEngine.RETRY_DELAY)
-        return pd.DataFrame()
+        insiders = get_resilience().call(
+            'insider_transactions', lambda: get_ticker_pool().use(ticker, lambda t: t.insider_transactions),
+            accept=lambda df: df is not None and not df.empty, retries=DataEngine.MAX_RETRIES)
+        return insiders if insiders is not None and not insiders.empty else pd.DataFrame()
 
     @staticmethod
     @st.cache_data(ttl=300)
     def get_options_chain(ticker: str, expiry: str = None) -> dict:
         """Fetch options chain data with retry"""
-        for attempt in range(DataEngine.MAX_RETRIES):
-            try:
-                stock = yf.Ticker(ticker)
-                expirations = stock.options
-                if not expirations:
-                    if attempt < DataEngine.MAX_RETRIES - 1:
-                        time.sleep(DataEngine.RETRY_DELAY)
-                        continue
-                    return {'expirations': [], 'calls': pd.DataFrame(), 'puts': pd.DataFrame()}
-
-                exp = expiry if expiry and expiry in expirations else expirations[0]
-                chain = stock.option_chain(exp)
-                return {
-                    'expirations': list(expirations),
-                    'selected_expiry': exp,
-                    'calls': chain.calls,
-                    'puts': chain.puts
-                }
-            except Exception:
-                pass
-            if attempt < DataEngine.MAX_RETRIES - 1:
-                time.sleep(DataEngine.RETRY_DELAY)
-        return {'expirations': [], 'calls': pd.DataFrame(), 'puts': pd.DataFrame()}
+        return get_flight().do(('options', ticker, expiry), lambda: DataEngine._load_options_chain(ticker, expiry))
+
+    @staticmethod
+    def get_option_chains(ticker: str, force: bool = False) -> pd.DataFrame:
+        """Every listed expiry of a ticker's chain as one long contract table
+        (Modules/options_analytics.chain_table), served from the on-disk snapshot store."""
+        return get_flight().do(('option_chains', ticker, force), lambda: get_chain_store().sync(ticker, force=force))
+
+    @staticmethod
+    def get_option_oi_change(ticker: str, days_back: int = 1) -> pd.DataFrame:
+        """Per-contract open interest change against the snapshot `days_back` stored days earlier"""
+        return get_chain_store().oi_change(ticker, days_back)
+
+    @staticmethod
+    def _fetch_option_chains(ticker: str) -> dict:
+        """Every expiry of a chain fetched concurrently on the bounded chain pool —
+        the network source behind the chain store. Expiries that fail are left out."""
+        front = DataEngine._load_options_chain(ticker)
+        if not front.get('selected_expiry'):
+            return {}
+        chains = {front['selected_expiry']: front}
+        rest = [exp for exp in front['expirations'] if exp not in chains]
+
+        # Workers keep the caller's session and rate-limiter priority
+        ctx = get_script_run_ctx()
+        priority = get_rate_limiter().current_priority()
+
+        def run(exp):
+            if ctx is not None:
+                add_script_run_ctx(threading.current_thread(), ctx)
+            with get_rate_limiter().priority(priority):
+                return DataEngine._load_options_chain(ticker, exp, front['expirations'])
+
+        for exp, chain in zip(rest, get_chain_pool().map(run, rest)):
+            if chain.get('selected_expiry') == exp:
+                chains[exp] = chain
+        return chains
+
+    @staticmethod
+    def _load_options_chain(ticker: str, expiry: str = None, expirations: list = None) -> dict:
+        """Chain fetch behind get_options_chain. Callers that already hold the expiry
+        list pass it in to skip fetching it again."""
+        empty = {'expirations': [], 'calls': pd.DataFrame(), 'puts': pd.DataFrame()}
+        if expirations is None:
+            expirations = get_resilience().call(
+                'options', lambda: get_ticker_pool().use(ticker, lambda t: t.options), accept=bool,
+                retries=DataEngine.MAX_RETRIES)
+        if not expirations:
+            return empty
+
+        exp = expiry if expiry and expiry in expirations else expirations[0]
+        chain = get_resilience().call(
+            'options', lambda: get_ticker_pool().use(ticker, lambda t: t.option_chain(exp)), retries=DataEngine.MAX_RETRIES)
+        if chain is None:
+            return empty
+        return {
+            'expirations': list(expirations),
+            'selected_expiry': exp,
+            'calls': chain.calls,
+            'puts': chain.puts
+        }
 
     @staticmethod
     @st.cache_data(ttl=300)
     def get_news(ticker: str) -> list:
         """Fetch and clean news data with retry - handles both old and new yfinance formats"""
-        for attempt in range(DataEngine.MAX_RETRIES):
+        return get_flight().do(('news', ticker), lambda: DataEngine._load_news(ticker))
+
+    @staticmethod
+    def _load_news(ticker: str) -> list:
+        """News fetch and cleanup behind get_news."""
+        raw_news = get_resilience().call(
+            'news', lambda: get_ticker_pool().use(ticker, lambda t: t.news), accept=bool, retries=DataEngine.MAX_RETRIES)
+        if not raw_news:
+            return []
+        try:
+            clean_news = []
+
+            for item in raw_news:
+                content = item.get('content', item) if isinstance(item, dict) else item
+                if not isinstance(content, dict):
+                    continue
+
+                title = (content.get('title') or item.get('title', '')).strip()
+                link = (content.get('canonicalUrl', {}).get('url', '') if isinstance(content.get('canonicalUrl'), dict)
+                        else content.get('link') or item.get('link', '')).strip()
+
+                if not title:
+                    continue
+                if not link:
+                    link = f"https://finance.yahoo.com/quote/{ticker}/news"
+
+                thumbnail = None
+                thumb_data = content.get('thumbnail') or item.get('thumbnail')
+                if isinstance(thumb_data, dict) and 'resolutions' in thumb_data:
+                    resolutions = thumb_data['resolutions']
+                    if resolutions:
+                        thumbnail = resolutions[-1].get('url', resolutions[0].get('url', ''))
+
+                published = (content.get('pubDate') or content.get('providerPublishTime')
+                            or item.get('providerPublishTime') or 0)
+                if isinstance(published, str):
+                    try:
+                        published = int(datetime.fromisoformat(published.replace('Z', '+00:00')).timestamp())
+                    except (ValueError, TypeError):
+                        published = 0
+
+                publisher = (content.get('provider', {}).get('displayName', '') if isinstance(content.get('provider'), dict)
+                            else content.get('publisher') or item.get('publisher', 'Unknown'))
+                publisher = (publisher.strip() if publisher else '') or 'Financial News'
+
+                if published > 0:
+                    clean_news.append({
+                        'title': title,
+                        'publisher': publisher,
+                        'link': link,
+                        'thumbnail': thumbnail,
+                        'published': published,
+                        'type': content.get('type') or item.get('type', 'STORY'),
+                        'related_tickers': content.get('relatedTickers') or item.get('relatedTickers', [])
+                    })
+
+            return clean_news
+        except Exception:
+            return []
+
+    @staticmethod
+    def map_universe(fn, tickers: list) -> list:
+        """[fn(ticker) for ticker in tickers] on the bounded scan pool, at the caller's
+        rate-limiter priority, so a large screen never starves single-ticker prefetches"""
+        priority = get_rate_limiter().current_priority()
+
+        def run(ticker):
+            with get_rate_limiter().priority(priority):
+                return fn(ticker)
+
+        return list(get_scan_pool().map(run, tickers))
+
+    @staticmethod
+    def universe_inputs(tickers: list, history_period: str = '2y') -> tuple:
+        """(fundamentals frame, date x ticker close panel) for a whole universe.
+        Info and history are gathered concurrently from the shared caches and the
+        local price store; only tickers never seen before touch the network."""
+        tickers = list(dict.fromkeys(tickers))
+        infos = dict(zip(tickers, DataEngine.map_universe(DataEngine.get_info, tickers)))
+        return fundamentals_frame(infos), DataEngine.close_panel(tickers, history_period)
+
+    @staticmethod
+    def close_panel(tickers: list, history_period: str = '2y') -> pd.DataFrame:
+        """date x ticker close panel, histories gathered concurrently from the local price store"""
+        tickers = list(dict.fromkeys(tickers))
+        hists = DataEngine.map_universe(lambda t: DataEngine.get_history(t, period=history_period), tickers)
+        # Exchanges differ in timezone; each ticker's own sessions are what the scores read
+        return pd.DataFrame({t: h['Close'].set_axis(pd.DatetimeIndex(h.index).tz_localize(None))
+                             for t, h in zip(tickers, hists) if not h.empty})
+
+    @staticmethod
+    def factor_risk(tickers: list, period: str = '1y') -> pd.DataFrame:
+        """Correlation and beta to SPY and BTC, alpha and residual risk for a whole universe in
+        one pass over its return panel; the benchmarks are loaded once and shared"""
+        return get_factor_engine().universe(DataEngine.close_panel(tickers, period), period)
+
+    @staticmethod
+    def score_universe(tickers: list, history_period: str = '2y') -> tuple:
+        """Smart-score components and latest technicals of a whole universe, one row per
+        ticker, each in one vectorized pass. Weights are not involved, so the result can
+        be cached and re-ranked under any strategy with screener.rank()."""
+        fund, panel = DataEngine.universe_inputs(tickers, history_period)
+        return score_components(fund, panel, get_score_rules()), technical_snapshot(panel)
+
+    @staticmethod
+    def refresh_ticker(ticker: str):
+        """Drop everything cached for one ticker so its next read goes to the source;
+        shared market data stays cached and is refreshed by the warmer instead."""
+        get_history_cache().invalidate(ticker)
+        for kind in ('info', 'financials'):
+            get_swr_cache().discard((kind, ticker))
+        get_ticker_pool().invalidate(ticker)
+        for fn in (DataEngine.get_earnings_dates, DataEngine.get_recommendations, DataEngine.get_institutional_holders,
+                   DataEngine.get_insider_transactions, DataEngine.get_options_chain, DataEngine.get_news):
             try:
-                stock = yf.Ticker(ticker)
-                raw_news = stock.news
-                if not raw_news:
-                    if attempt < DataEngine.MAX_RETRIES - 1:
-                        time.sleep(DataEngine.RETRY_DELAY)
-                        continue
-                    return []
-                clean_news = []
-
-                for item in raw_news:
-                    content = item.get('content', item) if isinstance(item, dict) else item
-                    if not isinstance(content, dict):
-                        continue
-
-                    title = (content.get('title') or item.get('title', '')).strip()
-                    link = (content.get('canonicalUrl', {}).get('url', '') if isinstance(content.get('canonicalUrl'), dict)
-                            else content.get('link') or item.get('link', '')).strip()
-
-                    if not title:
-                        continue
-                    if not link:
-                        link = f"https://finance.yahoo.com/quote/{ticker}/news"
-
-                    thumbnail = None
-                    thumb_data = content.get('thumbnail') or item.get('thumbnail')
-                    if isinstance(thumb_data, dict) and 'resolutions' in thumb_data:
-                        resolutions = thumb_data['resolutions']
-                        if resolutions:
-                            thumbnail = resolutions[-1].get('url', resolutions[0].get('url', ''))
-
-                    published = (content.get('pubDate') or content.get('providerPublishTime')
-                                or item.get('providerPublishTime') or 0)
-                    if isinstance(published, str):
-                        try:
-                            published = int(datetime.fromisoformat(published.replace('Z', '+00:00')).timestamp())
-                        except (ValueError, TypeError):
-                            published = 0
-
-                    publisher = (content.get('provider', {}).get('displayName', '') if isinstance(content.get('provider'), dict)
-                                else content.get('publisher') or item.get('publisher', 'Unknown'))
-                    publisher = (publisher.strip() if publisher else '') or 'Financial News'
-
-                    if published > 0:
-                        clean_news.append({
-                            'title': title,
-                            'publisher': publisher,
-                            'link': link,
-                            'thumbnail': thumbnail,
-                            'published': published,
-                            'type': content.get('type') or item.get('type', 'STORY'),
-                            'related_tickers': content.get('relatedTickers') or item.get('relatedTickers', [])
-                        })
+                fn.clear(ticker)
+            except TypeError:
+                # Older Streamlit releases can only clear a cached function as a whole
+                fn.clear()
+
+    @staticmethod
+    def source_health() -> dict:
+        """Circuit breaker state per upstream source (CLOSED / OPEN / HALF_OPEN)"""
+        return get_resilience().states()
+
+    @staticmethod
+    def data_age(kind: str, *key) -> float:
+        """Seconds since the cached value of one data kind was fetched, None if not cached"""
+        return get_swr_cache().age((kind, *key))
+
+    @staticmethod
+    def indicators(ticker: str, interval: str = '1d') -> dict:
+        """Latest RSI / MACD / Bollinger / ATR / moving averages on one interval.
+        Only bars newer than the last call are folded into the rolling state."""
+        period = INDICATOR_PERIODS.get(interval, '1y')
+        hist = DataEngine.get_history(ticker, period=period, interval=interval)
+        return get_indicator_engine().update(ticker, interval, hist, period) if not hist.empty else {}
 
-                return clean_news
+    @staticmethod
+    def coalescing_stats() -> dict:
+        """Executed vs coalesced fetch counts per data kind (info, history, ...)"""
+        return get_flight().stats()
+
+    # Defaults returned for a part whose fetch raised — matches each accessor's own empty result
+    PREFETCH_DEFAULTS = {
+        'info': dict,
+        'hist': pd.DataFrame,
+        'news': list,
+        'financials': dict,
+        'inst_holders': pd.DataFrame,
+        'insider_tx': pd.DataFrame,
+        'options_data': lambda: {'expirations': [], 'calls': pd.DataFrame(), 'puts': pd.DataFrame()},
+    }
+
+    @staticmethod
+    def prefetch(ticker: str, parts: tuple = None, history_period: str = '2y') -> dict:
+        """Fetch independent data sets for one ticker concurrently on the shared pool.
+        Each accessor keeps its own source chain and retries, so the bundle is ready
+        in roughly the time of the slowest call instead of the sum of all of them."""
+        jobs = {
+            'info': lambda: DataEngine.get_info(ticker),
+            'hist': lambda: DataEngine.get_history(ticker, period=history_period),
+            'news': lambda: DataEngine.get_news(ticker),
+            'financials': lambda: DataEngine.get_financials(ticker),
+            'inst_holders': lambda: DataEngine.get_institutional_holders(ticker),
+            'insider_tx': lambda: DataEngine.get_insider_transactions(ticker),
+            'options_data': lambda: DataEngine.get_options_chain(ticker),
+        }
+        parts = parts or tuple(jobs)
+
+        ctx = get_script_run_ctx()
+        priority = get_rate_limiter().current_priority()
+
+        def run(job):
+            # Let st.cache_data inside the accessors see the session that asked,
+            # and its calls queue at the caller's rate-limiter priority
+            if ctx is not None:
+                add_script_run_ctx(threading.current_thread(), ctx)
+            with get_rate_limiter().priority(priority):
+                return job()
+
+        pool = get_prefetch_pool()
+        futures = {part: pool.submit(run, jobs[part]) for part in parts}
+        bundle = {}
+        for part, future in futures.items():
+            try:
+                bundle[part] = future.result()
             except Exception:
-                pass
-            if attempt < DataEngine.MAX_RETRIES - 1:
-                time.sleep(DataEngine.RETRY_DELAY)
-        return []
+                bundle[part] = DataEngine.PREFETCH_DEFAULTS[part]()
+        return bundle
+
+
+@st.cache_resource
+def get_prefetch_pool() -> ThreadPoolExecutor:
+    """Bounded worker pool for concurrent data prefetch, shared by every session"""
+    return ThreadPoolExecutor(max_workers=16, thread_name_prefix='prefetch')
+
+
+@st.cache_resource
+def get_chain_pool() -> ThreadPoolExecutor:
+    """Bounded worker pool for per-expiry option chain fetches, shared by every session"""
+    return ThreadPoolExecutor(max_workers=CHAIN_WORKERS, thread_name_prefix='chains')
+
+
+@st.cache_resource
+def get_scan_pool() -> ThreadPoolExecutor:
+    """Bounded worker pool for watchlist- and universe-wide loads, kept apart from interactive prefetch"""
+    return ThreadPoolExecutor(max_workers=SCAN_WORKERS, thread_name_prefix='scan')
+
+
+@st.cache_resource
+def get_score_rules() -> RuleSet:
+    """Smart-score rule set: the JSON file at MISPRICED_SCORE_RULES if set, else the built-in rules"""
+    if not SCORE_RULES_PATH:
+        return SMART_SCORE
+    rules = load_rules(SCORE_RULES_PATH)
+    missing = [cat for cat in CATEGORIES if cat not in rules.categories]
+    if missing:
+        raise ValueError(f"{SCORE_RULES_PATH}: rule set has no {', '.join(missing)} category")
+    return rules
+
+
+@st.cache_resource
+def get_factor_engine() -> FactorRiskEngine:
+    """Process-wide SPY / BTC benchmark returns for correlation, beta and residual risk"""
+    return FactorRiskEngine(loader=lambda symbol, period: DataEngine.get_history(symbol, period=period))
+
+
+@st.cache_resource
+def get_chain_store() -> ChainStore:
+    """Process-wide on-disk options chain snapshots"""
+    return ChainStore(fetcher=DataEngine._fetch_option_chains)
+
+
+@st.cache_resource
+def get_resilience() -> Resilience:
+    """Process-wide backoff policy and per-source circuit breakers"""
+    return Resilience(failure_threshold=5, reset_timeout=30.0,
+                      base_delay=DataEngine.RETRY_DELAY, max_delay=4.0,
+                      limiter=get_rate_limiter())
+
+
+@st.cache_resource
+def get_rate_limiter() -> RateLimiter:
+    """Process-wide token bucket every outbound Yahoo call goes through"""
+    return RateLimiter(rate=YAHOO_REQUESTS_PER_SECOND, burst=YAHOO_BURST)
+
+
+@st.cache_resource
+def get_swr_cache() -> StaleWhileRevalidate:
+    """Process-wide stale-while-revalidate cache for quotes and fundamentals"""
+    return StaleWhileRevalidate(CACHE_POLICIES, wrap=lambda: get_rate_limiter().priority(BACKGROUND))
+
+
+@st.cache_resource
+def get_fear_greed_store() -> FearGreedHistory:
+    """Process-wide on-disk daily Fear & Greed series"""
+    return FearGreedHistory(fetcher=_download_fear_greed_closes)
+
+
+@st.cache_resource
+def get_flight() -> SingleFlight:
+    """Process-wide request coalescer for DataEngine fetches"""
+    return SingleFlight()
+
+
+@st.cache_resource
+def get_ticker_pool() -> TickerPool:
+    """Process-wide yf.Ticker handle pool — one handle per ticker per refresh window"""
+    return TickerPool(ttl=300)
+
+
+@st.cache_resource
+def get_price_store() -> PriceStore:
+    """Process-wide OHLCV store shared by every session (and by data.py)"""
+    return shared_store(fetcher=DataEngine._fetch_history)
+
+
+@st.cache_resource
+def get_history_cache() -> HistoryCache:
+    """Process-wide range-aware history cache shared by every session"""
+    return HistoryCache(loader=DataEngine._load_history)
+
+
+@st.cache_resource
+def get_chain_analytics() -> ChainAnalyticsCache:
+    """Process-wide options analytics memoized per chain snapshot"""
+    return ChainAnalyticsCache()
+
+
+@st.cache_resource
+def get_vol_surfaces() -> VolSurfaceCache:
+    """Process-wide implied-vol smiles memoized per expiry of each chain snapshot"""
+    return VolSurfaceCache()
+
+
+@st.cache_resource
+def get_indicator_engine() -> IndicatorEngine:
+    """Process-wide incremental indicator state per (ticker, interval)"""
+    return IndicatorEngine()
 
 # ============================================================================
 # CLASS: ForensicLab - Distortion Thesis Analysis
@@ -1176,17 +1518,21 @@ class RetailEdgeEngine:
     """Advanced features giving retail investors an edge"""
 
     @staticmethod
-    def bagholder_detector(hist: pd.DataFrame) -> dict:
+    def bagholder_detector(hist: pd.DataFrame, n_bins: int = DEFAULT_BINS, mode: str = 'close') -> dict:
         """
         Volume Profile Analysis - Detect overhead supply zones
-        Identifies price levels with heavy volume (potential resistance)
+        Identifies price levels with heavy volume (potential resistance).
+        mode='close' bins each bar's volume at its close; 'range' spreads it across high-low.
+        Modules/volume_profile.py runs the same analysis over a whole watchlist.
         """
         result = {
             'overhead_supply_zones': [],
             'support_zones': [],
             'current_risk': 'LOW',
             'risk_score': 0,
-            'volume_profile': None
+            'volume_profile': None,
+            'poc': None,
+            'value_area': None
         }
 
         try:
@@ -1195,68 +1541,31 @@ class RetailEdgeEngine:
 
             current_price = hist['Close'].iloc[-1]
 
-            # Create volume profile (price-volume distribution)
-            price_min = hist['Low'].min()
-            price_max = hist['High'].max()
-            n_bins = 20
-
-            price_bins = np.linspace(price_min, price_max, n_bins + 1)
-            volume_profile = []
-
-            for i in range(n_bins):
-                bin_low = price_bins[i]
-                bin_high = price_bins[i + 1]
-                bin_mid = (bin_low + bin_high) / 2
-
-                # Volume in this price range
-                mask = (hist['Close'] >= bin_low) & (hist['Close'] < bin_high)
-                vol = hist.loc[mask, 'Volume'].sum()
-
-                volume_profile.append({
-                    'price_low': bin_low,
-                    'price_high': bin_high,
-                    'price_mid': bin_mid,
-                    'volume': vol
-                })
-
-            result['volume_profile'] = volume_profile
-
-            # Calculate average volume per bin
-            total_vol = sum(v['volume'] for v in volume_profile)
-            avg_vol = total_vol / n_bins if n_bins > 0 else 0
-
-            # Identify high volume zones (overhead supply = resistance)
-            for vp in volume_profile:
-                if vp['volume'] > avg_vol * 1.5:  # 50% above average
-                    zone = {
-                        'price_low': vp['price_low'],
-                        'price_high': vp['price_high'],
-                        'volume': vp['volume'],
-                        'strength': vp['volume'] / avg_vol if avg_vol > 0 else 0
-                    }
-
-                    if vp['price_mid'] > current_price:
-                        result['overhead_supply_zones'].append(zone)
-                    else:
-                        result['support_zones'].append(zone)
+            # Create volume profile (price-volume distribution) as one weighted histogram
+            panels = ohlcv_panels({'_': hist})
+            profiles = profile_panel(panels['High'], panels['Low'], panels['Close'], panels['Volume'], n_bins, mode)
+            result['volume_profile'] = profile_frame(profiles, '_').to_dict('records')
+            result['poc'] = point_of_control(profiles).iloc[0]
+            result['value_area'] = tuple(value_area(profiles).iloc[0])
+
+            # High volume zones (50% above the average bin): overhead supply above the price, support below
+            zones = supply_zones(profiles, pd.Series({'_': current_price}))
+            for z in zones.itertuples():
+                zone = {
+                    'price_low': z.price_low,
+                    'price_high': z.price_high,
+                    'volume': z.volume,
+                    'strength': z.strength
+                }
+                result['overhead_supply_zones' if z.overhead else 'support_zones'].append(zone)
 
             # Calculate risk based on proximity to overhead supply
             if result['overhead_supply_zones']:
                 nearest_supply = min(z['price_low'] for z in result['overhead_supply_zones'])
                 distance_pct = ((nearest_supply - current_price) / current_price) * 100
-
-                if distance_pct < 3:
-                    result['current_risk'] = 'CRITICAL'
-                    result['risk_score'] = 90
-                elif distance_pct < 5:
-                    result['current_risk'] = 'HIGH'
-                    result['risk_score'] = 70
-                elif distance_pct < 10:
-                    result['current_risk'] = 'MODERATE'
-                    result['risk_score'] = 50
-                else:
-                    result['current_risk'] = 'LOW'
-                    result['risk_score'] = 20
+                labels, scores = overhead_risk([distance_pct])
+                result['current_risk'] = str(labels[0])
+                result['risk_score'] = int(scores[0])
 
         except Exception as e:
             result['error'] = str(e)
@@ -1342,10 +1651,13 @@ class RetailEdgeEngine:
         return result
 
     @staticmethod
-    def gamma_squeeze_radar(options_data: dict, current_price: float) -> dict:
+    def gamma_squeeze_radar(options_data: dict, current_price: float, chains: pd.DataFrame = None) -> dict:
         """
         Options Flow Analysis for Gamma Squeeze Potential
-        Identifies strikes with unusual OI relative to volume
+        Identifies strikes with unusual OI relative to volume.
+        chains (DataEngine.get_option_chains) adds max pain for every expiry and across all of them.
+        Dealer gamma exposure per strike, its net total, the zero-gamma flip and the implied-vol
+        surface use every loaded expiry.
         """
         result = {
             'squeeze_potential': 'LOW',
@@ -1353,7 +1665,13 @@ class RetailEdgeEngine:
             'hot_strikes': [],
             'call_put_ratio': None,
             'max_pain': None,
-            'gamma_exposure': []
+            'max_pain_by_expiry': None,
+            'max_pain_all': None,
+            'gamma_exposure': None,
+            'net_gex': None,
+            'zero_gamma': None,
+            'gamma_regime': None,
+            'vol_surface': None
         }
 
         try:
@@ -1413,23 +1731,33 @@ class RetailEdgeEngine:
                         result['squeeze_potential'] = 'LOW'
                         result['squeeze_score'] = 20
 
-            # Calculate max pain (strike where most options expire worthless)
+            # Max pain: strike minimizing the intrinsic value paid out at expiry (exact, via prefix sums)
+            analytics = get_chain_analytics()
+            front_table = chain_table({options_data.get('selected_expiry'): options_data})
             if not calls.empty and not puts.empty:
-                all_strikes = sorted(set(calls['strike'].tolist() + puts['strike'].tolist()))
-                max_pain_strike = None
-                min_total_value = float('inf')
-
-                for strike in all_strikes:
-                    # Calculate intrinsic value at this strike
-                    call_value = calls[calls['strike'] < strike]['openInterest'].sum() * (strike - calls[calls['strike'] < strike]['strike'].mean()) if len(calls[calls['strike'] < strike]) > 0 else 0
-                    put_value = puts[puts['strike'] > strike]['openInterest'].sum() * (puts[puts['strike'] > strike]['strike'].mean() - strike) if len(puts[puts['strike'] > strike]) > 0 else 0
-
-                    total_value = call_value + put_value
-                    if total_value < min_total_value:
-                        min_total_value = total_value
-                        max_pain_strike = strike
-
-                result['max_pain'] = max_pain_strike
+                front = analytics.get(front_table, 'max_pain', max_pain)
+                if not front.empty:
+                    result['max_pain'] = float(front['max_pain'].iloc[0])
+
+            if chains is not None and not chains.empty:
+                result['max_pain_by_expiry'] = analytics.get(chains, 'max_pain', max_pain)
+                pooled = analytics.get(chains, 'max_pain_pooled', lambda t: max_pain(t, pooled=True))
+                result['max_pain_all'] = float(pooled['max_pain'].iloc[0]) if not pooled.empty else None
+
+            # Dealer gamma exposure from Black-Scholes gamma of every contract (all expiries when loaded)
+            gex_table = chains if chains is not None and not chains.empty else front_table
+            if current_price and not gex_table.empty:
+                # Vols solved from mid prices where the quote allows, Yahoo's column elsewhere.
+                # Greeks age with time to expiry, so cached ones last an hour at most
+                as_of = pd.Timestamp.now(tz=MARKET_TZ).strftime('%Y-%m-%d %H')
+                greeks = analytics.get(gex_table, f'greeks@{current_price:.4f}@{as_of}',
+                                       lambda t: chain_greeks(with_solved_iv(t, current_price), current_price))
+                result['gamma_exposure'] = gex_by_strike(greeks)
+                result['net_gex'] = float(result['gamma_exposure']['net_gex'].sum())
+                result['zero_gamma'] = analytics.get(gex_table, f'zero_gamma@{current_price:.4f}@{as_of}',
+                                                     lambda t: zero_gamma_level(greeks, current_price))
+                result['gamma_regime'] = 'SHORT GAMMA' if result['net_gex'] < 0 else 'LONG GAMMA'
+                result['vol_surface'] = get_vol_surfaces().surface(gex_table, current_price)
 
         except Exception as e:
             result['error'] = str(e)
@@ -1441,56 +1769,43 @@ class RetailEdgeEngine:
     def reality_check(ticker: str, period: str = '1y') -> dict:
         """
         Correlation Analysis vs SPY and BTC
-        Check for idiosyncratic alpha
+        Check for idiosyncratic alpha — the ticker's row of the factor risk engine, whose
+        benchmark returns are shared with every other ticker analyzed.
         """
         result = {
             'spy_correlation': None,
             'btc_correlation': None,
             'alpha_potential': 'UNKNOWN',
             'beta': None,
-            'idiosyncratic_score': 50
+            'idiosyncratic_score': 50,
+            'alpha': None,
+            'residual_vol': None,
+            'rolling': None
         }
 
         try:
-            # Fetch data
-            tickers = [ticker, 'SPY', 'BTC-USD']
-            data = yf.download(tickers, period=period, progress=False)['Close']
-
-            if data.empty or ticker not in data.columns:
+            hist = DataEngine.get_history(ticker, period=period)
+            if hist.empty:
                 return result
 
-            # Calculate returns
-            returns = data.pct_change().dropna()
-
-            if len(returns) < 20:
+            closes = hist[['Close']].rename(columns={'Close': ticker})
+            engine = get_factor_engine()
+            row = engine.universe(closes, period).loc[ticker]
+            if pd.isna(row.get('spy_beta')) and pd.isna(row.get('btc_corr')):
                 return result
 
-            # Correlations
-            if 'SPY' in returns.columns:
-                result['spy_correlation'] = returns[ticker].corr(returns['SPY'])
+            as_float = lambda v: None if pd.isna(v) else float(v)
+            result['spy_correlation'] = as_float(row.get('spy_corr'))
+            result['btc_correlation'] = as_float(row.get('btc_corr'))
+            result['beta'] = as_float(row.get('spy_beta'))
+            result['alpha'] = as_float(row.get('alpha'))
+            result['residual_vol'] = as_float(row.get('resid_vol'))
+            result['idiosyncratic_score'] = float(row['idiosyncratic_score'])
+            result['alpha_potential'] = row['alpha_potential']
 
-                # Calculate beta
-                cov = returns[ticker].cov(returns['SPY'])
-                var = returns['SPY'].var()
-                result['beta'] = cov / var if var > 0 else 1
-
-            if 'BTC-USD' in returns.columns:
-                result['btc_correlation'] = returns[ticker].corr(returns['BTC-USD'])
-
-            # Idiosyncratic alpha assessment
-            spy_corr = abs(result['spy_correlation']) if result['spy_correlation'] else 1
-            btc_corr = abs(result['btc_correlation']) if result['btc_correlation'] else 0
-
-            # Lower correlation = more idiosyncratic
-            avg_corr = (spy_corr + btc_corr) / 2
-            result['idiosyncratic_score'] = (1 - avg_corr) * 100
-
-            if result['idiosyncratic_score'] > 70:
-                result['alpha_potential'] = 'HIGH'
-            elif result['idiosyncratic_score'] > 40:
-                result['alpha_potential'] = 'MODERATE'
-            else:
-                result['alpha_potential'] = 'LOW (MARKET FOLLOWER)'
+            rolling = engine.rolling(closes, period)
+            result['rolling'] = pd.DataFrame({f'{key} {stat}': stats[stat][ticker]
+                                              for key, stats in rolling.items() for stat in ('corr', 'beta')})
 
         except Exception as e:
             result['error'] = str(e)
@@ -1595,15 +1910,6 @@ class PortfolioManager:
 # HELPER FUNCTIONS - Technical Analysis & Scoring
 # ============================================================================
 
-def calculate_rsi(prices: pd.Series, period: int = 14) -> pd.Series:
-    """Calculate RSI indicator"""
-    delta = prices.diff()
-    gain = delta.where(delta > 0, 0).rolling(window=period).mean()
-    loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-    rs = gain / loss
-    return 100 - (100 / (1 + rs))
-
-
 def calculate_macd(prices: pd.Series, fast: int = 12, slow: int = 26, signal: int = 9) -> dict:
     """Calculate MACD indicator"""
     ema_fast = prices.ewm(span=fast, adjust=False).mean()
@@ -1663,312 +1969,49 @@ def get_fundamental_metrics(info: dict) -> dict:
     }
 
 
-def calculate_smart_score(info: dict, hist: pd.DataFrame, fundamentals: dict, weights: dict) -> tuple:
+# Category weights per sidebar strategy
+STRATEGY_WEIGHTS = {
+    'Balanced': {'valuation': 0.25, 'quality': 0.25, 'growth': 0.20, 'momentum': 0.15, 'risk': 0.15},
+    'Value Focused': {'valuation': 0.40, 'quality': 0.25, 'growth': 0.10, 'momentum': 0.10, 'risk': 0.15},
+    'Growth Focused': {'valuation': 0.15, 'quality': 0.20, 'growth': 0.40, 'momentum': 0.15, 'risk': 0.10},
+    'Income Focused': {'valuation': 0.25, 'quality': 0.35, 'growth': 0.10, 'momentum': 0.10, 'risk': 0.20},
+    'Aggressive': {'valuation': 0.10, 'quality': 0.15, 'growth': 0.35, 'momentum': 0.30, 'risk': 0.10},
+    # Named weights shipped with a custom rule set
+    **get_score_rules().strategies,
+}
+
+
+def calculate_smart_score(info: dict, hist: pd.DataFrame, weights: dict) -> tuple:
     """
     Calculate comprehensive investment score using professional-grade metrics.
     Each category scored 0-100, then weighted for final score.
-    More realistic scoring with proper benchmarks and nuanced analysis.
+    Scored by the same compiled rule set the screener applies to a whole universe
+    (Modules/screener.SMART_SCORE_RULES, or the MISPRICED_SCORE_RULES file).
     """
-    scores = {}
-    metrics = {}
-    details = {}  # Store detailed breakdown
-
-    # =========================================================================
-    # VALUATION SCORE (0-100)
-    # Benchmark: S&P 500 averages - P/E ~20-22, P/B ~4, EV/EBITDA ~14
-    # =========================================================================
-    val_score = 50  # Start neutral
-
-    # P/E Analysis (weight: 25 points)
-    pe = info.get('trailingPE') or info.get('forwardPE')
-    forward_pe = info.get('forwardPE')
-    metrics['pe'] = pe
-    metrics['forward_pe'] = forward_pe
-
-    if pe and pe > 0:
-        if pe < 10: val_score += 20  # Deep value
-        elif pe < 15: val_score += 15  # Value
-        elif pe < 20: val_score += 10  # Fair
-        elif pe < 25: val_score += 5   # Slightly expensive
-        elif pe < 35: val_score -= 5   # Expensive
-        elif pe < 50: val_score -= 10  # Very expensive
-        else: val_score -= 15          # Extremely expensive
-
-        # Forward P/E improvement bonus
-        if forward_pe and pe and forward_pe < pe * 0.85:
-            val_score += 8  # Earnings expected to grow significantly
-
-    # PEG Ratio (weight: 20 points) - Gold standard for GARP
-    peg = info.get('pegRatio')
-    metrics['peg'] = peg
-    if peg and peg > 0:
-        if peg < 0.75: val_score += 15    # Undervalued growth
-        elif peg < 1.0: val_score += 10   # Fair growth value
-        elif peg < 1.5: val_score += 5    # Acceptable
-        elif peg < 2.0: val_score += 0    # Fairly priced
-        elif peg < 3.0: val_score -= 5    # Expensive for growth
-        else: val_score -= 10             # Very expensive
-
-    # FCF Yield (weight: 20 points) - Real cash generation
-    mkt_cap = info.get('marketCap', 1) or 1
-    fcf = info.get('freeCashflow', 0) or 0
-    fcf_yield = (fcf / mkt_cap) * 100 if mkt_cap > 0 else 0
-    metrics['fcf_yield'] = fcf_yield
-
-    if fcf_yield > 10: val_score += 15    # Exceptional
-    elif fcf_yield > 7: val_score += 12   # Excellent
-    elif fcf_yield > 5: val_score += 8    # Good
-    elif fcf_yield > 3: val_score += 4    # Acceptable
-    elif fcf_yield > 0: val_score += 0    # Neutral
-    else: val_score -= 10                  # Negative FCF concerning
-
-    # EV/EBITDA (weight: 15 points)
-    ev_ebitda = info.get('enterpriseToEbitda')
-    if ev_ebitda and ev_ebitda > 0:
-        if ev_ebitda < 8: val_score += 10
-        elif ev_ebitda < 12: val_score += 6
-        elif ev_ebitda < 16: val_score += 2
-        elif ev_ebitda < 20: val_score -= 3
-        else: val_score -= 8
-
-    scores['valuation'] = max(0, min(100, val_score))
-
-    # =========================================================================
-    # QUALITY SCORE (0-100)
-    # Measures business quality, competitive moat, financial strength
-    # =========================================================================
-    qual_score = 50
-
-    # Profitability (weight: 35 points)
-    profit_margin = fundamentals.get('profit_margin', 0)
-    gross_margin = fundamentals.get('gross_margin', 0)
-    operating_margin = fundamentals.get('operating_margin', 0)
-
-    # Net profit margin
-    if profit_margin > 30: qual_score += 15
-    elif profit_margin > 20: qual_score += 10
-    elif profit_margin > 10: qual_score += 5
-    elif profit_margin > 5: qual_score += 2
-    elif profit_margin < 0: qual_score -= 10
-
-    # Gross margin (indicator of pricing power)
-    if gross_margin > 60: qual_score += 10
-    elif gross_margin > 40: qual_score += 6
-    elif gross_margin > 25: qual_score += 2
-    elif gross_margin < 15: qual_score -= 5
-
-    # Return Metrics (weight: 30 points)
-    roe = fundamentals.get('roe', 0)
-    roa = fundamentals.get('roa', 0)
-
-    if roe > 25: qual_score += 12
-    elif roe > 18: qual_score += 8
-    elif roe > 12: qual_score += 4
-    elif roe > 8: qual_score += 1
-    elif roe < 0: qual_score -= 8
-
-    if roa > 15: qual_score += 8
-    elif roa > 10: qual_score += 5
-    elif roa > 5: qual_score += 2
-    elif roa < 0: qual_score -= 5
-
-    # Financial Strength (weight: 25 points)
-    current_ratio = fundamentals.get('current_ratio', 0)
-    debt_to_equity = fundamentals.get('debt_to_equity', 0)
-
-    if current_ratio > 2.5: qual_score += 8
-    elif current_ratio > 1.5: qual_score += 5
-    elif current_ratio > 1.0: qual_score += 2
-    elif current_ratio < 0.8: qual_score -= 8
-
-    if debt_to_equity < 0.3: qual_score += 10
-    elif debt_to_equity < 0.6: qual_score += 6
-    elif debt_to_equity < 1.0: qual_score += 2
-    elif debt_to_equity < 1.5: qual_score -= 3
-    elif debt_to_equity < 2.5: qual_score -= 8
-    else: qual_score -= 12
-
-    scores['quality'] = max(0, min(100, qual_score))
-
-    # =========================================================================
-    # GROWTH SCORE (0-100)
-    # Evaluates growth trajectory and sustainability
-    # =========================================================================
-    growth_score = 50
-
-    # Revenue Growth (weight: 35 points)
-    rev_growth = fundamentals.get('revenue_growth', 0)
-    metrics['rev_growth'] = rev_growth
-
-    if rev_growth > 50: growth_score += 18
-    elif rev_growth > 30: growth_score += 14
-    elif rev_growth > 20: growth_score += 10
-    elif rev_growth > 10: growth_score += 6
-    elif rev_growth > 5: growth_score += 2
-    elif rev_growth > 0: growth_score += 0
-    elif rev_growth > -5: growth_score -= 5
-    else: growth_score -= 12
-
-    # Earnings Growth (weight: 35 points)
-    earnings_growth = fundamentals.get('earnings_growth', 0)
-    metrics['earnings_growth'] = earnings_growth
-
-    if earnings_growth > 50: growth_score += 18
-    elif earnings_growth > 30: growth_score += 14
-    elif earnings_growth > 20: growth_score += 10
-    elif earnings_growth > 10: growth_score += 6
-    elif earnings_growth > 0: growth_score += 2
-    elif earnings_growth > -10: growth_score -= 5
-    else: growth_score -= 12
-
-    # Growth Consistency Bonus (weight: 15 points)
-    if rev_growth > 10 and earnings_growth > 10:
-        growth_score += 8  # Both growing nicely
-    if rev_growth > 0 and earnings_growth > rev_growth:
-        growth_score += 5  # Margin expansion
-
-    # Penalize if growth is slowing significantly
-    if rev_growth > 0 and earnings_growth < rev_growth * 0.5:
-        growth_score -= 5  # Margin compression
-
-    scores['growth'] = max(0, min(100, growth_score))
-
-    # =========================================================================
-    # MOMENTUM SCORE (0-100)
-    # Technical strength and trend analysis
-    # =========================================================================
-    mom_score = 50
-
-    if len(hist) > 0:
-        current_price = hist['Close'].iloc[-1]
-
-        # RSI Analysis (weight: 25 points)
-        rsi_val = 50
-        if len(hist) > 14:
-            rsi_series = calculate_rsi(hist['Close'])
-            rsi_val = rsi_series.iloc[-1] if not pd.isna(rsi_series.iloc[-1]) else 50
-        metrics['rsi'] = rsi_val
-
-        # Optimal RSI zone
-        if 45 <= rsi_val <= 55: mom_score += 10    # Balanced
-        elif 40 <= rsi_val <= 60: mom_score += 8   # Healthy
-        elif 55 < rsi_val <= 65: mom_score += 5    # Bullish but not overheated
-        elif 35 <= rsi_val < 40: mom_score += 6    # Potential reversal up
-        elif rsi_val > 75: mom_score -= 8          # Overbought risk
-        elif rsi_val < 25: mom_score -= 5          # Oversold (could be opportunity or trouble)
-
-        # Moving Average Analysis (weight: 35 points)
-        if len(hist) >= 50:
-            ma50 = hist['Close'].rolling(50).mean().iloc[-1]
-            metrics['ma50'] = ma50
-            pct_from_ma50 = ((current_price - ma50) / ma50) * 100
-
-            if current_price > ma50:
-                if pct_from_ma50 < 5: mom_score += 10    # Just above - healthy
-                elif pct_from_ma50 < 10: mom_score += 8  # Trending up
-                elif pct_from_ma50 < 20: mom_score += 4  # Extended
-                else: mom_score -= 2                      # Very extended
-            else:
-                if pct_from_ma50 > -5: mom_score += 2    # Just below
-                elif pct_from_ma50 > -10: mom_score -= 3
-                else: mom_score -= 8                      # Significantly below
-
-        if len(hist) >= 200:
-            ma200 = hist['Close'].rolling(200).mean().iloc[-1]
-            ma50 = hist['Close'].rolling(50).mean().iloc[-1]
-            metrics['ma200'] = ma200
-
-            if ma50 > ma200: mom_score += 10   # Bullish trend (golden cross territory)
-            else: mom_score -= 5               # Bearish trend
-
-            if current_price > ma200: mom_score += 5
-            else: mom_score -= 5
-
-        # Price Performance (weight: 20 points)
-        if len(hist) >= 63:  # ~3 months
-            price_3m_ago = hist['Close'].iloc[-63]
-            return_3m = ((current_price - price_3m_ago) / price_3m_ago) * 100
-            metrics['return_3m'] = return_3m
-
-            if return_3m > 20: mom_score += 8
-            elif return_3m > 10: mom_score += 5
-            elif return_3m > 0: mom_score += 2
-            elif return_3m > -10: mom_score -= 3
-            else: mom_score -= 8
-
-        # 52-week position (weight: 15 points)
-        high_52w = info.get('fiftyTwoWeekHigh', current_price)
-        low_52w = info.get('fiftyTwoWeekLow', current_price)
-        if high_52w > low_52w:
-            range_position = (current_price - low_52w) / (high_52w - low_52w)
-            metrics['52w_position'] = range_position * 100
-
-            if 0.7 <= range_position <= 0.9: mom_score += 8    # Near highs but not at peak
-            elif 0.5 <= range_position < 0.7: mom_score += 5   # Middle of range
-            elif 0.3 <= range_position < 0.5: mom_score += 2   # Lower half
-            elif range_position < 0.2: mom_score -= 5          # Near lows
-            elif range_position > 0.95: mom_score -= 2         # At highs (risky)
-
-    scores['momentum'] = max(0, min(100, mom_score))
-
-    # =========================================================================
-    # RISK SCORE (0-100) - Higher = LESS risky
-    # =========================================================================
-    risk_score = 70  # Start optimistic
-
-    # Short Interest Risk (weight: 20 points)
-    short_float = info.get('shortPercentOfFloat', 0) or 0
-    metrics['short_float'] = short_float * 100
-
-    if short_float > 0.30: risk_score -= 20      # Very high short interest
-    elif short_float > 0.20: risk_score -= 15
-    elif short_float > 0.10: risk_score -= 8
-    elif short_float > 0.05: risk_score -= 3
-    elif short_float < 0.02: risk_score += 5     # Low short interest is good
-
-    # Beta / Volatility Risk (weight: 25 points)
-    beta = info.get('beta', 1.0) or 1.0
-    metrics['beta'] = beta
-
-    if beta > 2.5: risk_score -= 20
-    elif beta > 2.0: risk_score -= 15
-    elif beta > 1.5: risk_score -= 8
-    elif beta > 1.2: risk_score -= 3
-    elif 0.8 <= beta <= 1.2: risk_score += 5    # Market-like volatility
-    elif 0.5 <= beta < 0.8: risk_score += 3     # Lower volatility
-    elif beta < 0.5: risk_score += 0            # Very low (might be stagnant)
-
-    # Financial Risk (weight: 25 points)
-    if debt_to_equity > 3: risk_score -= 15
-    elif debt_to_equity > 2: risk_score -= 10
-    elif debt_to_equity > 1.5: risk_score -= 5
-    elif debt_to_equity < 0.5: risk_score += 8
-
-    if current_ratio < 0.5: risk_score -= 12
-    elif current_ratio < 1.0: risk_score -= 5
-    elif current_ratio > 2.0: risk_score += 5
-
-    # Profitability Risk (weight: 15 points)
-    if profit_margin < 0: risk_score -= 15        # Unprofitable
-    elif profit_margin < 5: risk_score -= 5
-    elif profit_margin > 15: risk_score += 5
-
-    # FCF Risk (weight: 15 points)
-    if fcf < 0: risk_score -= 10
-    elif fcf_yield > 5: risk_score += 5
-
-    scores['risk'] = max(0, min(100, risk_score))
-
-    # =========================================================================
-    # CALCULATE WEIGHTED TOTAL SCORE
-    # =========================================================================
-    total_score = (
-        scores['valuation'] * weights.get('valuation', 0.20) +
-        scores['quality'] * weights.get('quality', 0.25) +
-        scores['growth'] * weights.get('growth', 0.20) +
-        scores['momentum'] * weights.get('momentum', 0.15) +
-        scores['risk'] * weights.get('risk', 0.20)
-    )
+    closes = hist['Close'] if 'Close' in hist else pd.Series(dtype=float)
+    scores, total_score, row = smart_score(info, closes, weights, get_score_rules())
+    value = lambda name: None if pd.isna(row[name]) else float(row[name])
+
+    metrics = {
+        'pe': value('pe'),
+        'forward_pe': info.get('forwardPE'),
+        'peg': value('peg'),
+        'fcf_yield': value('fcf_yield'),
+        'rev_growth': value('rev_growth'),
+        'earnings_growth': value('earnings_growth'),
+        'short_float': value('short_float') * 100,
+        'beta': value('beta'),
+    }
+    if row['has_hist']:
+        metrics['rsi'] = value('rsi')
+    if row['has_ma50']:
+        metrics['ma50'] = float(closes.iloc[-50:].mean())
+    if row['has_ma200']:
+        metrics['ma200'] = float(closes.iloc[-200:].mean())
+    if row['has_3m']:
+        metrics['return_3m'] = value('return_3m')
+    if row['has_52w_range']:
+        metrics['52w_position'] = value('range_position') * 100
 
     return scores, total_score, metrics
 
@@ -2016,10 +2059,22 @@ def estimate_news_sentiment(title: str) -> str:
     return 'neutral'
 
 
+def get_fear_greed() -> dict:
+    """Fear & Greed snapshot shared by all sessions — kept warm in the background"""
+    return get_swr_cache().get(('fear_greed',), calculate_fear_greed, accept=_has_fear_greed)
+
+
+def _has_fear_greed(fg: dict) -> bool:
+    # A lone VIX reading means every component download failed
+    return fg.get('num_indicators', 0) > 1
+
+
 def calculate_fear_greed() -> dict:
     """
     Comprehensive Fear & Greed Index using 10 market indicators.
     Each indicator scored 0-100, then averaged for final score.
+    All components come from one batched download; indicators are computed
+    as column operations in Modules/fear_greed.py.
 
     Indicators:
     1. VIX Level - Market volatility
@@ -2033,236 +2088,26 @@ def calculate_fear_greed() -> dict:
     9. Sector Rotation - XLY (cyclical) vs XLP (defensive)
     10. Credit Stress - HYG vs LQD spread
     """
-    indicators = {}
-    scores = []
+    return fear_greed_snapshot(_download_fear_greed_closes(period=FG_PERIOD))
 
-    try:
-        # Fetch all data upfront
-        tickers_needed = ['^VIX', 'SPY', 'RSP', 'HYG', 'LQD', 'TLT', 'XLY', 'XLP', '^VIX3M']
-        data = {}
-
-        for t in tickers_needed:
-            try:
-                hist = yf.Ticker(t).history(period="6mo")
-                if len(hist) > 0:
-                    data[t] = hist['Close']
-            except:
-                pass
 
-        vix_current = data.get('^VIX', pd.Series([20])).iloc[-1]
-        indicators['vix'] = vix_current
-
-        # =====================================================================
-        # 1. VIX LEVEL (0-100, higher score = more greed/less fear)
-        # =====================================================================
-        vix_score = 50
-        if vix_current < 12: vix_score = 95       # Extreme complacency
-        elif vix_current < 15: vix_score = 80     # Low fear
-        elif vix_current < 18: vix_score = 65     # Comfortable
-        elif vix_current < 22: vix_score = 50     # Neutral
-        elif vix_current < 28: vix_score = 35     # Elevated fear
-        elif vix_current < 35: vix_score = 20     # High fear
-        else: vix_score = 5                        # Extreme fear
-
-        indicators['vix_level'] = {'value': vix_current, 'score': vix_score, 'label': 'VIX Level'}
-        scores.append(vix_score)
-
-        # =====================================================================
-        # 2. VIX TREND (14-day change)
-        # =====================================================================
-        if '^VIX' in data and len(data['^VIX']) >= 14:
-            vix_14d_ago = data['^VIX'].iloc[-14]
-            vix_change = ((vix_current - vix_14d_ago) / vix_14d_ago) * 100
-
-            if vix_change < -20: vix_trend_score = 90      # VIX dropping fast = greed
-            elif vix_change < -10: vix_trend_score = 75
-            elif vix_change < -5: vix_trend_score = 60
-            elif vix_change < 5: vix_trend_score = 50      # Stable
-            elif vix_change < 15: vix_trend_score = 35
-            elif vix_change < 30: vix_trend_score = 20
-            else: vix_trend_score = 5                       # VIX spiking = fear
-
-            indicators['vix_trend'] = {'value': vix_change, 'score': vix_trend_score, 'label': 'VIX 14D Change'}
-            scores.append(vix_trend_score)
-
-        # =====================================================================
-        # 3. MARKET MOMENTUM (SPY vs 125-day MA)
-        # =====================================================================
-        if 'SPY' in data and len(data['SPY']) >= 125:
-            spy = data['SPY']
-            spy_ma125 = spy.rolling(125).mean().iloc[-1]
-            spy_current = spy.iloc[-1]
-            mom_pct = ((spy_current - spy_ma125) / spy_ma125) * 100
-
-            if mom_pct > 10: mom_score = 95
-            elif mom_pct > 6: mom_score = 80
-            elif mom_pct > 3: mom_score = 65
-            elif mom_pct > 0: mom_score = 55
-            elif mom_pct > -3: mom_score = 40
-            elif mom_pct > -6: mom_score = 25
-            else: mom_score = 10
-
-            indicators['momentum'] = {'value': mom_pct, 'score': mom_score, 'label': 'Market Momentum'}
-            scores.append(mom_score)
-
-        # =====================================================================
-        # 4. STOCK PRICE STRENGTH (SPY distance from 52-week high)
-        # =====================================================================
-        if 'SPY' in data and len(data['SPY']) >= 252:
-            spy = data['SPY']
-            high_52w = spy.tail(252).max()
-            current = spy.iloc[-1]
-            pct_from_high = ((current - high_52w) / high_52w) * 100
-
-            if pct_from_high > -2: strength_score = 90     # Near highs
-            elif pct_from_high > -5: strength_score = 75
-            elif pct_from_high > -10: strength_score = 55
-            elif pct_from_high > -15: strength_score = 40
-            elif pct_from_high > -20: strength_score = 25
-            else: strength_score = 10                       # Bear market territory
-
-            indicators['price_strength'] = {'value': pct_from_high, 'score': strength_score, 'label': '52W High Distance'}
-            scores.append(strength_score)
-
-        # =====================================================================
-        # 5. MARKET BREADTH (RSP equal weight vs SPY cap weight)
-        # =====================================================================
-        if 'RSP' in data and 'SPY' in data and len(data['RSP']) >= 20:
-            rsp_ret = (data['RSP'].iloc[-1] / data['RSP'].iloc[-20] - 1) * 100
-            spy_ret = (data['SPY'].iloc[-1] / data['SPY'].iloc[-20] - 1) * 100
-            breadth_diff = rsp_ret - spy_ret  # Positive = broad participation
-
-            if breadth_diff > 3: breadth_score = 85        # Broad rally
-            elif breadth_diff > 1: breadth_score = 70
-            elif breadth_diff > -1: breadth_score = 50     # Neutral
-            elif breadth_diff > -3: breadth_score = 35
-            else: breadth_score = 20                        # Narrow/concentrated
-
-            indicators['breadth'] = {'value': breadth_diff, 'score': breadth_score, 'label': 'Market Breadth'}
-            scores.append(breadth_score)
-
-        # =====================================================================
-        # 6. PUT/CALL PROXY - VIX Term Structure (VIX vs VIX3M)
-        # =====================================================================
-        if '^VIX' in data and '^VIX3M' in data:
-            vix3m = data['^VIX3M'].iloc[-1]
-            term_structure = (vix_current / vix3m - 1) * 100  # Negative = contango (normal)
-
-            if term_structure < -15: pc_score = 85         # Deep contango = complacent
-            elif term_structure < -8: pc_score = 70
-            elif term_structure < -2: pc_score = 55
-            elif term_structure < 5: pc_score = 40
-            elif term_structure < 15: pc_score = 25        # Backwardation = fear
-            else: pc_score = 10                             # Extreme backwardation
-
-            indicators['put_call'] = {'value': term_structure, 'score': pc_score, 'label': 'VIX Term Structure'}
-            scores.append(pc_score)
-
-        # =====================================================================
-        # 7. JUNK BOND DEMAND (HYG 20-day performance)
-        # =====================================================================
-        if 'HYG' in data and len(data['HYG']) >= 20:
-            hyg_ret = (data['HYG'].iloc[-1] / data['HYG'].iloc[-20] - 1) * 100
-
-            if hyg_ret > 2: junk_score = 85                # Risk-on
-            elif hyg_ret > 1: junk_score = 70
-            elif hyg_ret > 0: junk_score = 55
-            elif hyg_ret > -1: junk_score = 40
-            elif hyg_ret > -2: junk_score = 25
-            else: junk_score = 10                           # Risk-off
-
-            indicators['junk_bond'] = {'value': hyg_ret, 'score': junk_score, 'label': 'Junk Bond Demand'}
-            scores.append(junk_score)
-
-        # =====================================================================
-        # 8. SAFE HAVEN DEMAND (TLT vs SPY 20-day relative performance)
-        # =====================================================================
-        if 'TLT' in data and 'SPY' in data and len(data['TLT']) >= 20:
-            tlt_ret = (data['TLT'].iloc[-1] / data['TLT'].iloc[-20] - 1) * 100
-            spy_ret = (data['SPY'].iloc[-1] / data['SPY'].iloc[-20] - 1) * 100
-            safe_haven_diff = tlt_ret - spy_ret  # Positive = flight to safety
-
-            if safe_haven_diff < -5: sh_score = 85         # Equities crushing bonds = greed
-            elif safe_haven_diff < -2: sh_score = 70
-            elif safe_haven_diff < 1: sh_score = 55
-            elif safe_haven_diff < 3: sh_score = 40
-            elif safe_haven_diff < 6: sh_score = 25
-            else: sh_score = 10                             # Flight to safety = fear
-
-            indicators['safe_haven'] = {'value': safe_haven_diff, 'score': sh_score, 'label': 'Safe Haven Demand'}
-            scores.append(sh_score)
-
-        # =====================================================================
-        # 9. SECTOR ROTATION (XLY cyclical vs XLP defensive)
-        # =====================================================================
-        if 'XLY' in data and 'XLP' in data and len(data['XLY']) >= 20:
-            xly_ret = (data['XLY'].iloc[-1] / data['XLY'].iloc[-20] - 1) * 100
-            xlp_ret = (data['XLP'].iloc[-1] / data['XLP'].iloc[-20] - 1) * 100
-            rotation_diff = xly_ret - xlp_ret  # Positive = risk-on rotation
-
-            if rotation_diff > 5: rotation_score = 90      # Strong risk-on
-            elif rotation_diff > 2: rotation_score = 75
-            elif rotation_diff > 0: rotation_score = 55
-            elif rotation_diff > -2: rotation_score = 40
-            elif rotation_diff > -5: rotation_score = 25
-            else: rotation_score = 10                       # Defensive rotation
-
-            indicators['rotation'] = {'value': rotation_diff, 'score': rotation_score, 'label': 'Sector Rotation'}
-            scores.append(rotation_score)
-
-        # =====================================================================
-        # 10. CREDIT STRESS (HYG vs LQD spread proxy)
-        # =====================================================================
-        if 'HYG' in data and 'LQD' in data and len(data['HYG']) >= 20:
-            hyg_ret = (data['HYG'].iloc[-1] / data['HYG'].iloc[-20] - 1) * 100
-            lqd_ret = (data['LQD'].iloc[-1] / data['LQD'].iloc[-20] - 1) * 100
-            credit_diff = hyg_ret - lqd_ret  # Positive = credit tightening (good)
-
-            if credit_diff > 1.5: credit_score = 85
-            elif credit_diff > 0.5: credit_score = 70
-            elif credit_diff > -0.5: credit_score = 50
-            elif credit_diff > -1.5: credit_score = 35
-            else: credit_score = 15                         # Credit widening = stress
-
-            indicators['credit'] = {'value': credit_diff, 'score': credit_score, 'label': 'Credit Spreads'}
-            scores.append(credit_score)
-
-        # =====================================================================
-        # FINAL SCORE CALCULATION
-        # =====================================================================
-        if scores:
-            final_score = sum(scores) / len(scores)
-        else:
-            final_score = 50
+def _download_fear_greed_closes(period: str = None, start=None) -> pd.DataFrame:
+    """Closes of every Fear & Greed component in one batched download"""
+    window = {'start': start} if start is not None else {'period': period or FG_PERIOD}
 
-        final_score = max(0, min(100, final_score))
+    def download_closes():
+        data = yf.download(FG_COMPONENTS, progress=False, threads=True, **window)
+        return data['Close'] if data is not None and not data.empty else pd.DataFrame()
 
-        # Determine label
-        if final_score >= 80: label = "Extreme Greed"
-        elif final_score >= 65: label = "Greed"
-        elif final_score >= 55: label = "Mild Greed"
-        elif final_score >= 45: label = "Neutral"
-        elif final_score >= 35: label = "Mild Fear"
-        elif final_score >= 20: label = "Fear"
-        else: label = "Extreme Fear"
+    closes = get_resilience().call('download', download_closes, accept=lambda df: not df.empty,
+                                   retries=DataEngine.MAX_RETRIES, cost=len(FG_COMPONENTS))
+    return closes if closes is not None else pd.DataFrame()
 
-        return {
-            'score': final_score,
-            'label': label,
-            'vix': vix_current,
-            'indicators': indicators,
-            'num_indicators': len(scores)
-        }
 
-    except Exception as e:
-        return {
-            'score': 50,
-            'label': "Neutral",
-            'vix': 20,
-            'indicators': {},
-            'num_indicators': 0,
-            'error': str(e)
-        }
+def get_fear_greed_history() -> pd.DataFrame:
+    """Daily Fear & Greed history (composite and every sub-indicator) from the local store"""
+    return get_swr_cache().get(('fear_greed_history',), lambda: get_fear_greed_store().update(),
+                               accept=lambda df: not df.empty)
 
 
 def generate_dcf_excel(ticker: str, info: dict, fundamentals: dict, dcf_params: dict) -> BytesIO:
@@ -2312,10 +2157,9 @@ class StockSimulator:
     @staticmethod
     @st.cache_data(ttl=3600)
     def get_historical_data(ticker: str, start_date: str, end_date: str) -> pd.DataFrame:
-        """Fetch historical data for simulation"""
+        """Fetch historical data for simulation from the local price store"""
         try:
-            stock = yf.Ticker(ticker)
-            hist = stock.history(start=start_date, end=end_date)
+            hist = get_price_store().get_range(ticker, start=start_date, end=end_date)
             return hist if len(hist) > 0 else pd.DataFrame()
         except:
             return pd.DataFrame()
@@ -2342,56 +2186,87 @@ class StockSimulator:
         return hist['Close'].iloc[0]
 
 
-@st.cache_data(ttl=120)
+def get_quote_snapshot() -> pd.DataFrame:
+    """Quote table for every market-overview symbol — served stale-while-revalidate"""
+    return get_swr_cache().get(('quotes',), _load_quote_snapshot, accept=lambda t: not t.empty)
+
+
+def _load_quote_snapshot() -> pd.DataFrame:
+    """One batched download of the movers, tape and index symbols, reduced to a quote table"""
+    data = get_resilience().call(
+        'download', lambda: yf.download(QUOTE_UNIVERSE, period=SNAPSHOT_PERIOD, progress=False, threads=True),
+        accept=lambda df: df is not None and not df.empty, retries=DataEngine.MAX_RETRIES,
+        cost=len(QUOTE_UNIVERSE))
+    return quote_table(data, QUOTE_UNIVERSE)
+
+
+def get_unusual_options() -> pd.DataFrame:
+    """Top unusual option contracts across OPTIONS_SCAN_UNIVERSE as of the last background
+    scan (None before the first one) — a page view never starts a scan itself"""
+    return get_swr_cache().peek(('unusual_options',))
+
+
+def _load_unusual_options() -> pd.DataFrame:
+    """Every scan-universe chain from the snapshot store, loaded on the scan pool and ranked top-K"""
+    priority = get_rate_limiter().current_priority()
+
+    def load(ticker):
+        with get_rate_limiter().priority(priority):
+            return DataEngine.get_option_chains(ticker), get_chain_store().previous(ticker)
+
+    return scan_unusual(OPTIONS_SCAN_UNIVERSE, load, executor=get_scan_pool())
+
+
 def get_market_movers() -> dict:
-    """Fetch top gainers, losers, and most active stocks - batch download for speed"""
-    movers = {'gainers': [], 'losers': [], 'active': []}
+    """Top gainers, losers, and most active stocks — a view over the quote snapshot"""
+    return movers_view(get_quote_snapshot())
 
-    # Popular stocks to check
-    watchlist = ['AAPL', 'MSFT', 'GOOGL', 'AMZN', 'NVDA', 'META', 'TSLA', 'AMD', 'NFLX', 'CRM',
-                 'JPM', 'V', 'MA', 'BAC', 'WMT', 'JNJ', 'PG', 'UNH', 'HD', 'DIS',
-                 'PYPL', 'ADBE', 'INTC', 'CSCO', 'PEP', 'KO', 'MRK', 'ABT', 'TMO', 'COST']
 
-    stock_data = []
+def get_ticker_tape_data() -> list:
+    """Live ticker data for the tape — a view over the quote snapshot"""
+    return tape_view(get_quote_snapshot())
 
-    try:
-        # Batch download - much faster than individual calls
-        data = yf.download(watchlist, period='2d', progress=False, threads=True)
-        if not data.empty:
-            for ticker in watchlist:
-                try:
-                    if ticker in data['Close'].columns:
-                        closes = data['Close'][ticker].dropna()
-                        volumes = data['Volume'][ticker].dropna()
-                        if len(closes) >= 2:
-                            current = closes.iloc[-1]
-                            prev = closes.iloc[-2]
-                            change_pct = ((current - prev) / prev) * 100
-                            volume = volumes.iloc[-1] if len(volumes) > 0 else 0
-
-                            stock_data.append({
-                                'ticker': ticker,
-                                'name': ticker,
-                                'price': current,
-                                'change': change_pct,
-                                'volume': volume
-                            })
-                except:
-                    continue
-    except:
-        pass
 
-    if stock_data:
-        # Sort for gainers and losers
-        sorted_by_change = sorted(stock_data, key=lambda x: x['change'], reverse=True)
-        movers['gainers'] = sorted_by_change[:5]
-        movers['losers'] = sorted_by_change[-5:][::-1]
+def get_indices_data() -> dict:
+    """Major index quotes — a view over the quote snapshot"""
+    return indices_view(get_quote_snapshot())
+
+
+@st.cache_resource
+def get_cache_warmer() -> CacheWarmer:
+    """Process-wide background warmer for the market widgets and the watchlist"""
+    def warm_watchlist():
+        for t in WATCHLIST:
+            DataEngine.warm(t)
+            DataEngine.indicators(t, '1d')
+
+    def warm_watchlist_intraday():
+        for t in WATCHLIST:
+            DataEngine.indicators(t, '15m')
 
-        # Sort for most active
-        sorted_by_volume = sorted(stock_data, key=lambda x: x['volume'], reverse=True)
-        movers['active'] = sorted_by_volume[:5]
+    def warm_option_chains():
+        # One all-expiry snapshot per ticker per hour keeps day-over-day OI history going
+        for t in WATCHLIST:
+            DataEngine.get_option_chains(t)
 
-    return movers
+    warmer = CacheWarmer(wrap=lambda: get_rate_limiter().priority(BACKGROUND))
+    warmer.add('quotes', lambda: get_swr_cache().refresh(('quotes',), _load_quote_snapshot, accept=lambda t: not t.empty),
+               every=WARM_INTERVALS['quotes'])
+    warmer.add('fear_greed', lambda: get_swr_cache().refresh(('fear_greed',), calculate_fear_greed, accept=_has_fear_greed),
+               every=WARM_INTERVALS['fear_greed'])
+    warmer.add('fear_greed_history', lambda: get_swr_cache().refresh(
+        ('fear_greed_history',), lambda: get_fear_greed_store().update(), accept=lambda df: not df.empty),
+               every=WARM_INTERVALS['fear_greed_history'])
+    warmer.add('watchlist', warm_watchlist, every=WARM_INTERVALS['watchlist'])
+    warmer.add('watchlist_intraday', warm_watchlist_intraday, every=WARM_INTERVALS['watchlist_intraday'])
+    warmer.add('option_chains', warm_option_chains, every=WARM_INTERVALS['option_chains'])
+    warmer.add('unusual_options', lambda: get_swr_cache().refresh(
+        ('unusual_options',), _load_unusual_options, accept=lambda t: not t.empty),
+               every=WARM_INTERVALS['unusual_options'])
+    return warmer.start()
+
+
+get_cache_warmer()
 
 
 # ============================================================================
@@ -2403,10 +2278,10 @@ if 'analysis_data' not in st.session_state:
     st.session_state['analysis_data'] = None
 if 'dcf_file' not in st.session_state:
     st.session_state['dcf_file'] = None
-if 'fg_data' not in st.session_state:
-    st.session_state['fg_data'] = calculate_fear_greed()
 if 'chart_timeframe' not in st.session_state:
     st.session_state['chart_timeframe'] = '1Y'
+if 'screen_scores' not in st.session_state:
+    st.session_state['screen_scores'] = None
 
 # Portfolio state
 if 'portfolio_holdings' not in st.session_state:
@@ -2442,7 +2317,7 @@ with st.sidebar:
     st.markdown("---")
 
     # Market Sentiment Widget
-    fg = st.session_state.get('fg_data', {'score': 50, 'label': 'Neutral', 'vix': 20})
+    fg = get_fear_greed()
     fg_score = fg.get('score', 50)
     fg_label = fg.get('label', 'Neutral')
     fg_vix = fg.get('vix', 20)
@@ -2469,7 +2344,7 @@ with st.sidebar:
     st.markdown(f"<div style='font-size: 11px; font-weight: 600; color: {THEME['text_secondary']}; text-transform: uppercase; letter-spacing: 0.1em; margin-bottom: 8px;'>Investment Strategy</div>", unsafe_allow_html=True)
     strategy = st.selectbox(
         "Strategy",
-        ["Balanced", "Value Focused", "Growth Focused", "Income Focused", "Aggressive"],
+        list(STRATEGY_WEIGHTS),
         label_visibility="collapsed"
     )
 
@@ -2500,10 +2375,29 @@ with st.sidebar:
 
     # Data refresh
     if st.button("🔄 Refresh Market Data", use_container_width=True):
-        st.session_state['fg_data'] = calculate_fear_greed()
-        st.cache_data.clear()
+        get_cache_warmer().run_now('quotes', 'fear_greed', 'fear_greed_history')
+        if st.session_state['current_ticker']:
+            DataEngine.refresh_ticker(st.session_state['current_ticker'])
         st.rerun()
 
+    # Upstream source health
+    with st.expander("Data Sources", expanded=False):
+        health = DataEngine.source_health()
+        if not health:
+            st.caption("No upstream calls yet.")
+        for source, b in sorted(health.items()):
+            b_color = THEME['bullish'] if b['state'] == 'CLOSED' else THEME['warning'] if b['state'] == 'HALF_OPEN' else THEME['bearish']
+            retry_note = f" · retry in {b['retry_in']:.0f}s" if b['state'] == 'OPEN' else ''
+            st.markdown(f"<div style='font-size: 11px; display: flex; justify-content: space-between;'><span style='color: {THEME['text_secondary']};'>{source}</span><span style='color: {b_color}; font-weight: 600;'>{b['state']}{retry_note}</span></div>", unsafe_allow_html=True)
+        coalesced = DataEngine.coalescing_stats()['total']
+        st.caption(f"Fetches: {coalesced['executed']} run · {coalesced['coalesced']} coalesced")
+        bucket = get_rate_limiter().snapshot()
+        st.caption(f"Rate limit: {bucket['tokens']:.0f}/{YAHOO_BURST} tokens · {bucket['queued']} queued · {bucket['waited']} throttled")
+        for job, w in get_cache_warmer().status().items():
+            last = format_age(w['age']) if w['age'] is not None else 'pending'
+            err_note = f" · {w['errors']} errors" if w['errors'] else ''
+            st.caption(f"Warmer {job}: every {w['every']}s · last {last}{err_note}")
+
 # ============================================================================
 # MAIN HEADER
 # ============================================================================
@@ -2513,30 +2407,6 @@ st.markdown("<div class='subtitle'>Forensic Investment Intelligence • Distorti
 # ============================================================================
 # LIVE TICKER TAPE
 # ============================================================================
-@st.cache_data(ttl=120)
-def get_ticker_tape_data():
-    """Get live ticker data for the tape - batch download for speed"""
-    tickers = ['SPY', 'QQQ', 'DIA', 'IWM', 'AAPL', 'MSFT', 'GOOGL', 'AMZN', 'NVDA', 'TSLA', 'META', 'BTC-USD', 'GC=F', 'CL=F']
-    tape_data = []
-    try:
-        # Batch download - much faster than individual calls
-        data = yf.download(tickers, period='2d', progress=False, threads=True)
-        if not data.empty:
-            for t in tickers:
-                try:
-                    if t in data['Close'].columns:
-                        closes = data['Close'][t].dropna()
-                        if len(closes) >= 2:
-                            current = closes.iloc[-1]
-                            prev = closes.iloc[-2]
-                            change = ((current - prev) / prev) * 100
-                            tape_data.append({'ticker': t, 'price': current, 'change': change})
-                except:
-                    pass
-    except:
-        pass
-    return tape_data
-
 ticker_tape = get_ticker_tape_data()
 if ticker_tape:
     tape_html = "<div style='background: linear-gradient(90deg, #0a0e17 0%, #131a2b 50%, #0a0e17 100%); padding: 10px 0; overflow: hidden; border-top: 1px solid #1e293b; border-bottom: 1px solid #1e293b; margin-bottom: 20px;'>"
@@ -2558,30 +2428,6 @@ if ticker_tape:
 # ============================================================================
 main_tabs = st.tabs(["🏠 MARKET OVERVIEW", "🎯 SINGLE ASSET", "🔬 FORENSIC LAB", "⚡ RETAIL EDGE", "📊 MULTI-ASSET", "🌍 MACRO", "🎮 SIMULATOR"])
 
-@st.cache_data(ttl=120)
-def get_indices_data():
-    """Batch fetch indices data for speed"""
-    indices_tickers = ['SPY', 'QQQ', 'DIA', 'IWM']
-    indices_data = {}
-    try:
-        data = yf.download(indices_tickers, period='5d', progress=False, threads=True)
-        if not data.empty:
-            for ticker in indices_tickers:
-                try:
-                    if ticker in data['Close'].columns:
-                        closes = data['Close'][ticker].dropna()
-                        if len(closes) >= 2:
-                            indices_data[ticker] = {
-                                'current': closes.iloc[-1],
-                                'prev': closes.iloc[-2],
-                                'change': ((closes.iloc[-1] - closes.iloc[-2]) / closes.iloc[-2]) * 100
-                            }
-                except:
-                    pass
-    except:
-        pass
-    return indices_data
-
 # ============================================================================
 # TAB 0: MARKET OVERVIEW (HOME)
 # ============================================================================
@@ -2591,6 +2437,9 @@ with main_tabs[0]:
     # Get market movers and indices (cached)
     movers = get_market_movers()
     indices_data = get_indices_data()
+    quotes_age = DataEngine.data_age('quotes')
+    if quotes_age is not None:
+        st.caption(f"Quotes updated {format_age(quotes_age)}")
 
     # Top row - Major indices
     idx_cols = st.columns(4)
@@ -2632,7 +2481,8 @@ with main_tabs[0]:
             if movers['gainers']:
                 top_gainer = movers['gainers'][0]['ticker']
                 try:
-                    gainer_hist = yf.Ticker(top_gainer).history(period='5d', interval='15m')
+                    with get_rate_limiter().priority(BACKGROUND):
+                        gainer_hist = DataEngine.get_history(top_gainer, period='5d', interval='15m')
                     if not gainer_hist.empty:
                         fig_gainer = go.Figure()
                         fig_gainer.add_trace(go.Scatter(
@@ -2670,7 +2520,8 @@ with main_tabs[0]:
             if movers['losers']:
                 top_loser = movers['losers'][0]['ticker']
                 try:
-                    loser_hist = yf.Ticker(top_loser).history(period='5d', interval='15m')
+                    with get_rate_limiter().priority(BACKGROUND):
+                        loser_hist = DataEngine.get_history(top_loser, period='5d', interval='15m')
                     if not loser_hist.empty:
                         fig_loser = go.Figure()
                         fig_loser.add_trace(go.Scatter(
@@ -2710,7 +2561,7 @@ with main_tabs[0]:
 
     # Fear & Greed Mini Display
     st.markdown("<div style='height: 30px;'></div>", unsafe_allow_html=True)
-    fg = st.session_state.get('fg_data', calculate_fear_greed())
+    fg = get_fear_greed()
     fg_score = fg.get('score', 50)
     if fg_score >= 75:
         fg_label, fg_color = "EXTREME GREED", "#22c55e"
@@ -2755,16 +2606,7 @@ with main_tabs[1]:
         ticker = st.session_state['current_ticker']
 
         # Set weights based on strategy
-        if strategy == "Value Focused":
-            weights = {'valuation': 0.40, 'quality': 0.25, 'growth': 0.10, 'momentum': 0.10, 'risk': 0.15}
-        elif strategy == "Growth Focused":
-            weights = {'valuation': 0.15, 'quality': 0.20, 'growth': 0.40, 'momentum': 0.15, 'risk': 0.10}
-        elif strategy == "Income Focused":
-            weights = {'valuation': 0.25, 'quality': 0.35, 'growth': 0.10, 'momentum': 0.10, 'risk': 0.20}
-        elif strategy == "Aggressive":
-            weights = {'valuation': 0.10, 'quality': 0.15, 'growth': 0.35, 'momentum': 0.30, 'risk': 0.10}
-        else:
-            weights = {'valuation': 0.25, 'quality': 0.25, 'growth': 0.20, 'momentum': 0.15, 'risk': 0.15}
+        weights = STRATEGY_WEIGHTS.get(strategy, STRATEGY_WEIGHTS['Balanced'])
 
         # Load data if needed (silent loading - no visible spinner)
         cached = st.session_state['analysis_data']
@@ -2773,8 +2615,9 @@ with main_tabs[1]:
 
         if need_full_reload:
             with st.spinner(f"Loading complete data for {ticker}..."):
-                info = DataEngine.get_info(ticker)
-                hist = DataEngine.get_history(ticker, period='2y')
+                bundle = DataEngine.prefetch(ticker, history_period='2y')
+                info = bundle['info']
+                hist = bundle['hist']
 
                 # Require both price info and history — the engine retries all sources
                 price_val = (info.get('currentPrice') or info.get('regularMarketPrice')
@@ -2796,23 +2639,24 @@ with main_tabs[1]:
                     st.stop()
 
                 fundamentals = get_fundamental_metrics(info)
-                news = DataEngine.get_news(ticker)
-                financials = DataEngine.get_financials(ticker)
-                scores, total_score, metrics = calculate_smart_score(info, hist, fundamentals, weights)
+                news = bundle['news']
+                financials = bundle['financials']
+                scores, total_score, metrics = calculate_smart_score(info, hist, weights)
 
                 # Forensic analysis
                 distortion = ForensicLab.analyze_distortion(ticker, info, financials)
                 quality = ForensicLab.calculate_quality_of_earnings(ticker, financials)
 
                 # Retail edge data
-                inst_holders = DataEngine.get_institutional_holders(ticker)
-                insider_tx = DataEngine.get_insider_transactions(ticker)
-                options_data = DataEngine.get_options_chain(ticker)
+                inst_holders = bundle['inst_holders']
+                insider_tx = bundle['insider_tx']
+                options_data = bundle['options_data']
 
                 st.session_state['analysis_data'] = {
                     'ticker': ticker,
                     'strategy': strategy,
                     'info': info,
+                    'info_as_of': time.time() - (DataEngine.data_age('info', ticker) or 0),
                     'hist': hist,
                     'fundamentals': fundamentals,
                     'news': news,
@@ -2827,15 +2671,10 @@ with main_tabs[1]:
                     'options_data': options_data
                 }
         elif need_score_update:
-            # Recalculate scores with new strategy weights without refetching data
+            # Category scores and metrics do not depend on the weights — only the total is re-weighted
             cached_data = st.session_state['analysis_data']
-            scores, total_score, metrics = calculate_smart_score(
-                cached_data['info'], cached_data['hist'], cached_data['fundamentals'], weights
-            )
-            st.session_state['analysis_data']['scores'] = scores
-            st.session_state['analysis_data']['total_score'] = total_score
-            st.session_state['analysis_data']['metrics'] = metrics
-            st.session_state['analysis_data']['strategy'] = strategy
+            cached_data['total_score'] = weighted_score(cached_data['scores'], weights)
+            cached_data['strategy'] = strategy
 
         data = st.session_state['analysis_data']
         info = data['info']
@@ -2862,6 +2701,8 @@ with main_tabs[1]:
                 <span style='font-size: 18px; margin-left: 8px;'>{change_pct:+.2f}%</span>
             </div>
             """, unsafe_allow_html=True)
+            if data.get('info_as_of'):
+                st.caption(f"Quote as of {format_age(time.time() - data['info_as_of'])}")
 
         with header_cols[1]:
             rating, rating_color = get_rating(data['total_score'])
@@ -2924,6 +2765,14 @@ with main_tabs[1]:
                     show_bb = ind_cols[2].checkbox("Bollinger Bands", value=False)
                     show_volume = ind_cols[3].checkbox("Volume", value=True)
 
+                    tech = get_indicator_engine().update(ticker, tf_config['interval'], chart_hist, tf_config['period'])
+                    fmt = lambda v, spec: format(v, spec) if v is not None and pd.notna(v) else '--'
+                    band = tech.get('bb_upper', np.nan) - tech.get('bb_lower', np.nan)
+                    pct_b = (tech.get('close', np.nan) - tech.get('bb_lower', np.nan)) / band if band else np.nan
+                    st.caption(f"Latest {tf_config['interval']} bar · RSI {fmt(tech.get('rsi'), '.1f')} · "
+                               f"MACD {fmt(tech.get('macd'), '.2f')} / signal {fmt(tech.get('macd_signal'), '.2f')} · "
+                               f"Bollinger %B {fmt(pct_b, '.2f')} · ATR {fmt(tech.get('atr'), '.2f')}")
+
                 # Create professional chart
                 fig = make_subplots(
                     rows=2 if show_volume else 1, cols=1, shared_xaxes=True,
@@ -3399,9 +3248,10 @@ with main_tabs[2]:
 
     if st.button("🔬 RUN FORENSIC SCAN", use_container_width=True) and forensic_ticker:
         with st.spinner(f"Running forensic scan on {forensic_ticker}..."):
-            f_info = DataEngine.get_info(forensic_ticker)
-            f_financials = DataEngine.get_financials(forensic_ticker)
-            f_hist = DataEngine.get_history(forensic_ticker, period='2y')
+            f_bundle = DataEngine.prefetch(forensic_ticker, parts=('info', 'financials', 'hist'), history_period='2y')
+            f_info = f_bundle['info']
+            f_financials = f_bundle['financials']
+            f_hist = f_bundle['hist']
 
         price_check = f_info.get('currentPrice') or f_info.get('regularMarketPrice')
         if f_info and price_check:
@@ -3487,14 +3337,49 @@ with main_tabs[3]:
     """, unsafe_allow_html=True)
 
     edge_ticker = st.text_input("Enter ticker for edge analysis", placeholder="GME", key="edge_ticker").upper()
+    vp_mode = 'range' if st.checkbox("Volume profile: spread each bar's volume across its high-low range",
+                                      key="vp_range") else 'close'
+    all_expiries = st.checkbox("Options: analyze every expiry (slower on the first load)", key="edge_all_expiries")
+
+    with st.expander("🔎 Overhead supply scan"):
+        scan_input = st.text_input("Tickers (comma-separated)", ", ".join(WATCHLIST), key="vp_scan_tickers")
+        if st.button("SCAN FOR OVERHEAD SUPPLY", use_container_width=True, key="vp_scan"):
+            scan_tickers = list(dict.fromkeys(t.strip().upper() for t in scan_input.split(",") if t.strip()))
+            with st.spinner(f"Profiling {len(scan_tickers)} tickers..."):
+                scan_hists = DataEngine.map_universe(lambda t: DataEngine.get_history(t, period='1y'), scan_tickers)
+                scan = overhead_supply_scan(ohlcv_panels(dict(zip(scan_tickers, scan_hists))), mode=vp_mode)
+            st.dataframe(scan.round(2), use_container_width=True)
+
+    with st.expander("🧭 Low-correlation screen"):
+        corr_input = st.text_input("Tickers (comma-separated)", ", ".join(OPTIONS_SCAN_UNIVERSE), key="corr_scan_tickers")
+        if st.button("SCREEN FOR IDIOSYNCRATIC NAMES", use_container_width=True, key="corr_scan"):
+            corr_tickers = list(dict.fromkeys(t.strip().upper() for t in corr_input.split(",") if t.strip()))
+            with st.spinner(f"Measuring {len(corr_tickers)} tickers against SPY and BTC..."):
+                risk = DataEngine.factor_risk(corr_tickers)
+            st.dataframe(risk.sort_values('idiosyncratic_score', ascending=False).round(2), use_container_width=True)
+
+    with st.expander("🚨 Unusual options activity"):
+        uoa, uoa_age = get_unusual_options(), get_swr_cache().age(('unusual_options',))
+        if uoa is None:
+            st.caption(f"The background scan of {len(OPTIONS_SCAN_UNIVERSE)} tickers has not finished yet.")
+        else:
+            st.caption(f"Top {len(uoa)} contracts across {len(OPTIONS_SCAN_UNIVERSE)} tickers · "
+                       f"scanned {format_age(uoa_age)}")
+            if uoa.empty:
+                st.info("No contract is trading unusually right now.")
+            else:
+                st.dataframe(uoa.round(2), use_container_width=True)
 
     if st.button("⚡ RUN EDGE ANALYSIS", use_container_width=True) and edge_ticker:
         with st.spinner(f"Loading complete data for {edge_ticker}..."):
-            e_info = DataEngine.get_info(edge_ticker)
-            e_hist = DataEngine.get_history(edge_ticker, period='1y')
-            e_inst = DataEngine.get_institutional_holders(edge_ticker)
-            e_insider = DataEngine.get_insider_transactions(edge_ticker)
-            e_options = DataEngine.get_options_chain(edge_ticker)
+            e_bundle = DataEngine.prefetch(edge_ticker, parts=('info', 'hist', 'inst_holders', 'insider_tx', 'options_data'),
+                                           history_period='1y')
+            e_info = e_bundle['info']
+            e_hist = e_bundle['hist']
+            e_inst = e_bundle['inst_holders']
+            e_insider = e_bundle['insider_tx']
+            e_options = e_bundle['options_data']
+            e_chains = DataEngine.get_option_chains(edge_ticker) if all_expiries else None
 
         e_price = None
         if e_info:
@@ -3522,7 +3407,7 @@ with main_tabs[3]:
             with edge_tabs[0]:
                 st.markdown("<div class='subsection-header'>Volume Profile Analysis</div>", unsafe_allow_html=True)
 
-                bagholder = RetailEdgeEngine.bagholder_detector(e_hist)
+                bagholder = RetailEdgeEngine.bagholder_detector(e_hist, mode=vp_mode)
 
                 risk_color = THEME['bearish'] if bagholder['current_risk'] in ['CRITICAL', 'HIGH'] else THEME['warning'] if bagholder['current_risk'] == 'MODERATE' else THEME['bullish']
 
@@ -3534,6 +3419,11 @@ with main_tabs[3]:
                 </div>
                 """, unsafe_allow_html=True)
 
+                if bagholder['value_area'] and pd.notna(bagholder['poc']):
+                    va_low, va_high = bagholder['value_area']
+                    st.caption(f"Point of control ${bagholder['poc']:.2f} · value area (70% of volume) "
+                               f"${va_low:.2f} - ${va_high:.2f}")
+
                 if bagholder['overhead_supply_zones']:
                     st.markdown("<div class='danger-alert'>", unsafe_allow_html=True)
                     st.markdown(f"**{len(bagholder['overhead_supply_zones'])} overhead supply zones detected!**")
@@ -3594,7 +3484,7 @@ with main_tabs[3]:
             with edge_tabs[2]:
                 st.markdown("<div class='subsection-header'>Options Flow Analysis</div>", unsafe_allow_html=True)
 
-                gamma = RetailEdgeEngine.gamma_squeeze_radar(e_options, current_price)
+                gamma = RetailEdgeEngine.gamma_squeeze_radar(e_options, current_price, e_chains)
 
                 squeeze_color = THEME['opportunity'] if gamma['squeeze_potential'] == 'HIGH' else THEME['warning'] if gamma['squeeze_potential'] == 'MODERATE' else THEME['text_secondary']
 
@@ -3611,6 +3501,75 @@ with main_tabs[3]:
                 g_cols[1].metric("Max Pain", f"${gamma['max_pain']:.2f}" if gamma['max_pain'] else "N/A")
                 g_cols[2].metric("Current Price", f"${current_price:.2f}")
 
+                by_expiry = gamma['max_pain_by_expiry']
+                if by_expiry is not None and not by_expiry.empty:
+                    st.markdown("<div class='subsection-header'>Max Pain by Expiry</div>", unsafe_allow_html=True)
+                    if gamma['max_pain_all'] is not None:
+                        st.caption(f"All {len(by_expiry)} expiries pooled: max pain ${gamma['max_pain_all']:.2f}")
+                    mp_fig = go.Figure()
+                    mp_fig.add_trace(go.Scatter(x=by_expiry.index, y=by_expiry['max_pain'], mode='lines+markers',
+                                                name='Max Pain', line=dict(color=THEME['warning'], width=2)))
+                    mp_fig.add_hline(y=current_price, line_dash='dot', line_color=THEME['text_muted'],
+                                     annotation_text='Price')
+                    mp_fig.update_layout(
+                        height=280, margin=dict(l=0, r=0, t=10, b=0), showlegend=False,
+                        paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
+                        xaxis=dict(showgrid=False, tickfont=dict(color=THEME['text_muted'], size=10)),
+                        yaxis=dict(showgrid=True, gridcolor=THEME['grid'], tickfont=dict(color=THEME['text_muted'], size=10))
+                    )
+                    st.plotly_chart(mp_fig, use_container_width=True)
+                    st.dataframe(by_expiry.round(2), use_container_width=True)
+
+                if e_chains is not None:
+                    oi_change = DataEngine.get_option_oi_change(edge_ticker).dropna(subset=['oi_change'])
+                    if not oi_change.empty:
+                        st.markdown("<div class='subsection-header'>Open Interest Change vs Previous Snapshot Day</div>",
+                                    unsafe_allow_html=True)
+                        biggest = oi_change.loc[oi_change['oi_change'].abs().nlargest(15).index]
+                        st.dataframe(biggest.round(1), use_container_width=True)
+
+                gex = gamma['gamma_exposure']
+                if gex is not None and not gex.empty:
+                    st.markdown("<div class='subsection-header'>Dealer Gamma Exposure</div>", unsafe_allow_html=True)
+                    gx_cols = st.columns(3)
+                    gx_cols[0].metric("Net GEX ($ / 1% move)", f"${gamma['net_gex'] / 1e6:,.1f}M")
+                    gx_cols[1].metric("Zero-Gamma Flip", f"${gamma['zero_gamma']:.2f}" if gamma['zero_gamma'] else "N/A")
+                    gx_cols[2].metric("Dealer Regime", gamma['gamma_regime'])
+                    near = gex[(gex.index >= current_price * 0.8) & (gex.index <= current_price * 1.2)]
+                    gex_fig = go.Figure()
+                    gex_fig.add_trace(go.Bar(x=near.index, y=near['net_gex'] / 1e6, name='Net GEX',
+                                             marker_color=[THEME['bullish'] if v >= 0 else THEME['bearish'] for v in near['net_gex']]))
+                    gex_fig.add_vline(x=current_price, line_dash='dot', line_color=THEME['text_muted'],
+                                      annotation_text='Price')
+                    if gamma['zero_gamma']:
+                        gex_fig.add_vline(x=gamma['zero_gamma'], line_dash='dash', line_color=THEME['warning'],
+                                          annotation_text='Flip')
+                    gex_fig.update_layout(
+                        height=280, margin=dict(l=0, r=0, t=10, b=0), showlegend=False,
+                        paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
+                        xaxis=dict(showgrid=False, tickfont=dict(color=THEME['text_muted'], size=10)),
+                        yaxis=dict(showgrid=True, gridcolor=THEME['grid'], title='$M',
+                                   tickfont=dict(color=THEME['text_muted'], size=10))
+                    )
+                    st.plotly_chart(gex_fig, use_container_width=True)
+
+                surface = gamma['vol_surface']
+                if surface is not None and surface.notna().any().any():
+                    st.markdown("<div class='subsection-header'>Implied Volatility Surface</div>", unsafe_allow_html=True)
+                    st.caption("Solved from bid/ask mids of out-of-the-money contracts, smoothed per expiry")
+                    surface = surface.dropna(how='all')
+                    vs_fig = go.Figure(go.Heatmap(
+                        z=surface.to_numpy() * 100, x=[f"{m:.0%}" for m in surface.columns], y=surface.index,
+                        colorscale='Viridis', colorbar=dict(title='IV %'),
+                        hovertemplate='Strike/Spot %{x}<br>%{y}<br>IV %{z:.1f}%<extra></extra>'))
+                    vs_fig.update_layout(
+                        height=320, margin=dict(l=0, r=0, t=10, b=0),
+                        paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
+                        xaxis=dict(title='Strike / Spot', tickfont=dict(color=THEME['text_muted'], size=10)),
+                        yaxis=dict(tickfont=dict(color=THEME['text_muted'], size=10))
+                    )
+                    st.plotly_chart(vs_fig, use_container_width=True)
+
                 if gamma['hot_strikes']:
                     st.markdown("<div class='subsection-header'>Hot Strikes (High OI Near Money)</div>", unsafe_allow_html=True)
                     for strike in gamma['hot_strikes']:
@@ -3643,6 +3602,30 @@ with main_tabs[3]:
                 r_cols[1].metric("BTC Correlation", f"{reality['btc_correlation']:.2f}" if reality['btc_correlation'] else "N/A")
                 r_cols[2].metric("Beta", f"{reality['beta']:.2f}" if reality['beta'] else "N/A")
 
+                x_cols = st.columns(2)
+                x_cols[0].metric("Residual Volatility (ann.)",
+                                 f"{reality['residual_vol']:.1f}%" if reality['residual_vol'] is not None else "N/A")
+                x_cols[1].metric("Alpha vs SPY (ann.)", f"{reality['alpha']:+.1f}%" if reality['alpha'] is not None else "N/A")
+
+                rolling = reality['rolling']
+                if rolling is not None and rolling.notna().any().any():
+                    st.markdown(f"<div class='subsection-header'>Rolling {ROLLING_WINDOW}-Session Correlation</div>",
+                                unsafe_allow_html=True)
+                    rc_fig = go.Figure()
+                    for col, color in (('spy corr', THEME['accent_primary']), ('btc corr', THEME['text_secondary'])):
+                        if col in rolling:
+                            rc_fig.add_trace(go.Scatter(x=rolling.index, y=rolling[col], mode='lines',
+                                                        name=col.split()[0].upper(), line=dict(color=color, width=2)))
+                    rc_fig.update_layout(
+                        height=260, margin=dict(l=0, r=0, t=10, b=0),
+                        paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
+                        legend=dict(orientation='h', font=dict(color=THEME['text_muted'])),
+                        xaxis=dict(showgrid=False, tickfont=dict(color=THEME['text_muted'], size=10)),
+                        yaxis=dict(showgrid=True, gridcolor=THEME['grid'], range=[-1, 1],
+                                   tickfont=dict(color=THEME['text_muted'], size=10))
+                    )
+                    st.plotly_chart(rc_fig, use_container_width=True)
+
                 if reality['spy_correlation'] and abs(reality['spy_correlation']) < 0.5:
                     st.markdown(f"""
                     <div class='opportunity-card'>
@@ -3669,20 +3652,15 @@ with main_tabs[4]:
         tickers = [t.strip().upper() for t in multi_tickers.split(",") if t.strip()]
         period_map = {'1M': '1mo', '3M': '3mo', '6M': '6mo', '1Y': '1y', '2Y': '2y', '5Y': '5y'}
         try:
-            data_df = None
-            for attempt in range(DataEngine.MAX_RETRIES + 1):
-                try:
-                    data_df = yf.download(tickers, period=period_map[multi_period], progress=False)['Close']
-                    if isinstance(data_df, pd.Series):
-                        data_df = data_df.to_frame(name=tickers[0])
-                    data_df = data_df.dropna(axis=1, how='all')
-                    data_df = data_df.ffill().bfill()
-                    if not data_df.empty:
-                        break
-                except Exception:
-                    pass
-                if attempt < DataEngine.MAX_RETRIES:
-                    time.sleep(DataEngine.RETRY_DELAY)
+            def download_closes():
+                closes = yf.download(tickers, period=period_map[multi_period], progress=False)['Close']
+                if isinstance(closes, pd.Series):
+                    closes = closes.to_frame(name=tickers[0])
+                return closes.dropna(axis=1, how='all').ffill().bfill()
+
+            data_df = get_resilience().call('download', download_closes,
+                                            accept=lambda df: df is not None and not df.empty,
+                                            retries=DataEngine.MAX_RETRIES + 1, cost=len(tickers))
 
             if data_df is None or data_df.empty:
                 st.error("Could not source price data for the selected tickers after multiple attempts. Verify the symbols and try again.")
@@ -3751,6 +3729,51 @@ with main_tabs[4]:
         except Exception as e:
             st.error(f"Could not load comparison data after exhausting all attempts: {str(e)}")
 
+    # Universe screener
+    st.markdown("<div class='subsection-header'>Universe Screener</div>", unsafe_allow_html=True)
+    screen_tickers = st.text_area("Universe (comma-separated)", ", ".join(dict.fromkeys(WATCHLIST + MOVERS_UNIVERSE)), key="screen_tickers")
+    if st.button("🏁 RANK UNIVERSE", use_container_width=True):
+        universe = [t.strip().upper() for t in screen_tickers.split(",") if t.strip()]
+        with st.spinner(f"Scoring {len(universe)} tickers..."):
+            components, technicals = DataEngine.score_universe(universe)
+        # Scored once; every strategy or what-if weighting below is a re-rank of these
+        st.session_state['screen_scores'] = {
+            'components': components,
+            'scores': category_scores(components, get_score_rules()),
+            'technicals': technicals,
+            'scored_at': time.time(),
+        }
+
+    screen_cache = st.session_state.get('screen_scores')
+    if screen_cache:
+        strategy_weights = STRATEGY_WEIGHTS.get(strategy, STRATEGY_WEIGHTS['Balanced'])
+        ranked = rank(screen_cache['scores'], strategy_weights)
+        ranked.insert(0, 'rating', [get_rating(v)[0] for v in ranked['total']])
+        st.caption(f"{strategy} weights · {len(ranked)} tickers scored "
+                   f"{format_age(time.time() - screen_cache['scored_at'])}")
+        st.dataframe(ranked.join(screen_cache['technicals']).round(2), use_container_width=True)
+
+        with st.expander("🎛️ What-if weights"):
+            st.caption("Drag the weights to re-rank the scored universe instantly — nothing is refetched or rescored.")
+            slider_cols = st.columns(len(CATEGORIES))
+            what_if = {}
+            for col, cat in zip(slider_cols, CATEGORIES):
+                with col:
+                    what_if[cat] = st.slider(cat.title(), 0, 100, int(round(strategy_weights[cat] * 100)),
+                                             step=5, key=f"what_if_{cat}")
+            what_if = normalize_weights(what_if)
+            st.caption(" · ".join(f"{cat.title()} {w:.0%}" for cat, w in what_if.items()))
+
+            reranked = rank(screen_cache['scores'], what_if)
+            reranked.insert(0, 'vs strategy', ranked['rank'].reindex(reranked.index) - reranked['rank'])
+            reranked.insert(0, 'rating', [get_rating(v)[0] for v in reranked['total']])
+            st.dataframe(reranked.round(1), use_container_width=True)
+
+            drill = st.selectbox("Score breakdown", list(reranked.index), key="what_if_drill")
+            if drill:
+                breakdown = screen_cache['components'].loc[drill].rename('points').reset_index()
+                st.dataframe(breakdown[breakdown['points'] != 0], use_container_width=True, hide_index=True)
+
 # ============================================================================
 # TAB 6: MACRO DASHBOARD
 # ============================================================================
@@ -3761,8 +3784,8 @@ with main_tabs[5]:
     st.markdown("<div class='subsection-header'>Key Market Indicators</div>", unsafe_allow_html=True)
 
     if st.button("🔄 REFRESH MACRO DATA", use_container_width=True):
-        st.session_state['fg_data'] = calculate_fear_greed()
-        st.cache_data.clear()
+        # The indicator quotes below are read live on every run; only the gauge is warmed
+        get_cache_warmer().run_now('fear_greed', 'fear_greed_history')
 
     macro_indicators = {
         'VIX': '^VIX',
@@ -3777,6 +3800,7 @@ with main_tabs[5]:
     for i, (name, symbol) in enumerate(macro_indicators.items()):
         with macro_cols[i % 3]:
             try:
+                get_rate_limiter().acquire(INTERACTIVE)
                 m_data = yf.Ticker(symbol).history(period="5d")
                 if len(m_data) > 0:
                     curr = m_data['Close'].iloc[-1]
@@ -3803,7 +3827,7 @@ with main_tabs[5]:
     st.markdown("---")
     st.markdown("<div class='section-header'>📊 Fear & Greed Index (10 Indicators)</div>", unsafe_allow_html=True)
 
-    fg = st.session_state['fg_data']
+    fg = get_fear_greed()
     fg_score = fg.get('score', 50)
 
     # Color based on score
@@ -3909,6 +3933,31 @@ with main_tabs[5]:
             <span style='font-size: 11px;'><span style='color: #22c55e;'>●</span> Extreme Greed (80-100)</span>
         </div>
         """, unsafe_allow_html=True)
+
+        # Regime history
+        fg_history = get_fear_greed_history()
+        if not fg_history.empty:
+            st.markdown("<div class='subsection-header'>Fear & Greed History</div>", unsafe_allow_html=True)
+            fg_range = st.radio("Range", ['1Y', '3Y', '5Y', 'MAX'], index=0, horizontal=True, key='fg_history_range', label_visibility='collapsed')
+            if fg_range != 'MAX':
+                fg_history = fg_history[fg_history.index >= fg_history.index[-1] - pd.DateOffset(years=int(fg_range[:-1]))]
+            fig_fg_hist = go.Figure()
+            for lo, hi, band_color in [(0, 20, 'rgba(239, 68, 68, 0.08)'), (20, 40, 'rgba(249, 115, 22, 0.08)'),
+                                       (40, 60, 'rgba(234, 179, 8, 0.08)'), (60, 80, 'rgba(132, 204, 22, 0.08)'),
+                                       (80, 100, 'rgba(34, 197, 94, 0.08)')]:
+                fig_fg_hist.add_hrect(y0=lo, y1=hi, fillcolor=band_color, line_width=0)
+            fig_fg_hist.add_trace(go.Scatter(
+                x=fg_history.index, y=fg_history['score'], mode='lines',
+                line=dict(color=THEME['text_primary'], width=1.5),
+                customdata=fg_history['label'], hovertemplate='%{x|%Y-%m-%d}: %{y:.0f} (%{customdata})<extra></extra>'
+            ))
+            fig_fg_hist.update_layout(
+                height=260, margin=dict(l=0, r=0, t=10, b=0),
+                paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
+                xaxis=dict(showgrid=False, tickfont=dict(color=THEME['text_muted'], size=10)),
+                yaxis=dict(range=[0, 100], showgrid=True, gridcolor=THEME['grid'], tickfont=dict(color=THEME['text_muted'], size=10))
+            )
+            st.plotly_chart(fig_fg_hist, use_container_width=True, config={'displayModeBar': False})
     else:
         st.info("Click 'Refresh Macro Data' to load Fear & Greed indicators")
 
@@ -3942,7 +3991,7 @@ with main_tabs[6]:
             date = datetime.strptime(date_str, '%Y-%m-%d')
             start = (date - timedelta(days=10)).strftime('%Y-%m-%d')
             end = (date + timedelta(days=1)).strftime('%Y-%m-%d')
-            data = yf.Ticker(ticker).history(start=start, end=end)
+            data = StockSimulator.get_historical_data(ticker, start, end)
             if not data.empty:
                 return float(data['Close'].iloc[-1])
         except:
@@ -4082,7 +4131,7 @@ with main_tabs[6]:
                     try:
                         chart_start = (current_date - timedelta(days=90)).strftime('%Y-%m-%d')
                         chart_end = (current_date + timedelta(days=1)).strftime('%Y-%m-%d')
-                        chart_data = yf.Ticker(lookup_ticker).history(start=chart_start, end=chart_end)
+                        chart_data = StockSimulator.get_historical_data(lookup_ticker, chart_start, chart_end)
                         if not chart_data.empty:
                             fig = go.Figure()
                             fig.add_trace(go.Scatter(x=chart_data.index, y=chart_data['Close'], mode='lines', line=dict(color='#ffffff', width=1.5), fill='tozeroy', fillcolor='rgba(255,255,255,0.05)'))
@@ -1,5 +1,23 @@
 import yfinance as yf
 from datetime import datetime
+from Modules.price_store import shared_store
+
+
+def _history_fetcher(ticker, period=None, interval='1d', start=None):
+    stock = yf.Ticker(ticker)
+    if start is not None:
+        return stock.history(start=start, interval=interval)
+    return stock.history(period=period or 'max', interval=interval)
+
+
+def get_price_store():
+    """Shared local OHLCV store (fetches only the bars it does not have yet) — the
+    same instance app_main uses when both run in one process, where it keeps the
+    app's rate-limited fetcher"""
+    try:
+        return shared_store(fetcher=_history_fetcher)
+    except ValueError:
+        return shared_store()
 
 def get_stock_data(ticker):
     stock = yf.Ticker(ticker)
@@ -75,9 +93,11 @@ def get_multi_asset_data(asset_types):
     
     return data
 def get_historical_data_custom(ticker, period="max", interval="1d"):
-    """Flexible historical data fetching with custom intervals"""
-    stock = yf.Ticker(ticker)
-    return stock.history(period=period, interval=interval)
+    """Flexible historical data fetching with custom intervals, served from the local price store"""
+    hist = get_price_store().get(ticker, period=period, interval=interval)
+    if hist.empty:
+        hist = yf.Ticker(ticker).history(period=period, interval=interval)
+    return hist
 
 def get_crypto_data(symbol):
     """Fetch crypto data (BTC-USD, ETH-USD, etc.)"""
@@ -0,0 +1,618 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from Modules.fear_greed import FG_COMPONENTS, fear_greed_history, fear_greed_snapshot
+from Modules.scoring import calculate_investment_score, investment_scores
+from Modules.screener import CATEGORIES, fundamentals_frame, screen, smart_score
+
+# ============================================================================
+# RULE PARITY - Compiled rule sets against the branch-by-branch originals
+# ============================================================================
+# The if/elif ladders the rule tables replaced are kept below as references.
+# Randomized universes (missing and zero fields, short histories included) are
+# scored both ways, one ticker at a time and as a whole universe, and every
+# category score and total must agree.
+
+# Plausible range per info field; a value is dropped or zeroed now and then
+INFO_RANGES = {
+    'trailingPE': (-20, 80), 'forwardPE': (-20, 80), 'pegRatio': (-1, 4), 'marketCap': (1e8, 1e12),
+    'freeCashflow': (-1e10, 5e10), 'enterpriseToEbitda': (-5, 30), 'fiftyTwoWeekHigh': (50, 150),
+    'fiftyTwoWeekLow': (20, 110), 'shortPercentOfFloat': (0, 0.4), 'beta': (-0.5, 3),
+    'profitMargins': (-0.3, 0.5), 'grossMargins': (0, 0.9), 'operatingMargins': (-0.2, 0.5),
+    'returnOnEquity': (-0.3, 0.5), 'returnOnAssets': (-0.2, 0.3), 'currentRatio': (0.2, 4),
+    'debtToEquity': (0, 400), 'revenueGrowth': (-0.3, 0.8), 'earningsGrowth': (-0.5, 1),
+    'priceToSalesTrailing12Months': (0.2, 12), 'priceToBook': (0.3, 10),
+}
+
+# History lengths straddling every lookback the rules use
+HISTORY_LENGTHS = [0, 5, 14, 15, 40, 50, 63, 120, 199, 200, 300]
+
+WEIGHTS = {'valuation': 0.25, 'quality': 0.25, 'growth': 0.2, 'momentum': 0.15, 'risk': 0.15}
+
+# calculate_investment_score reads these ratios without defaults
+INVESTMENT_REQUIRED = ('returnOnEquity', 'profitMargins', 'debtToEquity', 'revenueGrowth')
+
+SEEDS = [0, 1, 2]
+
+
+def random_universe(n: int = 300, seed: int = 0, required: tuple = ()) -> tuple:
+    """({ticker: info}, {ticker: close series}) for n synthetic tickers.
+    Fields in `required` are always present and non-zero, and every history is non-empty."""
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range('2023-01-02', periods=max(HISTORY_LENGTHS))
+    infos, closes = {}, {}
+    for i in range(n):
+        ticker = f"T{i}"
+        info = {}
+        for field, (lo, hi) in INFO_RANGES.items():
+            r = rng.random()
+            if field not in required and r < 0.15:
+                continue
+            info[field] = 0 if field not in required and r < 0.2 else float(rng.uniform(lo, hi))
+        infos[ticker] = info
+        length = int(rng.choice([h for h in HISTORY_LENGTHS if h or not required]))
+        closes[ticker] = pd.Series(np.exp(np.cumsum(rng.normal(0, 0.02, length))) * 100,
+                                   index=dates[len(dates) - length:])
+    return infos, closes
+
+
+def mismatches(expected: dict, actual: dict, tolerance: float = 1e-9) -> list:
+    """(name, expected, actual) for every value that differs (NaN matches NaN)."""
+    out = []
+    for name, value in expected.items():
+        got = actual.get(name)
+        both_nan = got is not None and np.isnan(value) and np.isnan(got)
+        if got is None or not (both_nan or abs(value - got) <= tolerance):
+            out.append((name, value, got))
+    return out
+
+
+def investment_fundamentals(info: dict) -> dict:
+    return {
+        'roe': info['returnOnEquity'] * 100,
+        'profit_margin': info['profitMargins'] * 100,
+        'debt_to_equity': info['debtToEquity'] / 100,
+        'revenue_growth': info['revenueGrowth'] * 100,
+    }
+
+
+def expected_smart_score(info: dict, closes: pd.Series) -> dict:
+    scores, total, _ = reference_smart_score(info, pd.DataFrame({'Close': closes}), get_fundamental_metrics(info),
+                                             WEIGHTS)
+    return {**{cat: scores[cat] for cat in CATEGORIES}, 'total': total}
+
+
+@pytest.mark.parametrize('seed', SEEDS)
+def test_screen_matches_reference(seed):
+    infos, closes = random_universe(seed=seed)
+    result = screen(fundamentals_frame(infos), pd.DataFrame(closes), WEIGHTS)
+    bad = {t: m for t in infos if (m := mismatches(expected_smart_score(infos[t], closes[t]), result.loc[t].to_dict()))}
+    assert bad == {}
+
+
+@pytest.mark.parametrize('seed', SEEDS)
+def test_smart_score_matches_reference(seed):
+    infos, closes = random_universe(n=100, seed=seed)
+    bad = {}
+    for t in infos:
+        scores, total, _ = smart_score(infos[t], closes[t], WEIGHTS)
+        if m := mismatches(expected_smart_score(infos[t], closes[t]), {**scores, 'total': total}):
+            bad[t] = m
+    assert bad == {}
+
+
+@pytest.mark.parametrize('seed', SEEDS)
+def test_investment_scores_match_reference(seed):
+    infos, closes = random_universe(seed=seed, required=INVESTMENT_REQUIRED)
+    result = investment_scores(fundamentals_frame(infos), pd.DataFrame(closes), WEIGHTS)
+    bad = {}
+    for t in infos:
+        expected = reference_investment_score(infos[t], investment_fundamentals(infos[t]),
+                                              pd.DataFrame({'Close': closes[t]}), WEIGHTS)
+        if m := mismatches(expected, result.loc[t].to_dict()):
+            bad[t] = m
+    assert bad == {}
+
+
+@pytest.mark.parametrize('seed', SEEDS)
+def test_calculate_investment_score_matches_reference(seed):
+    infos, closes = random_universe(n=100, seed=seed, required=INVESTMENT_REQUIRED)
+    bad = {}
+    for t in infos:
+        args = (infos[t], investment_fundamentals(infos[t]), pd.DataFrame({'Close': closes[t]}), WEIGHTS)
+        if m := mismatches(reference_investment_score(*args), calculate_investment_score(*args)):
+            bad[t] = m
+    assert bad == {}
+
+
+@pytest.mark.parametrize('seed', SEEDS)
+def test_fear_greed_history_matches_snapshot(seed):
+    """Latest reading from fear_greed_snapshot against the last row of fear_greed_history,
+    with each component dropped in turn."""
+    rng = np.random.default_rng(seed)
+    sessions = 600
+    index = pd.bdate_range('2022-01-03', periods=sessions)
+    closes = pd.DataFrame(np.exp(rng.normal(0, 0.01, (sessions, len(FG_COMPONENTS))).cumsum(axis=0)) * 100,
+                          index=index, columns=FG_COMPONENTS)
+    # ^VIX stays: without it the snapshot scores a neutral VIX the history leaves out
+    cases = [closes] + [closes.drop(columns=[c]) for c in FG_COMPONENTS if c != '^VIX']
+    bad = {}
+    for i, case in enumerate(cases):
+        snapshot = fear_greed_snapshot(case)
+        expected = {'score': snapshot['score'], 'num_indicators': snapshot['num_indicators'],
+                    **{key: ind['score'] for key, ind in snapshot['indicators'].items() if key != 'vix'}}
+        last = fear_greed_history(case).iloc[-1]
+        actual = {key: float(value) for key, value in last.items() if not isinstance(value, str)}
+        if m := mismatches(expected, actual):
+            bad[i] = m
+    assert bad == {}
+
+
+# ----------------------------------------------------------------------------
+# References: the original hand-written scoring code
+# ----------------------------------------------------------------------------
+
+def calculate_rsi(prices: pd.Series, period: int = 14) -> pd.Series:
+    """Calculate RSI indicator (formerly app_main.calculate_rsi)"""
+    delta = prices.diff()
+    gain = delta.where(delta > 0, 0).rolling(window=period).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
+    rs = gain / loss
+    return 100 - (100 / (1 + rs))
+
+
+def get_fundamental_metrics(info: dict) -> dict:
+    """Extract fundamental metrics from stock info (app_main.get_fundamental_metrics)"""
+    return {
+        'revenue_growth': (info.get('revenueGrowth', 0) or 0) * 100,
+        'earnings_growth': (info.get('earningsGrowth', 0) or 0) * 100,
+        'profit_margin': (info.get('profitMargins', 0) or 0) * 100,
+        'operating_margin': (info.get('operatingMargins', 0) or 0) * 100,
+        'gross_margin': (info.get('grossMargins', 0) or 0) * 100,
+        'roe': (info.get('returnOnEquity', 0) or 0) * 100,
+        'roa': (info.get('returnOnAssets', 0) or 0) * 100,
+        'debt_to_equity': (info.get('debtToEquity', 0) or 0) / 100,
+        'current_ratio': info.get('currentRatio', 0) or 0,
+        'quick_ratio': info.get('quickRatio', 0) or 0,
+        'free_cash_flow': info.get('freeCashflow', 0) or 0,
+        'operating_cash_flow': info.get('operatingCashflow', 0) or 0,
+        'revenue': info.get('totalRevenue', 0) or 0,
+        'ebitda': info.get('ebitda', 0) or 0,
+        'market_cap': info.get('marketCap', 0) or 0,
+        'pe_ratio': info.get('trailingPE', 0) or 0,
+        'forward_pe': info.get('forwardPE', 0) or 0,
+        'peg_ratio': info.get('pegRatio', 0) or 0,
+        'price_to_book': info.get('priceToBook', 0) or 0,
+        'price_to_sales': info.get('priceToSalesTrailing12Months', 0) or 0,
+        'dividend_yield': (info.get('dividendYield', 0) or 0) * 100,
+        'beta': info.get('beta', 1) or 1,
+        'short_percent': (info.get('shortPercentOfFloat', 0) or 0) * 100,
+        '52w_high': info.get('fiftyTwoWeekHigh', 0) or 0,
+        '52w_low': info.get('fiftyTwoWeekLow', 0) or 0,
+    }
+
+
+def reference_smart_score(info: dict, hist: pd.DataFrame, fundamentals: dict, weights: dict) -> tuple:
+    """
+    app_main.calculate_smart_score as it was written before SMART_SCORE_RULES.
+    Calculate comprehensive investment score using professional-grade metrics.
+    Each category scored 0-100, then weighted for final score.
+    More realistic scoring with proper benchmarks and nuanced analysis.
+    """
+    scores = {}
+    metrics = {}
+    details = {}  # Store detailed breakdown
+
+    # =========================================================================
+    # VALUATION SCORE (0-100)
+    # Benchmark: S&P 500 averages - P/E ~20-22, P/B ~4, EV/EBITDA ~14
+    # =========================================================================
+    val_score = 50  # Start neutral
+
+    # P/E Analysis (weight: 25 points)
+    pe = info.get('trailingPE') or info.get('forwardPE')
+    forward_pe = info.get('forwardPE')
+    metrics['pe'] = pe
+    metrics['forward_pe'] = forward_pe
+
+    if pe and pe > 0:
+        if pe < 10: val_score += 20  # Deep value
+        elif pe < 15: val_score += 15  # Value
+        elif pe < 20: val_score += 10  # Fair
+        elif pe < 25: val_score += 5   # Slightly expensive
+        elif pe < 35: val_score -= 5   # Expensive
+        elif pe < 50: val_score -= 10  # Very expensive
+        else: val_score -= 15          # Extremely expensive
+
+        # Forward P/E improvement bonus
+        if forward_pe and pe and forward_pe < pe * 0.85:
+            val_score += 8  # Earnings expected to grow significantly
+
+    # PEG Ratio (weight: 20 points) - Gold standard for GARP
+    peg = info.get('pegRatio')
+    metrics['peg'] = peg
+    if peg and peg > 0:
+        if peg < 0.75: val_score += 15    # Undervalued growth
+        elif peg < 1.0: val_score += 10   # Fair growth value
+        elif peg < 1.5: val_score += 5    # Acceptable
+        elif peg < 2.0: val_score += 0    # Fairly priced
+        elif peg < 3.0: val_score -= 5    # Expensive for growth
+        else: val_score -= 10             # Very expensive
+
+    # FCF Yield (weight: 20 points) - Real cash generation
+    mkt_cap = info.get('marketCap', 1) or 1
+    fcf = info.get('freeCashflow', 0) or 0
+    fcf_yield = (fcf / mkt_cap) * 100 if mkt_cap > 0 else 0
+    metrics['fcf_yield'] = fcf_yield
+
+    if fcf_yield > 10: val_score += 15    # Exceptional
+    elif fcf_yield > 7: val_score += 12   # Excellent
+    elif fcf_yield > 5: val_score += 8    # Good
+    elif fcf_yield > 3: val_score += 4    # Acceptable
+    elif fcf_yield > 0: val_score += 0    # Neutral
+    else: val_score -= 10                  # Negative FCF concerning
+
+    # EV/EBITDA (weight: 15 points)
+    ev_ebitda = info.get('enterpriseToEbitda')
+    if ev_ebitda and ev_ebitda > 0:
+        if ev_ebitda < 8: val_score += 10
+        elif ev_ebitda < 12: val_score += 6
+        elif ev_ebitda < 16: val_score += 2
+        elif ev_ebitda < 20: val_score -= 3
+        else: val_score -= 8
+
+    scores['valuation'] = max(0, min(100, val_score))
+
+    # =========================================================================
+    # QUALITY SCORE (0-100)
+    # Measures business quality, competitive moat, financial strength
+    # =========================================================================
+    qual_score = 50
+
+    # Profitability (weight: 35 points)
+    profit_margin = fundamentals.get('profit_margin', 0)
+    gross_margin = fundamentals.get('gross_margin', 0)
+    operating_margin = fundamentals.get('operating_margin', 0)
+
+    # Net profit margin
+    if profit_margin > 30: qual_score += 15
+    elif profit_margin > 20: qual_score += 10
+    elif profit_margin > 10: qual_score += 5
+    elif profit_margin > 5: qual_score += 2
+    elif profit_margin < 0: qual_score -= 10
+
+    # Gross margin (indicator of pricing power)
+    if gross_margin > 60: qual_score += 10
+    elif gross_margin > 40: qual_score += 6
+    elif gross_margin > 25: qual_score += 2
+    elif gross_margin < 15: qual_score -= 5
+
+    # Return Metrics (weight: 30 points)
+    roe = fundamentals.get('roe', 0)
+    roa = fundamentals.get('roa', 0)
+
+    if roe > 25: qual_score += 12
+    elif roe > 18: qual_score += 8
+    elif roe > 12: qual_score += 4
+    elif roe > 8: qual_score += 1
+    elif roe < 0: qual_score -= 8
+
+    if roa > 15: qual_score += 8
+    elif roa > 10: qual_score += 5
+    elif roa > 5: qual_score += 2
+    elif roa < 0: qual_score -= 5
+
+    # Financial Strength (weight: 25 points)
+    current_ratio = fundamentals.get('current_ratio', 0)
+    debt_to_equity = fundamentals.get('debt_to_equity', 0)
+
+    if current_ratio > 2.5: qual_score += 8
+    elif current_ratio > 1.5: qual_score += 5
+    elif current_ratio > 1.0: qual_score += 2
+    elif current_ratio < 0.8: qual_score -= 8
+
+    if debt_to_equity < 0.3: qual_score += 10
+    elif debt_to_equity < 0.6: qual_score += 6
+    elif debt_to_equity < 1.0: qual_score += 2
+    elif debt_to_equity < 1.5: qual_score -= 3
+    elif debt_to_equity < 2.5: qual_score -= 8
+    else: qual_score -= 12
+
+    scores['quality'] = max(0, min(100, qual_score))
+
+    # =========================================================================
+    # GROWTH SCORE (0-100)
+    # Evaluates growth trajectory and sustainability
+    # =========================================================================
+    growth_score = 50
+
+    # Revenue Growth (weight: 35 points)
+    rev_growth = fundamentals.get('revenue_growth', 0)
+    metrics['rev_growth'] = rev_growth
+
+    if rev_growth > 50: growth_score += 18
+    elif rev_growth > 30: growth_score += 14
+    elif rev_growth > 20: growth_score += 10
+    elif rev_growth > 10: growth_score += 6
+    elif rev_growth > 5: growth_score += 2
+    elif rev_growth > 0: growth_score += 0
+    elif rev_growth > -5: growth_score -= 5
+    else: growth_score -= 12
+
+    # Earnings Growth (weight: 35 points)
+    earnings_growth = fundamentals.get('earnings_growth', 0)
+    metrics['earnings_growth'] = earnings_growth
+
+    if earnings_growth > 50: growth_score += 18
+    elif earnings_growth > 30: growth_score += 14
+    elif earnings_growth > 20: growth_score += 10
+    elif earnings_growth > 10: growth_score += 6
+    elif earnings_growth > 0: growth_score += 2
+    elif earnings_growth > -10: growth_score -= 5
+    else: growth_score -= 12
+
+    # Growth Consistency Bonus (weight: 15 points)
+    if rev_growth > 10 and earnings_growth > 10:
+        growth_score += 8  # Both growing nicely
+    if rev_growth > 0 and earnings_growth > rev_growth:
+        growth_score += 5  # Margin expansion
+
+    # Penalize if growth is slowing significantly
+    if rev_growth > 0 and earnings_growth < rev_growth * 0.5:
+        growth_score -= 5  # Margin compression
+
+    scores['growth'] = max(0, min(100, growth_score))
+
+    # =========================================================================
+    # MOMENTUM SCORE (0-100)
+    # Technical strength and trend analysis
+    # =========================================================================
+    mom_score = 50
+
+    if len(hist) > 0:
+        current_price = hist['Close'].iloc[-1]
+
+        # RSI Analysis (weight: 25 points)
+        rsi_val = 50
+        if len(hist) > 14:
+            rsi_series = calculate_rsi(hist['Close'].iloc[-15:])
+            rsi_val = rsi_series.iloc[-1] if not pd.isna(rsi_series.iloc[-1]) else 50
+        metrics['rsi'] = rsi_val
+
+        # Optimal RSI zone
+        if 45 <= rsi_val <= 55: mom_score += 10    # Balanced
+        elif 40 <= rsi_val <= 60: mom_score += 8   # Healthy
+        elif 55 < rsi_val <= 65: mom_score += 5    # Bullish but not overheated
+        elif 35 <= rsi_val < 40: mom_score += 6    # Potential reversal up
+        elif rsi_val > 75: mom_score -= 8          # Overbought risk
+        elif rsi_val < 25: mom_score -= 5          # Oversold (could be opportunity or trouble)
+
+        # Moving Average Analysis (weight: 35 points)
+        # Only the last window of each mean is read — no full rolling series
+        ma50 = hist['Close'].iloc[-50:].mean() if len(hist) >= 50 else None
+        if ma50 is not None:
+            metrics['ma50'] = ma50
+            pct_from_ma50 = ((current_price - ma50) / ma50) * 100
+
+            if current_price > ma50:
+                if pct_from_ma50 < 5: mom_score += 10    # Just above - healthy
+                elif pct_from_ma50 < 10: mom_score += 8  # Trending up
+                elif pct_from_ma50 < 20: mom_score += 4  # Extended
+                else: mom_score -= 2                      # Very extended
+            else:
+                if pct_from_ma50 > -5: mom_score += 2    # Just below
+                elif pct_from_ma50 > -10: mom_score -= 3
+                else: mom_score -= 8                      # Significantly below
+
+        if len(hist) >= 200:
+            ma200 = hist['Close'].iloc[-200:].mean()
+            metrics['ma200'] = ma200
+
+            if ma50 > ma200: mom_score += 10   # Bullish trend (golden cross territory)
+            else: mom_score -= 5               # Bearish trend
+
+            if current_price > ma200: mom_score += 5
+            else: mom_score -= 5
+
+        # Price Performance (weight: 20 points)
+        if len(hist) >= 63:  # ~3 months
+            price_3m_ago = hist['Close'].iloc[-63]
+            return_3m = ((current_price - price_3m_ago) / price_3m_ago) * 100
+            metrics['return_3m'] = return_3m
+
+            if return_3m > 20: mom_score += 8
+            elif return_3m > 10: mom_score += 5
+            elif return_3m > 0: mom_score += 2
+            elif return_3m > -10: mom_score -= 3
+            else: mom_score -= 8
+
+        # 52-week position (weight: 15 points)
+        high_52w = info.get('fiftyTwoWeekHigh', current_price)
+        low_52w = info.get('fiftyTwoWeekLow', current_price)
+        if high_52w > low_52w:
+            range_position = (current_price - low_52w) / (high_52w - low_52w)
+            metrics['52w_position'] = range_position * 100
+
+            if 0.7 <= range_position <= 0.9: mom_score += 8    # Near highs but not at peak
+            elif 0.5 <= range_position < 0.7: mom_score += 5   # Middle of range
+            elif 0.3 <= range_position < 0.5: mom_score += 2   # Lower half
+            elif range_position < 0.2: mom_score -= 5          # Near lows
+            elif range_position > 0.95: mom_score -= 2         # At highs (risky)
+
+    scores['momentum'] = max(0, min(100, mom_score))
+
+    # =========================================================================
+    # RISK SCORE (0-100) - Higher = LESS risky
+    # =========================================================================
+    risk_score = 70  # Start optimistic
+
+    # Short Interest Risk (weight: 20 points)
+    short_float = info.get('shortPercentOfFloat', 0) or 0
+    metrics['short_float'] = short_float * 100
+
+    if short_float > 0.30: risk_score -= 20      # Very high short interest
+    elif short_float > 0.20: risk_score -= 15
+    elif short_float > 0.10: risk_score -= 8
+    elif short_float > 0.05: risk_score -= 3
+    elif short_float < 0.02: risk_score += 5     # Low short interest is good
+
+    # Beta / Volatility Risk (weight: 25 points)
+    beta = info.get('beta', 1.0) or 1.0
+    metrics['beta'] = beta
+
+    if beta > 2.5: risk_score -= 20
+    elif beta > 2.0: risk_score -= 15
+    elif beta > 1.5: risk_score -= 8
+    elif beta > 1.2: risk_score -= 3
+    elif 0.8 <= beta <= 1.2: risk_score += 5    # Market-like volatility
+    elif 0.5 <= beta < 0.8: risk_score += 3     # Lower volatility
+    elif beta < 0.5: risk_score += 0            # Very low (might be stagnant)
+
+    # Financial Risk (weight: 25 points)
+    if debt_to_equity > 3: risk_score -= 15
+    elif debt_to_equity > 2: risk_score -= 10
+    elif debt_to_equity > 1.5: risk_score -= 5
+    elif debt_to_equity < 0.5: risk_score += 8
+
+    if current_ratio < 0.5: risk_score -= 12
+    elif current_ratio < 1.0: risk_score -= 5
+    elif current_ratio > 2.0: risk_score += 5
+
+    # Profitability Risk (weight: 15 points)
+    if profit_margin < 0: risk_score -= 15        # Unprofitable
+    elif profit_margin < 5: risk_score -= 5
+    elif profit_margin > 15: risk_score += 5
+
+    # FCF Risk (weight: 15 points)
+    if fcf < 0: risk_score -= 10
+    elif fcf_yield > 5: risk_score += 5
+
+    scores['risk'] = max(0, min(100, risk_score))
+
+    # =========================================================================
+    # CALCULATE WEIGHTED TOTAL SCORE
+    # =========================================================================
+    total_score = (
+        scores['valuation'] * weights.get('valuation', 0.20) +
+        scores['quality'] * weights.get('quality', 0.25) +
+        scores['growth'] * weights.get('growth', 0.20) +
+        scores['momentum'] * weights.get('momentum', 0.15) +
+        scores['risk'] * weights.get('risk', 0.20)
+    )
+
+    return scores, total_score, metrics
+
+
+def reference_investment_score(info, fundamentals, hist, weights):
+    """scoring.calculate_investment_score as it was written before INVESTMENT_SCORE_RULES."""
+    scores = {}
+    
+    # VALUATION
+    pe = info.get('trailingPE', 0)
+    ps = info.get('priceToSalesTrailing12Months', 0)
+    pb = info.get('priceToBook', 0)
+    
+    valuation_score = 0
+    if pe > 0 and pe < 14:
+        valuation_score += 40
+    elif pe < 20:
+        valuation_score += 25
+    else:
+        valuation_score += 10
+    
+    if ps < 3:
+        valuation_score += 30
+    elif ps < 5:
+        valuation_score += 20
+    
+    if pb < 2:
+        valuation_score += 30
+    elif pb < 5:
+        valuation_score += 15
+    
+    scores['valuation'] = min(valuation_score, 100)
+    
+    # QUALITY
+    roe = fundamentals['roe']
+    margin = fundamentals['profit_margin']
+    debt_equity = fundamentals['debt_to_equity']
+    
+    quality_score = 0
+    if roe > 20:
+        quality_score += 40
+    elif roe > 15:
+        quality_score += 30
+    elif roe > 10:
+        quality_score += 20
+    
+    if margin > 20:
+        quality_score += 35
+    elif margin > 10:
+        quality_score += 25
+    
+    if debt_equity < 0.5:
+        quality_score += 25
+    elif debt_equity < 1:
+        quality_score += 15
+    
+    scores['quality'] = min(quality_score, 100)
+    
+    # GROWTH
+    rev_growth = fundamentals['revenue_growth']
+    
+    if rev_growth > 30:
+        growth_score = 100
+    elif rev_growth > 20:
+        growth_score = 80
+    elif rev_growth > 10:
+        growth_score = 60
+    else:
+        growth_score = 20
+    
+    scores['growth'] = growth_score
+    
+    # MOMENTUM
+    current_price = hist['Close'].iloc[-1]
+    ma50 = hist['Close'].rolling(50).mean().iloc[-1]
+    ma200 = hist['Close'].rolling(200).mean().iloc[-1]
+    
+    momentum_score = 0
+    if current_price > ma50:
+        momentum_score += 30
+    if current_price > ma200:
+        momentum_score += 30
+    if ma50 > ma200:
+        momentum_score += 20
+    
+    scores['momentum'] = min(momentum_score, 100)
+    
+    # RISK
+    beta = info.get('beta', 1)
+    volatility = hist['Close'].pct_change().std() * np.sqrt(252) * 100
+    
+    risk_score = 0
+    if beta < 0.8:
+        risk_score += 50
+    elif beta < 1.2:
+        risk_score += 35
+    
+    if volatility < 20:
+        risk_score += 50
+    elif volatility < 30:
+        risk_score += 35
+    
+    scores['risk'] = min(risk_score, 100)
+    
+    # TOTAL
+    total_score = (
+        scores['valuation'] * weights['valuation'] +
+        scores['quality'] * weights['quality'] +
+        scores['growth'] * weights['growth'] +
+        scores['momentum'] * weights['momentum'] +
+        scores['risk'] * weights['risk']
+    ) / sum(weights.values())
+    
+    scores['total'] = total_score
+    
+    return scores
@@ -0,0 +1,40 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from Modules.volume_profile import point_of_control, profile_panel
+
+
+def panels(high, low, close, volume, columns=('X',)):
+    index = pd.bdate_range('2024-01-02', periods=len(close))
+    frame = lambda values: pd.DataFrame(np.asarray(values, dtype=float).reshape(len(index), -1), index=index,
+                                        columns=list(columns))
+    return frame(high), frame(low), frame(close), frame(volume)
+
+
+def test_range_mode_keeps_flat_bar_at_period_high():
+    high, low, close, volume = panels([10, 11, 12], [9, 10, 12], [9.5, 10.5, 12], [100, 100, 500])
+    profiles = profile_panel(high, low, close, volume, bins=6, mode='range')
+    profile = profiles['volume'].loc['X'].to_numpy()
+    assert profile.sum() == pytest.approx(700)
+    assert profile[-1] == pytest.approx(500)
+    assert point_of_control(profiles)['X'] == pytest.approx(11.75)
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_range_mode_conserves_volume(seed):
+    rng = np.random.default_rng(seed)
+    n, tickers = 250, 8
+    close = np.round(np.exp(np.cumsum(rng.normal(0, 0.02, (n, tickers)), axis=0)) * 100, 1)
+    spread = np.round(np.abs(rng.normal(0, 1, (n, tickers))), 1) * (rng.random((n, tickers)) > 0.2)
+    high, low = close + spread, close - spread
+    # Zero-range bars at each ticker's period high and low
+    top, bottom = high.argmax(axis=0), low.argmin(axis=0)
+    cols = np.arange(tickers)
+    high[top, cols] = low[top, cols] = close[top, cols] = high[top, cols]
+    high[bottom, cols] = low[bottom, cols] = close[bottom, cols] = low[bottom, cols]
+    volume = rng.integers(1, 10_000, (n, tickers)).astype(float)
+
+    columns = [f'T{i}' for i in range(tickers)]
+    profiles = profile_panel(*panels(high, low, close, volume, columns), bins=20, mode='range')
+    np.testing.assert_allclose(profiles['volume'].sum(axis=1).to_numpy(), volume.sum(axis=0))